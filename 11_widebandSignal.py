@@ -7,9 +7,9 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-import scipy.fftpack
 # from scipy import signal
 import common
+import fftBackends
 import sys
 
 # Assert that the user is using python above version 3.1
@@ -23,7 +23,10 @@ wideBandSignal = common.generateWidebandNoise(
         samplingFrequency=samplingFrequency,
         seconds=seconds, amplitude=1)
 
-wideBandSignalFFT = scipy.fftpack.fft(wideBandSignal)
+# A transform this long is worth spreading over every core
+fftBackends.setBackend(workers=-1)
+frequencyAxis, wideBandSignalFFT = common.getSpectrum(wideBandSignal,
+                                                      samplingFrequency)
 
 fig = plt.figure()
 
@@ -38,8 +41,6 @@ common.labelLogFFTPlot(Plot3, "Normalized FFT")
 Plot4 = plt.subplot(224)
 common.labelPhasePlot(Plot4, "Phase Angle")
 
-frequencyAxis = np.arange(0, samplingFrequency, 1/seconds)
-
 
 Plot1.plot(wideBandSignal, plotColor)
 # the histogram of the data
@@ -4,19 +4,22 @@
 # In this script, we will manually convolve two signals. The manual convolution
 # code is in the "common.py" file. So this script checks the integrity of the
 # function and compares with the speed of the convolution provided by numpy.
+# For a full sweep run benchmarks/convolution.py.
 # ____________________________________________________________________________
 
 import numpy as np
-import matplotlib.pyplot as plt
-import scipy.fftpack
-from scipy import signal
+import os
 import sys
 import common
-import time
 
 # Assert that the user is using python above version 3.1
 assert sys.version_info >= (3, 1)
 
+# The timing helper is shared with the scripts in the benchmarks folder
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'benchmarks'))
+import benchmarkTools
+
 
 # Testing code from the Richard Lyons Signal Processing book version 3.
 xk = [1.0, 2.0, 3.0]
@@ -25,24 +28,19 @@ hk = [1.0, 1.0, 1.0, 1.0]
 resultingList = common.convolve(hk, xk)
 print('Convolving x(k): ', xk)
 print('with h(k): ', hk)
-print("\nIn-house convolution function result: ", resultingList)
+print("\nIn-house convolution function result: ", resultingList.tolist())
 print("\nStandard convolution function result: ", np.convolve(xk, hk).tolist())
 
-print('\nTime it takes to run 1000000 in-house convolutions:')
-start_time = time.time()
-i = 0
-while (i < 1000000):
-    resultingList = common.convolve(hk, xk)
-    i += 1
-print(time.time() - start_time)
-
-
-print('\nTime it takes to run 1000000 standard convolutions:')
-start_time = time.time()
-i = 0
-while (i < 1000000):
-    resultingList = np.convolve(xk, hk).tolist()
-    i += 1
-print(time.time() - start_time)
-
-print('\nWeird!')
+# Timing a single 3x4 case only measures call overhead. We time it and a
+# larger case with benchmarkTools.timeFunction, keeping the best of a few
+# repeats after a warm-up call. benchmarks/convolution.py sweeps lengths,
+# dtypes and channel counts over all convolution engines.
+cases = [('3 x 4 (Lyons example)', np.array(xk), np.array(hk)),
+         ('65536 x 256', np.random.rand(65536), np.random.rand(256))]
+for caseName, signal, taps in cases:
+    print('\nBest time of 5 runs for', caseName)
+    for name, function in [
+            ('In-house convolution', lambda: common.convolve(taps, signal)),
+            ('Standard convolution', lambda: np.convolve(signal, taps))]:
+        best = benchmarkTools.timeFunction(function, repeats=5)
+        print('%s: %.1f us' % (name, best * 1e6))
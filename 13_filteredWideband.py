@@ -14,15 +14,26 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-import scipy.fftpack
-from scipy import signal
 import sys
 import common
+import designCache
+import filterDesign
+import firFilters
+import windows
 
 # Assert that the user is using python above version 3.1
 assert sys.version_info >= (3, 1)
 
 
+def filterInChunks(taps, samples, chunkSize):
+    ''' Streams the samples through an overlap-save FIR filter one chunk at
+    a time. The result is the full convolution of taps and samples.'''
+    blockFilter = firFilters.BlockFIRFilter(taps)
+    filtered = [blockFilter.process(samples[start:start + chunkSize])
+                for start in range(0, len(samples), chunkSize)]
+    return np.concatenate(filtered + [blockFilter.flush()])
+
+
 # Parameters for the signal
 samplingFrequency = 1000
 seconds = 2
@@ -40,35 +51,41 @@ cutoffFrequency = common.toFrequency(numberOfLowPassBins,
                                      filterLength)
 
 # MANUALLY CONSTRUCTED LOW PASS FILTER ++++++++++++++++++++++++++++++++++++++++
-# Lets generate a low pass filter from our expectation
-lowPassFilteredDFT = ([filterLength/2] * numberOfLowPassBins +
-                      (filterLength - 2 * numberOfLowPassBins) * [0] +
-                      [filterLength/2] * numberOfLowPassBins)
-
-# Time Domain FIR Filter Generation with blackman window
-lowPassFiltered = np.multiply(scipy.fftpack.ifft(lowPassFilteredDFT),
-                              np.blackman(filterLength))
-
-# Now lets convolve with the signal itself
-# lowPassFiltered = common.convolve(lowPassFiltered, wideBandSignal)
-lowPassFiltered = scipy.signal.convolve(lowPassFiltered, wideBandSignal)
+# Lets generate a low pass filter from our expectation: the first
+# numberOfLowPassBins bins pass. Time Domain FIR Filter Generation with
+# blackman window
+lowPassFiltered = filterDesign.designFrequencySampling(
+        [(0, common.toFrequency(numberOfLowPassBins - 1, samplingFrequency,
+                                filterLength), 1)],
+        filterLength, samplingFrequency, 'blackman')
+
+# Now lets convolve with the signal itself, one second at a time
+lowPassFiltered = filterInChunks(lowPassFiltered, wideBandSignal,
+                                 samplingFrequency)
 # Now lets get the FFT of this signal again :)
-lowPassFilteredDFT = scipy.fftpack.fft(lowPassFiltered)
+_, lowPassFilteredDFT = common.getSpectrum(lowPassFiltered, samplingFrequency,
+                                           fastLength=True)
 
 
 # LOW PASS FILTER WITH REMEZ EXCHANGE ALGORITHM++++++++++++++++++++++++++++++++
 transitionGap = 0.01
 
-remezFiltered = signal.remez(filterLength,
-                             [0, cutoffFrequency,  # Pass band
-                              cutoffFrequency + transitionGap,
-                              samplingFrequency/2],  # Stop band
-                             [1, 0],
-                             Hz=samplingFrequency)
+# Remez exchange is slow here; the design cache designs the filter on the
+# first run only and loads it from disk afterwards.
+remezFiltered = designCache.remez(filterLength,
+                                  [0, cutoffFrequency,  # Pass band
+                                   cutoffFrequency + transitionGap,
+                                   samplingFrequency/2],  # Stop band
+                                  [1, 0],
+                                  samplingFrequency)
+print('Design cache: %(misses)d designed, %(diskHits)d loaded from disk' %
+      designCache.getCacheInfo())
 
 #remezFiltered2 = signal.remez(filterLength + len(wideBandSignal) - 1,
 #                             [0, transitionGap,
-#                              (transitionGap + transitionGap), cutoffFrequency,  # Pass band
+#                              # Pass band
+#                              (transitionGap + transitionGap),
+#                              cutoffFrequency,
 #                              cutoffFrequency + transitionGap,
 #                              samplingFrequency/2],  # Stop band
 #                             [0, 1, 0],
@@ -76,21 +93,19 @@ remezFiltered = signal.remez(filterLength,
 #remezFilteredDFT2 = scipy.fftpack.fft(remezFiltered2)
 
 # Applying blackman window to the original signal
-remezFiltered = np.multiply(remezFiltered,
-                            np.blackman(filterLength))
+remezFiltered = windows.apply(remezFiltered, 'blackman')
 # Now lets convolve with the original signal
-# remezFiltered = common.convolve(remezFiltered, wideBandSignal)
-remezFiltered = scipy.signal.convolve(remezFiltered, wideBandSignal)
-remezFilteredDFT = scipy.fftpack.fft(remezFiltered)
-
-# Variables for plotting
-frequencyAxis = np.arange(0, samplingFrequency,
-                          samplingFrequency/(filterLength + len(wideBandSignal) - 1))
-
-# Just padding some zeros for plotting the wideband signal with others
-wideBandSignal = np.ndarray.tolist(wideBandSignal)
-wideBandSignal.extend([0.0] * (filterLength - 1))
-wideBandSignalDFT = scipy.fftpack.fft(wideBandSignal)
+remezFiltered = filterInChunks(remezFiltered, wideBandSignal,
+                               samplingFrequency)
+frequencyAxis, remezFilteredDFT = common.getSpectrum(
+        remezFiltered, samplingFrequency, fastLength=True)
+
+# Just padding some zeros for plotting the wideband signal with others. All
+# spectra are rounded up to the same fast FFT length, so they share one
+# frequency axis.
+wideBandSignal = common.zeroPad(wideBandSignal, len(remezFiltered))
+_, wideBandSignalDFT = common.getSpectrum(wideBandSignal, samplingFrequency,
+                                          fastLength=True)
 
 
 colorOriginalSignal = 'g.'
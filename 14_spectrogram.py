@@ -0,0 +1,67 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Short-time Fourier transform of a tone that hops between frequencies, with
+# some wideband noise on top. A single FFT only tells which frequencies were
+# present somewhere in the signal; the spectrogram shows when. The signal is
+# then rebuilt from the spectrogram by overlap-add.
+# ____________________________________________________________________________
+
+import numpy as np
+import matplotlib.pyplot as plt
+import sys
+import common
+import oscillators
+import spectralAnalysis
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+# Parameters for the signal
+samplingFrequency = 1000
+hopFrequencies = [50, 120, 300, 200, 420]
+samplesPerHop = 2000
+
+# The oscillator changes its frequency between chunks without a phase jump
+oscillator = oscillators.NumericallyControlledOscillator(
+        hopFrequencies[0], samplingFrequency, chunkSize=samplesPerHop)
+tone = []
+for frequency in hopFrequencies:
+    oscillator.setFrequency(frequency)
+    tone.append(oscillator.generate())
+tone = np.concatenate(tone)
+noisySignal = tone + common.generateWidebandNoise(
+        samplingFrequency, len(tone) / samplingFrequency, amplitude=0.5,
+        seed=1)
+
+frameLength = 256
+hop = 64
+frequencyAxis, frameTimes, spectrogram = spectralAnalysis.stft(
+        noisySignal, samplingFrequency, frameLength, hop)
+rebuilt = spectralAnalysis.istft(spectrogram, frameLength, hop)
+
+# The first sample sits under the zero of the Hann window
+print('Largest reconstruction error: %g' %
+      np.max(np.abs(rebuilt[1:] - noisySignal[1:len(rebuilt)])))
+
+fig = plt.figure()
+
+Plot1 = plt.subplot(211)
+common.labelSignalPlot(Plot1, "Time Domain Values")
+Plot2 = plt.subplot(212)
+Plot2.set_title("Spectrogram (dB)")
+Plot2.set_xlabel('Time (s)')
+Plot2.set_ylabel('Frequency (Hz)')
+
+Plot1.plot(noisySignal, 'g-', label="Original Signal")
+Plot1.plot(rebuilt, 'k-', label="Rebuilt from STFT")
+Plot1.legend(loc=1)
+
+# Rows of the spectrogram are frames, so transpose for time on the x axis
+Plot2.pcolormesh(frameTimes, frequencyAxis,
+                 20 * np.log10(np.abs(spectrogram.T) + 1e-12),
+                 shading='auto')
+
+plt.tight_layout()
+plt.show()
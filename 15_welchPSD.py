@@ -0,0 +1,67 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# 7_dftGain.py finds a tone in noise by growing the FFT size. The noise floor
+# of such a single periodogram stays just as ragged however long the FFT
+# gets. Welch's method cuts the record into overlapping windowed segments and
+# averages their power spectra instead: the more segments, the smoother the
+# noise floor, and the easier a weak tone stands out.
+#
+# Red is the periodogram of the whole record
+# Green is the Welch estimate with 1024 sample segments
+# Black is the Welch estimate with 256 sample segments
+# ____________________________________________________________________________
+
+import numpy as np
+import matplotlib.pyplot as plt
+import sys
+import common
+import spectralAnalysis
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+# Frequency and sampling
+f = 5
+fs = 100
+seconds = 600
+noiseAmplitude = 10
+
+noisySignal = common.getDiscreteSinusoid(f, fs, np.cos, seconds=seconds) + \
+              common.generateWidebandNoise(fs, seconds, noiseAmplitude,
+                                           seed=0)
+
+# The periodogram is a Welch estimate with a single rectangular segment
+periodogramAxis, periodogram = spectralAnalysis.welch(
+        noisySignal, fs, segmentLength=len(noisySignal), window='boxcar')
+welchAxis1024, welch1024 = spectralAnalysis.welch(noisySignal, fs, 1024)
+welchAxis256, welch256 = spectralAnalysis.welch(noisySignal, fs, 256)
+
+# Uniform noise in [-a, a) has a power of a^2 / 3, spread evenly up to fs / 2
+print('Expected noise floor: %.2f dB/Hz' %
+      (10 * np.log10(noiseAmplitude ** 2 / 3 / (fs / 2))))
+for name, density in [('Periodogram', periodogram), ('Welch 1024', welch1024),
+                      ('Welch 256', welch256)]:
+    # Upper half of the band, without the undoubled bin at fs / 2
+    floor = 10 * np.log10(density[len(density) // 2:-1])
+    print('%12s noise floor: %.2f dB/Hz, spread %.2f dB' % (
+            name, np.mean(floor), np.std(floor)))
+
+fig = plt.figure()
+Plot1 = plt.subplot(111)
+Plot1.set_title("Power Spectral Density, %d s of a 5 Hz Tone in Noise"
+                % seconds)
+Plot1.set_xlabel('Frequency (Hz)')
+Plot1.set_ylabel('dB/Hz')
+
+Plot1.plot(periodogramAxis, 10 * np.log10(periodogram), 'r-',
+           label="Periodogram")
+Plot1.plot(welchAxis1024, 10 * np.log10(welch1024), 'g-',
+           label="Welch, 1024 samples")
+Plot1.plot(welchAxis256, 10 * np.log10(welch256), 'k-',
+           label="Welch, 256 samples")
+Plot1.legend(loc=1)
+
+plt.tight_layout()
+plt.show()
@@ -8,36 +8,14 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-import scipy.fftpack
 import sys
+import common
+import spectralAnalysis
 
 # Assert that the user is using python above version 3.1
 assert sys.version_info >= (3, 1)
 
 
-def getDiscreteSinusoid(sinusoidFrequency, samplingFrequency, sinusoid=np.sin,
-                        seconds=None, numberOfSamples=None):
-    ''' Samples a sinusoid signal with the given parameters. All the
-    frequency values are in Hz.'''
-    if (numberOfSamples is not None) & (seconds is None):
-        # Generating a sine wave with the given number of samples
-        n = np.arange(0, numberOfSamples)
-        xOfN = sinusoid(2 * np.pi * sinusoidFrequency * n / samplingFrequency)
-        return xOfN
-    elif (seconds is not None) & (numberOfSamples is None):
-        # Generating a sine wave with the given time duration
-        n = np.arange(0, (samplingFrequency / sinusoidFrequency) * seconds)
-        xOfN = sinusoid(2 * np.pi * sinusoidFrequency * n / samplingFrequency)
-        return xOfN
-    elif (seconds is not None) & (numberOfSamples is not None):
-        print('Either seconds or number of samples can be passed,'
-              'but not both.')
-        return None
-    else:
-        print('Either seconds or number of samples needs to be passed.')
-        return None
-
-
 # First, arrange the plots and label them
 fig = plt.figure()
 plt.suptitle('ALIASING')
@@ -67,13 +45,16 @@ f = 3
 fs = 100
 seconds = 1
 N = fs * seconds  # One extra sample
-freqAxis = np.arange(0, fs, fs/N)
 
-sinusoid = getDiscreteSinusoid(f, fs, np.cos, numberOfSamples=N)
-fftOfSignal = abs(scipy.fftpack.fft(sinusoid))
+sinusoid = common.getDiscreteSinusoid(f, fs, np.cos, numberOfSamples=N)
+freqAxis, fftOfSignal = common.getSpectrum(sinusoid, fs)
+
+# Only the 3 Hz bin matters, so Goertzel evaluates just that one
+print('|X| at 3 Hz of the 3 Hz signal: %.1f' %
+      abs(spectralAnalysis.goertzel(sinusoid, fs, 3)))
 
 firstPlot.plot(sinusoid, 'r.-')
-secondPlot.plot(freqAxis, fftOfSignal, 'r.')
+secondPlot.plot(freqAxis, abs(fftOfSignal), 'r.')
 
 # Generate the second two plots
 # ----- NOTICE THE ALIASING OF f = f + (k * fs)  ------
@@ -81,13 +62,15 @@ fs = 100
 f = 203
 seconds = 1
 N = fs * seconds
-freqAxis = np.arange(0, fs, fs/N)
 
-sinusoid = getDiscreteSinusoid(f, fs, np.cos, numberOfSamples=N)
-fftOfSignal = abs(scipy.fftpack.fft(sinusoid))
+sinusoid = common.getDiscreteSinusoid(f, fs, np.cos, numberOfSamples=N)
+freqAxis, fftOfSignal = common.getSpectrum(sinusoid, fs)
+
+print('|X| at 3 Hz of the 203 Hz signal: %.1f' %
+      abs(spectralAnalysis.goertzel(sinusoid, fs, 3)))
 
 thirdPlot.plot(sinusoid, 'r.-')
-fourthPlot.plot(freqAxis, fftOfSignal, 'r.')
+fourthPlot.plot(freqAxis, abs(fftOfSignal), 'r.')
 
 plt.tight_layout()
 plt.show()
@@ -8,40 +8,13 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-import scipy.fftpack
 import sys
+import common
 
 # Assert that the user is using python above version 3.1
 assert sys.version_info >= (3, 1)
 
 
-# Now signal can have an initial phase and amplitude!
-def getDiscreteSinusoid(sinusoidFrequency, samplingFrequency, sinusoid=np.sin,
-                        seconds=None, numberOfSamples=None, initialPhase=0,
-                        amplitude=1):
-    ''' Samples a sinusoid signal with the given parameters. All the
-    frequency values are in Hz, phase is in radians.'''
-    if (numberOfSamples is not None) & (seconds is None):
-        # Generating a sine wave with the given number of samples
-        n = np.arange(0, numberOfSamples)
-        xOfN = amplitude * sinusoid(initialPhase + 2 * np.pi *
-                                    sinusoidFrequency * n / samplingFrequency)
-        return xOfN
-    elif (seconds is not None) & (numberOfSamples is None):
-        # Generating a sine wave with the given time duration
-        n = np.arange(0, (samplingFrequency / sinusoidFrequency) * seconds)
-        xOfN = amplitude * sinusoid(initialPhase + 2 * np.pi *
-                                    sinusoidFrequency * n / samplingFrequency)
-        return xOfN
-    elif (seconds is not None) & (numberOfSamples is not None):
-        print('Either seconds or number of samples can be passed,'
-              'but not both.')
-        return None
-    else:
-        print('Either seconds or number of samples needs to be passed.')
-        return None
-
-
 def labelSignalPlot(plot, title=''):
     plot.set_xlabel('n')
     plot.set_ylabel('x(n)')
@@ -90,28 +63,27 @@ f = 1
 fs = 200
 seconds = 1
 N = fs * seconds
-freqAxis = np.arange(0, fs, fs/N)
 
 # First Column _______________________________________________________________
-sinusoid = getDiscreteSinusoid(f, fs, np.cos, numberOfSamples=N)
-fftOfSignal = scipy.fftpack.fft(sinusoid)
+sinusoid = common.getDiscreteSinusoid(f, fs, np.cos, numberOfSamples=N)
+freqAxis, fftOfSignal = common.getSpectrum(sinusoid, fs)
 
 Plot1_1.plot(sinusoid, 'r.-')
 Plot1_2.plot(freqAxis, abs(fftOfSignal), 'r.')
 Plot1_3.plot(freqAxis, abs(np.angle(fftOfSignal, deg=True)), 'r.')
 
 # Second Column ______________________________________________________________
-sinusoid = getDiscreteSinusoid(f, fs, np.sin, numberOfSamples=N)
-fftOfSignal = scipy.fftpack.fft(sinusoid)
+sinusoid = common.getDiscreteSinusoid(f, fs, np.sin, numberOfSamples=N)
+freqAxis, fftOfSignal = common.getSpectrum(sinusoid, fs)
 
 Plot2_1.plot(sinusoid, 'r.-')
 Plot2_2.plot(freqAxis, abs(fftOfSignal), 'r.')
 Plot2_3.plot(freqAxis, abs(np.angle(fftOfSignal, deg=True)), 'r.')
 
 # Third Column _______________________________________________________________
-sinusoid = getDiscreteSinusoid(f, fs, np.cos, numberOfSamples=N,
-                               initialPhase=np.pi, amplitude=5)
-fftOfSignal = scipy.fftpack.fft(sinusoid)
+sinusoid = common.getDiscreteSinusoid(f, fs, np.cos, numberOfSamples=N,
+                                      initialPhase=np.pi, amplitude=5)
+freqAxis, fftOfSignal = common.getSpectrum(sinusoid, fs)
 
 Plot3_1.plot(sinusoid, 'r.-')
 Plot3_2.plot(freqAxis, abs(fftOfSignal), 'r.')
@@ -10,71 +10,15 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-import scipy.fftpack
 import sys
+import common
+import spectralPeaks
+import windows
 
 # Assert that the user is using python above version 3.1
 assert sys.version_info >= (3, 1)
 
 
-def getDiscreteSinusoid(sinusoidFrequency, samplingFrequency, sinusoid=np.sin,
-                        seconds=None, numberOfSamples=None, initialPhase=0,
-                        amplitude=1):
-    ''' Samples a sinusoid signal with the given parameters. All the
-    frequency values are in Hz, phase is in radians.'''
-    if (numberOfSamples is not None) & (seconds is None):
-        # Generating a sine wave with the given number of samples
-        n = np.arange(0, numberOfSamples)
-        xOfN = amplitude * sinusoid(initialPhase + 2 * np.pi *
-                                    sinusoidFrequency * n / samplingFrequency)
-        return xOfN
-    elif (seconds is not None) & (numberOfSamples is None):
-        # Generating a sine wave with the given time duration
-        n = np.arange(0, (samplingFrequency / sinusoidFrequency) * seconds)
-        xOfN = amplitude * sinusoid(initialPhase + 2 * np.pi *
-                                    sinusoidFrequency * n / samplingFrequency)
-        return xOfN
-    elif (seconds is not None) & (numberOfSamples is not None):
-        print('Either seconds or number of samples can be passed,'
-              'but not both.')
-        return None
-    else:
-        print('Either seconds or number of samples needs to be passed.')
-        return None
-
-
-def applyTriangularWindow(signal, startVal=0.05):
-    ''' Applies triangular function to the original signal.
-    Value starts from 0.05 instead of 0 and ends at 0.05.'''
-    halfLength = len(signal) // 2
-    counter = 0
-
-    for x in np.linspace(startVal, 1.0, halfLength, endpoint=False):
-        signal[counter] = signal[counter] * x
-        counter += 1
-
-    for x in np.linspace(1.0, startVal, halfLength, endpoint=True):
-        signal[counter] = signal[counter] * x
-        counter += 1
-
-    return signal
-
-
-def getTriangularWindow(length, startVal=0.05):
-    ''' Applies triangular function to the original signal.
-    Value starts from 0.05 instead of 0 and ends at 0.05.'''
-    halfLength = length // 2
-    window = []
-
-    for x in np.linspace(startVal, 1.0, halfLength, endpoint=False):
-        window.append(x)
-
-    for x in np.linspace(1.0, startVal, halfLength, endpoint=True):
-        window.append(x)
-
-    return np.array(window)
-
-
 def labelSignalPlot(plot, title=''):
     plot.set_xlabel('n')
     plot.set_ylabel('x(n)')
@@ -113,16 +57,29 @@ f = 20.5
 fs = 100
 seconds = 1
 N = fs * seconds
-freqAxis = np.arange(0, fs, fs/N)
-
-sinusoid = getDiscreteSinusoid(f, fs, np.cos, numberOfSamples=N)
-sinusoidWithTriangular = np.array(sinusoid) * \
-                         getTriangularWindow(len(sinusoid))
-sinusoidWithHamming = np.array(sinusoid) * np.hamming(len(sinusoid))
 
-fftWithoutWindowing = scipy.fftpack.fft(sinusoid)
-fftWithTriangular = scipy.fftpack.fft(sinusoidWithTriangular)
-fftWithHamming = scipy.fftpack.fft(sinusoidWithHamming)
+sinusoid = common.getDiscreteSinusoid(f, fs, np.cos, numberOfSamples=N)
+# The triangular window starts and ends at 0.05 instead of 0
+triangularWindow = windows.getWindow('triangular', N, parameter=0.05)
+hammingWindow = windows.getWindow('hamming', N)
+sinusoidWithTriangular = windows.apply(sinusoid, triangularWindow)
+sinusoidWithHamming = windows.apply(sinusoid, hammingWindow)
+
+freqAxis, fftWithoutWindowing = common.getSpectrum(sinusoid, fs)
+freqAxis, fftWithTriangular = common.getSpectrum(sinusoidWithTriangular,
+                                                fs)
+freqAxis, fftWithHamming = common.getSpectrum(sinusoidWithHamming, fs)
+
+# The tone falls between two bins, but interpolating around the peak bin
+# recovers its frequency and amplitude from this 100 point FFT
+for name, spectrum, method, window in [
+        ('Rectangular', fftWithoutWindowing, 'jacobsen', 'boxcar'),
+        ('Triangular', fftWithTriangular, 'window', triangularWindow),
+        ('Hamming', fftWithHamming, 'window', hammingWindow)]:
+    frequency, amplitude = spectralPeaks.estimatePeaks(
+            freqAxis, spectrum, method=method, window=window)
+    print('%11s: %.3f Hz, amplitude %.3f' % (name, frequency[0],
+                                              amplitude[0]))
 
 Plot1_1.plot(sinusoid, 'r.-')
 Plot1_2.plot(freqAxis, abs(fftWithoutWindowing), 'r.')
@@ -9,39 +9,15 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-import scipy.fftpack
 import sys
+import common
+import spectralAnalysis
+import windows
 
 # Assert that the user is using python above version 3.1
 assert sys.version_info >= (3, 1)
 
 
-def getDiscreteSinusoid(sinusoidFrequency, samplingFrequency, sinusoid=np.sin,
-                        seconds=None, numberOfSamples=None, initialPhase=0,
-                        amplitude=1):
-    ''' Samples a sinusoid signal with the given parameters. All the
-    frequency values are in Hz, phase is in radians.'''
-    if (numberOfSamples is not None) & (seconds is None):
-        # Generating a sine wave with the given number of samples
-        n = np.arange(0, numberOfSamples)
-        xOfN = amplitude * sinusoid(initialPhase + 2 * np.pi *
-                                    sinusoidFrequency * n / samplingFrequency)
-        return xOfN
-    elif (seconds is not None) & (numberOfSamples is None):
-        # Generating a sine wave with the given time duration
-        n = np.arange(0, (samplingFrequency / sinusoidFrequency) * seconds)
-        xOfN = amplitude * sinusoid(initialPhase + 2 * np.pi *
-                                    sinusoidFrequency * n / samplingFrequency)
-        return xOfN
-    elif (seconds is not None) & (numberOfSamples is not None):
-        print('Either seconds or number of samples can be passed,'
-              'but not both.')
-        return None
-    else:
-        print('Either seconds or number of samples needs to be passed.')
-        return None
-
-
 def labelSignalPlot(plot, title=''):
     plot.set_xlabel('n')
     plot.set_ylabel('x(n)')
@@ -78,28 +54,34 @@ f = 20.5
 fs = 80
 sampleCount = 256
 
-sinusoid = np.array(getDiscreteSinusoid(f, fs, np.cos,
-                                        numberOfSamples=sampleCount))
-sinusoid = sinusoid * np.hamming(len(sinusoid))
+sinusoid = np.array(common.getDiscreteSinusoid(f, fs, np.cos,
+                                               numberOfSamples=sampleCount))
+sinusoid = windows.apply(sinusoid, 'hamming', out=sinusoid)
+
+# The padded signals are only needed for the time domain plots; the FFT pads
+# by itself when asked for more points than the signal has.
+sinusoidWith256Zeros = common.zeroPad(sinusoid, sampleCount + 256)
+sinusoidWith768Zeros = common.zeroPad(sinusoid, sampleCount + 768)
 
-sinusoidWith256Zeros = sinusoid.tolist() + ([0] * 256)
-sinusoidWith768Zeros = sinusoid.tolist() + ([0] * 768)
+freqAxis256, fftWithoutZeros = common.getSpectrum(sinusoid, fs)
+freqAxis512, fftWith256Zeros = common.getSpectrum(
+        sinusoid, fs, numberOfPoints=sampleCount + 256)
+freqAxis1024, fftWith768Zeros = common.getSpectrum(
+        sinusoid, fs, numberOfPoints=sampleCount + 768)
 
-fftWithoutZeros = scipy.fftpack.fft(sinusoid)
-fftWith256Zeros = scipy.fftpack.fft(sinusoidWith256Zeros)
-fftWith768Zeros = scipy.fftpack.fft(sinusoidWith768Zeros)
+# Zooming into 15 - 25 Hz at the bin spacing of the 1024 point FFT gives the
+# same values, without transforming the rest of the band
+zoomAxis, zoomedFFT = spectralAnalysis.zoomSpectrum(sinusoid, fs, 15, 25, 129)
 
-freqAxis = np.arange(0, fs, fs/256)
 Plot1_1.plot(sinusoid, 'r.-')
-Plot1_2.plot(freqAxis, abs(fftWithoutZeros), 'r.-')
+Plot1_2.plot(freqAxis256, abs(fftWithoutZeros), 'r.-')
 
-freqAxis = np.arange(0, fs, fs/512)
 Plot2_1.plot(sinusoidWith256Zeros, 'r.-')
-Plot2_2.plot(freqAxis, abs(fftWith256Zeros), 'r.-')
+Plot2_2.plot(freqAxis512, abs(fftWith256Zeros), 'r.-')
 
-freqAxis = np.arange(0, fs, fs/1024)
 Plot3_1.plot(sinusoidWith768Zeros, 'r.-')
-Plot3_2.plot(freqAxis, abs(fftWith768Zeros), 'r.-')
+Plot3_2.plot(freqAxis1024, abs(fftWith768Zeros), 'r.-')
+Plot3_2.plot(zoomAxis, abs(zoomedFFT), 'k-')
 
 plt.tight_layout()
 plt.show()
@@ -11,40 +11,16 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-import scipy.fftpack
 from scipy import signal
 import sys
+import common
+import filterBanks
+import filterDesign
 
 # Assert that the user is using python above version 3.1
 assert sys.version_info >= (3, 1)
 
 
-def getDiscreteSinusoid(sinusoidFrequency, samplingFrequency, sinusoid=np.sin,
-                        seconds=None, numberOfSamples=None, initialPhase=0,
-                        amplitude=1):
-    ''' Samples a sinusoid signal with the given parameters. All the
-    frequency values are in Hz, phase is in radians.'''
-    if (numberOfSamples is not None) & (seconds is None):
-        # Generating a sine wave with the given number of samples
-        n = np.arange(0, numberOfSamples)
-        xOfN = amplitude * sinusoid(initialPhase + 2 * np.pi *
-                                    sinusoidFrequency * n / samplingFrequency)
-        return xOfN
-    elif (seconds is not None) & (numberOfSamples is None):
-        # Generating a sine wave with the given time duration
-        n = np.arange(0, (samplingFrequency / sinusoidFrequency) * seconds)
-        xOfN = amplitude * sinusoid(initialPhase + 2 * np.pi *
-                                    sinusoidFrequency * n / samplingFrequency)
-        return xOfN
-    elif (seconds is not None) & (numberOfSamples is not None):
-        print('Either seconds or number of samples can be passed,'
-              'but not both.')
-        return None
-    else:
-        print('Either seconds or number of samples needs to be passed.')
-        return None
-
-
 def normalizeFromZeroToOne(data):
     ''' Simply normalizes any value from zero to one. '''
     minData = min(data)
@@ -92,47 +68,35 @@ highPassCenterFrequencyBin = firFilterSize/2
 # (BinNumber * SamplingFrequency / N)
 # where N is the DFT size.
 
-# Lets generate low pass filter from our frequency response expectation.
-# The magnitude of the FFT is (Amplitude * NumberOfSamples) / 2. Two options:
-#
-# 1) if magnitude on time domain is desired to be 1, then the FFT value should
-# be (NumberOfSamples / 2).
-#
-# 2) If the FFT magnitude is desired to be 1:
-# Then the Amplitude of the signal should be (2 / NumberOfSamples)
-#
-# The Low pass FFT will be N+1 unity values (0th index for DC) and N unity
-# towards the end. Remaining is 0.
-
-lowPassFilterDFT = ([firFilterSize/2] * (halfOfBandPassBins + 1) +
-                    [0] * (firFilterSize - 1 - (2 * halfOfBandPassBins)) +
-                    [firFilterSize/2] * (halfOfBandPassBins))
-
-# Construct a low pass filter from the DFT
-lowPassFilter = scipy.fftpack.ifft(lowPassFilterDFT)
+# Lets generate low pass filter from our frequency response expectation:
+# unity gain on the bins from DC up to halfOfBandPassBins, zero elsewhere.
+# The designer mirrors those bins to negative frequencies itself and delays
+# the filter to the middle of its taps, so it is real and linear phase.
+lowPassFilter = filterDesign.designFrequencySampling(
+        [(0, halfOfBandPassBins * samplingFrequency / firFilterSize, 1)],
+        firFilterSize, samplingFrequency)
 
 # Multiplying the low pass filter with the phase shifting sinusoid should yield
 # to a shifted pass band for the lowpass filter = band pass filter.
 # Frequency of this sinusoid should be:
 # (bandpassCenterFrequencyBin * samplingFrequency / firFilterSize)
-bandShiftSinusoid = getDiscreteSinusoid(
-        (bandpassCenterFrequencyBin * samplingFrequency / firFilterSize),
-        samplingFrequency, numberOfSamples=firFilterSize)
-
-# High Pass filter works in a similar fashion
-highPassSinusoid = getDiscreteSinusoid(
-        (highPassCenterFrequencyBin * samplingFrequency / firFilterSize),
-        samplingFrequency, numberOfSamples=firFilterSize, initialPhase=np.pi/2)
-
-#highPassSinusoid = getDiscreteSinusoid(
-#        (highPassCenterFrequencyBin * samplingFrequency / firFilterSize),
-#        samplingFrequency, numberOfSamples=firFilterSize)
-
-bandPassFilter = lowPassFilter * bandShiftSinusoid
-highPassFilter = lowPassFilter * highPassSinusoid
-
-bandPassFilterDFT = scipy.fftpack.fft(bandPassFilter)
-highPassFilterDFT = scipy.fftpack.fft(highPassFilter)
+# High Pass filter works in a similar fashion, shifted all the way to fs / 2.
+# getModulatedFilters shifts the low pass filter to both centers at once.
+bandPassFilter, highPassFilter = filterBanks.getModulatedFilters(
+        lowPassFilter,
+        [bandpassCenterFrequencyBin * samplingFrequency / firFilterSize,
+         highPassCenterFrequencyBin * samplingFrequency / firFilterSize],
+        samplingFrequency, real=True)
+
+# The spectra are cut to the bins from DC up to fs / 2. Since the filter size
+# and sampling frequency is the same, frequency axis is also the same for
+# everyone.
+frequencyAxis, lowPassFilterDFT = common.getSpectrum(
+        lowPassFilter, samplingFrequency, oneSided=True)
+_, bandPassFilterDFT = common.getSpectrum(bandPassFilter, samplingFrequency,
+                                          oneSided=True)
+_, highPassFilterDFT = common.getSpectrum(highPassFilter, samplingFrequency,
+                                          oneSided=True)
 
 # Colors for drawing the plots
 colorLowPass = 'r.'
@@ -146,11 +110,6 @@ labelHighPass = "High Pass"
 # Plotting
 fig = plt.figure()
 
-# Since the filter size and sampling frequency is the same, frequency axis
-# is also the same for everyone.
-frequencyAxis = np.arange(0, samplingFrequency,
-                          samplingFrequency/firFilterSize)
-
 Plot1 = plt.subplot(221)
 labelSignalPlot(Plot1, "Time Domain Values")
 Plot2 = plt.subplot(222)
@@ -186,11 +145,11 @@ Plot3.plot(frequencyAxis, normalizeFromZeroToOne(np.abs(highPassFilterDFT)),
 Plot3.set_yscale("log", nonposx='clip')
 
 
-Plot4.plot(frequencyAxis, abs(np.angle(lowPassFilter, deg=True)),
+Plot4.plot(frequencyAxis, abs(np.angle(lowPassFilterDFT, deg=True)),
            colorLowPass)
-Plot4.plot(frequencyAxis, abs(np.angle(bandPassFilter, deg=True)),
+Plot4.plot(frequencyAxis, abs(np.angle(bandPassFilterDFT, deg=True)),
            colorBandPass)
-Plot4.plot(frequencyAxis, abs(np.angle(highPassFilter, deg=True)),
+Plot4.plot(frequencyAxis, abs(np.angle(highPassFilterDFT, deg=True)),
            colorHighPass)
 
 plt.subplots_adjust(wspace=0, hspace=0)
@@ -10,39 +10,14 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-import scipy.fftpack
 import sys
+import common
+import filterDesign
 
 # Assert that the user is using python above version 3.1
 assert sys.version_info >= (3, 1)
 
 
-def getDiscreteSinusoid(sinusoidFrequency, samplingFrequency, sinusoid=np.sin,
-                        seconds=None, numberOfSamples=None, initialPhase=0,
-                        amplitude=1):
-    ''' Samples a sinusoid signal with the given parameters. All the
-    frequency values are in Hz, phase is in radians.'''
-    if (numberOfSamples is not None) & (seconds is None):
-        # Generating a sine wave with the given number of samples
-        n = np.arange(0, numberOfSamples)
-        xOfN = amplitude * sinusoid(initialPhase + 2 * np.pi *
-                                    sinusoidFrequency * n / samplingFrequency)
-        return xOfN
-    elif (seconds is not None) & (numberOfSamples is None):
-        # Generating a sine wave with the given time duration
-        n = np.arange(0, (samplingFrequency / sinusoidFrequency) * seconds)
-        xOfN = amplitude * sinusoid(initialPhase + 2 * np.pi *
-                                    sinusoidFrequency * n / samplingFrequency)
-        return xOfN
-    elif (seconds is not None) & (numberOfSamples is not None):
-        print('Either seconds or number of samples can be passed,'
-              'but not both.')
-        return None
-    else:
-        print('Either seconds or number of samples needs to be passed.')
-        return None
-
-
 def toFrequency(binIndex, samplingFrequency, N):
     '''Returns the frequency of the bin index in a given DFT'''
     return (binIndex*samplingFrequency/N)
@@ -80,25 +55,6 @@ def labelPhasePlot(plot, title=''):
     plot.set_title(title)
 
 
-def checkParameterValidity(firstPassBandLength, secondPassBandLength,
-                           firstPassBandStartBin, secondPassBandStartBin):
-    # Basically if one of them is zero, fail the execution
-    if(firstPassBandLength == 0):
-        print("firstPassBandLength can't be zero!")
-        sys.exit()
-    elif (secondPassBandLength == 0):
-        print("secondPassBandLength can't be zero!")
-        sys.exit()
-    elif (firstPassBandStartBin == 0):
-        print("firstPassBandStartingFrequency can't be zero!")
-        sys.exit()
-    elif (secondPassBandStartBin == 0):
-        print("secondPassBandStartingFrequency can't be zero!")
-        sys.exit()
-    else:
-        return
-
-
 # GLOBAL VARIABLES
 # Time Domain Variables
 samplingFrequency = 1000
@@ -110,26 +66,12 @@ firstPassBandLength = firFilterSize//10
 secondPassBandLength = firFilterSize//10
 firstPassBandStartBin = firFilterSize//8
 secondPassBandStartBin = firFilterSize//4
-checkParameterValidity(firstPassBandLength, secondPassBandLength,
-                       firstPassBandStartBin, secondPassBandStartBin)
 
 
 # So the frequency equivalent of this would be:
 # (BinNumber * SamplingFrequency / N)
 # where N is the DFT size.
 
-# Lets generate low pass filter from our frequency response expectation.
-# The magnitude of the FFT is (Amplitude * NumberOfSamples) / 2. Two options:
-#
-# 1) if magnitude on time domain is desired to be 1, then the FFT value should
-# be (NumberOfSamples / 2).
-#
-# 2) If the FFT magnitude is desired to be 1:
-# Then the Amplitude of the signal should be (2 / NumberOfSamples)
-#
-# The Low pass FFT will be N+1 unity values (0th index for DC) and N unity
-# towards the end. Remaining is 0.
-
 # Custom two pass band filter  [-__---______---___]
 # First point is DC.
 # A stop band
@@ -137,25 +79,28 @@ checkParameterValidity(firstPassBandLength, secondPassBandLength,
 # A stop band again
 # Second pass band
 # Stop band for the rest
-
-
-halfOfCustomFilterDFT = ([firFilterSize/2] * 1 +  # This is DC
-                [0] * int(firstPassBandStartBin - 1) +
-                [firFilterSize/2] * firstPassBandLength +
-                [0] * int(secondPassBandStartBin - firstPassBandStartBin - (firstPassBandLength)) +
-                [firFilterSize/2] * (secondPassBandLength) +
-                [0] * int(firFilterSize/2 - secondPassBandStartBin - secondPassBandLength))
-
-# Now reverse the list and append to the end of the low pass filter
-customFilterRectangularDFT = (halfOfCustomFilterDFT +
-                              halfOfCustomFilterDFT[::-1])
-
-
-# Construct a low pass filter from the DFT
-customFilterRectangular = scipy.fftpack.ifft(customFilterRectangularDFT)
-customFilterBlackman = np.multiply(customFilterRectangular,
-                                   np.blackman(firFilterSize))
-customFilterBlackmanDFT = scipy.fftpack.fft(customFilterBlackman)
+#
+# Every band is (lowFrequency, highFrequency, gain), edges included. The
+# designer raises a ValueError for bands that overlap or leave 0 .. fs / 2.
+binWidth = samplingFrequency / firFilterSize
+customFilterBands = [
+        (0, 0, 1),  # This is DC
+        (firstPassBandStartBin * binWidth,
+         (firstPassBandStartBin + firstPassBandLength - 1) * binWidth, 1),
+        (secondPassBandStartBin * binWidth,
+         (secondPassBandStartBin + secondPassBandLength - 1) * binWidth, 1)]
+
+# Construct the filter from the desired DFT, with and without a window
+customFilterRectangular = filterDesign.designFrequencySampling(
+        customFilterBands, firFilterSize, samplingFrequency)
+customFilterBlackman = filterDesign.designFrequencySampling(
+        customFilterBands, firFilterSize, samplingFrequency, 'blackman')
+
+# The filters are real, so only the bins from DC up to fs / 2 are kept
+frequencyAxis, customFilterRectangularDFT = common.getSpectrum(
+        customFilterRectangular, samplingFrequency, oneSided=True)
+_, customFilterBlackmanDFT = common.getSpectrum(
+        customFilterBlackman, samplingFrequency, oneSided=True)
 
 # Colors for drawing the plots
 colorCustomRectangular = 'r.'
@@ -166,8 +111,6 @@ labelCustomBlackman = "Custom Blackman"
 
 # Variables for Plotting
 fig = plt.figure()
-frequencyAxis = np.arange(0, samplingFrequency,
-                          samplingFrequency/firFilterSize)
 
 Plot1 = plt.subplot(221)
 labelSignalPlot(Plot1, "Time Domain Values")
@@ -0,0 +1,82 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Small timing helpers shared by the benchmark scripts in this folder.
+# Importing this module also makes the repository root importable, so the
+# benchmarks can simply "import common".
+# ____________________________________________________________________________
+
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+# The repository root goes first even when it is already on the path (e.g.
+# through PYTHONPATH), so its modules win over benchmarks of the same name
+repositoryRoot = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+while repositoryRoot in sys.path:
+    sys.path.remove(repositoryRoot)
+sys.path.insert(0, repositoryRoot)
+
+
+def timeFunction(function, repeats=5, warmUp=1):
+    ''' Calls function warmUp times, then returns the best wall clock time in
+    seconds over the given number of repeats.'''
+    for i in range(warmUp):
+        function()
+    best = float('inf')
+    for i in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measureFunction(function, repeats=5, warmUp=1, minimumTime=0.0):
+    ''' Like timeFunction, but returns a dictionary with the best, median
+    and mean time in seconds. Each repeat calls function enough times to
+    last at least minimumTime seconds, so very short calls are not lost in
+    timer resolution.'''
+    for i in range(warmUp):
+        function()
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for i in range(calls):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= minimumTime:
+            break
+        calls *= 2
+
+    times = [elapsed / calls]
+    for i in range(repeats - 1):
+        start = time.perf_counter()
+        for j in range(calls):
+            function()
+        times.append((time.perf_counter() - start) / calls)
+    return {'best': min(times), 'median': statistics.median(times),
+            'mean': statistics.mean(times), 'repeats': repeats,
+            'callsPerRepeat': calls}
+
+
+def getHostDescription():
+    ''' Describes the machine and library versions a result was taken on.'''
+    import numpy
+    import scipy
+    return {'python': platform.python_version(),
+            'numpy': numpy.__version__, 'scipy': scipy.__version__,
+            'machine': platform.machine(), 'processor': platform.processor(),
+            'cpus': os.cpu_count(), 'system': platform.system()}
+
+
+def writeJSON(results, path):
+    ''' Writes benchmark results, with a description of the host, as JSON.'''
+    with open(path, 'w') as jsonFile:
+        json.dump({'host': getHostDescription(), 'results': results},
+                  jsonFile, indent=2)
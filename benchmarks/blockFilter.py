@@ -0,0 +1,64 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Streams wideband noise through firFilters.BlockFIRFilter with the 256 tap
+# filter length of 13_filteredWideband.py. Checks the output against the
+# one-shot convolution and reports throughput, latency and peak memory for
+# several FFT sizes.
+# ____________________________________________________________________________
+
+import numpy as np
+import scipy.signal
+import sys
+import time
+import tracemalloc
+import benchmarkTools
+import common
+import firFilters
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+samplingFrequency = 1e6
+seconds = 4
+chunkSize = 10000
+taps = scipy.signal.firwin(256, 0.1) * np.blackman(256)
+signal = common.generateWidebandNoise(samplingFrequency, seconds, seed=0)
+
+tracemalloc.start()
+start = time.perf_counter()
+oneShot = scipy.signal.convolve(signal, taps)
+oneShotTime = time.perf_counter() - start
+oneShotPeak = tracemalloc.get_traced_memory()[1]
+tracemalloc.stop()
+print('One-shot scipy.signal.convolve: %.1f Msamples/s, peak %.1f MB'
+      % (len(signal) / oneShotTime / 1e6, oneShotPeak / 1e6))
+
+print('\n%-13s %8s %12s %12s %14s' % ('method', 'fftSize', 'Msamples/s',
+                                      'latency (ms)', 'peak (kB)'))
+for method in firFilters.BLOCK_METHODS:
+    for fftSize in [512, 2048, 8192]:
+        blockFilter = firFilters.BlockFIRFilter(taps, fftSize, method)
+
+        def stream():
+            outputs = [blockFilter.process(
+                    signal[start:start + chunkSize])
+                    for start in range(0, len(signal), chunkSize)]
+            return np.concatenate(outputs + [blockFilter.flush()])
+
+        assert np.allclose(stream(), oneShot)
+        elapsed = benchmarkTools.timeFunction(stream, repeats=3)
+
+        # Peak memory of the streaming itself, outputs are thrown away
+        tracemalloc.start()
+        for start in range(0, len(signal), chunkSize):
+            blockFilter.process(signal[start:start + chunkSize])
+        blockFilter.flush()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        print('%-13s %8d %12.1f %12.3f %14.1f' % (
+                method, fftSize, len(signal) / elapsed / 1e6,
+                blockFilter.blockLength / samplingFrequency * 1e3,
+                peak / 1e3))
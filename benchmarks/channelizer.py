@@ -0,0 +1,68 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Splitting a second of wideband signal into uniform channels: the naive
+# bank of filterBanks.getUniformFilterBank, one convolution per channel
+# followed by decimation, against the streaming PolyphaseChannelizer,
+# critically sampled and 2x oversampled.
+# ____________________________________________________________________________
+
+import numpy as np
+import scipy.signal
+import sys
+import benchmarkTools
+import common
+import filterBanks
+import filterDesign
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+samplingFrequency = 1e6
+chunkSize = 2 ** 14
+signal = common.generateWidebandNoise(samplingFrequency, 1, seed=0)
+
+print('%9s %6s %11s %11s %16s %9s' % (
+        'channels', 'taps', 'decimation', 'bank (ms)', 'channelizer (ms)',
+        'speedup'))
+for numberOfChannels in [8, 32, 128]:
+    numberOfTaps = 8 * numberOfChannels - 1
+    prototype = filterDesign.designFrequencySampling(
+            [(0, 0.4 / numberOfChannels, 1)], numberOfTaps, 1, 'blackman')
+    bank = filterBanks.getUniformFilterBank(prototype, numberOfChannels)
+    for decimation in [numberOfChannels, numberOfChannels // 2]:
+        channelIndices = np.arange(numberOfChannels)[:, np.newaxis]
+        times = np.arange(0, len(signal), decimation)
+        basebandShift = np.exp(-2j * np.pi * channelIndices *
+                               (times % numberOfChannels) / numberOfChannels)
+
+        def naive():
+            filtered = [scipy.signal.oaconvolve(signal, taps)[times]
+                        for taps in bank]
+            return np.array(filtered) * basebandShift
+
+        def channelizer():
+            polyphase = filterBanks.PolyphaseChannelizer(
+                    prototype, numberOfChannels, decimation)
+            return np.concatenate(
+                    [polyphase.process(signal[start:start + chunkSize])
+                     for start in range(0, len(signal), chunkSize)], axis=1)
+
+        expected = naive()
+        assert np.allclose(expected, channelizer())
+        # Empty and tiny chunks complete no frames but must be accepted
+        polyphase = filterBanks.PolyphaseChannelizer(
+                prototype, numberOfChannels, decimation)
+        trickle = [polyphase.process(signal[start:start + size])
+                   for start, size in [(0, 0), (0, 1), (1, 0),
+                                       (1, 2 * chunkSize - 1)]]
+        assert trickle[0].shape == (numberOfChannels, 0)
+        completedFrames = -(-2 * chunkSize // decimation)
+        assert np.allclose(np.concatenate(trickle, axis=1),
+                           expected[:, :completedFrames])
+        naiveTime = benchmarkTools.timeFunction(naive, repeats=3)
+        channelizerTime = benchmarkTools.timeFunction(channelizer, repeats=3)
+        print('%9d %6d %11d %11.1f %16.1f %8.1fx' % (
+                numberOfChannels, numberOfTaps, decimation, naiveTime * 1e3,
+                channelizerTime * 1e3, naiveTime / channelizerTime))
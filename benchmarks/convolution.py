@@ -0,0 +1,174 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Convolution benchmark suite. Sweeps signal and filter lengths, dtypes and
+# channel counts over every convolution engine in the repository and the
+# numpy / scipy ones, timing each with perf_counter after a warm-up. Results
+# can be written as JSON; a summary shows the fastest engine per case and
+# where FFT convolution starts to beat the direct form.
+#
+# python benchmarks/convolution.py [--quick] [--output results.json]
+# ____________________________________________________________________________
+
+import argparse
+import numpy as np
+import scipy.signal
+import sys
+import benchmarkTools
+import common
+import firFilters
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+def streamBlock(taps, signals):
+    blockFilter = firFilters.BlockFIRFilter(
+            taps, dtype=np.result_type(taps, signals, np.float32),
+            channels=None if signals.ndim == 1 else len(signals))
+    return np.concatenate([blockFilter.process(signals),
+                           blockFilter.flush()], axis=-1)
+
+
+def streamDirect(taps, signals):
+    # Streaming filters only return one output per input; the tail that the
+    # other engines add is not part of this timing.
+    directFilter = firFilters.DirectFIRFilter(
+            taps, blockSize=signals.shape[-1],
+            dtype=np.result_type(taps, signals, np.float32),
+            channels=None if signals.ndim == 1 else len(signals))
+    return directFilter.process(signals)
+
+
+def perChannel(convolve):
+    ''' Runs a 1-D only convolution once per channel.'''
+    def loop(taps, signals):
+        if signals.ndim == 1:
+            return convolve(signals, taps)
+        return np.array([convolve(row, taps) for row in signals])
+    return loop
+
+
+# Name -> function(taps, signals) giving the full convolution along the
+# last axis. Engines without batching loop over the channels in Python.
+engines = {
+    'common auto': lambda taps, signals: common.convolve(taps, signals),
+    'common direct': lambda taps, signals: common.convolve(
+            taps, signals, method='direct'),
+    'common fft': lambda taps, signals: common.convolve(
+            taps, signals, method='fft'),
+    'np.convolve': perChannel(np.convolve),
+    'scipy direct': perChannel(lambda signal, taps: scipy.signal.convolve(
+            signal, taps, method='direct')),
+    'scipy fft': lambda taps, signals: scipy.signal.fftconvolve(
+            signals, np.atleast_1d(taps)[np.newaxis] if signals.ndim == 2
+            else taps, axes=-1),
+    'BlockFIRFilter': streamBlock,
+    'DirectFIRFilter': streamDirect,
+}
+
+
+def runSuite(signalLengths, filterLengths, dtypes, channelCounts, repeats):
+    rng = np.random.default_rng(0)
+    results = []
+    for channels in channelCounts:
+        for dtype in dtypes:
+            # The dtype sweep is only run for a single channel
+            if channels > 1 and dtype != dtypes[0]:
+                continue
+            for signalLength in signalLengths:
+                shape = (signalLength,) if channels == 1 else \
+                    (channels, signalLength)
+                signals = rng.standard_normal(shape).astype(dtype)
+                if np.issubdtype(dtype, np.complexfloating):
+                    signals += 1j * rng.standard_normal(shape)
+                for filterLength in filterLengths:
+                    if filterLength > signalLength:
+                        continue
+                    taps = rng.standard_normal(filterLength).astype(dtype)
+                    reference = perChannel(np.convolve)(taps, signals)
+                    tolerance = 1e-3 if dtype in (np.float32,
+                                                  np.complex64) else 1e-8
+                    for name, engine in engines.items():
+                        result = engine(taps, signals)
+                        length = result.shape[-1]
+                        assert np.allclose(result, reference[..., :length],
+                                           rtol=tolerance,
+                                           atol=tolerance * filterLength), \
+                            name
+                        timing = benchmarkTools.measureFunction(
+                                lambda: engine(taps, signals),
+                                repeats=repeats, minimumTime=0.01)
+                        timing.update({'engine': name,
+                                       'signalLength': signalLength,
+                                       'filterLength': filterLength,
+                                       'dtype': np.dtype(dtype).name,
+                                       'channels': channels})
+                        results.append(timing)
+                        print('%-16s %8d x %-5d %-10s %4d ch  %10.1f us' % (
+                                name, signalLength, filterLength,
+                                np.dtype(dtype).name, channels,
+                                timing['best'] * 1e6))
+    return results
+
+
+def printSummary(results, signalLengths, filterLengths):
+    ''' Fastest engine per (signal, filter) length for one float64 channel,
+    and the shortest filter at which scipy's FFT beats np.convolve.'''
+    table = {}
+    for result in results:
+        if result['dtype'] != 'float64' or result['channels'] != 1:
+            continue
+        key = (result['signalLength'], result['filterLength'])
+        table.setdefault(key, {})[result['engine']] = result['best']
+
+    print('\nFastest engine (float64, 1 channel), best time in us')
+    print('%8s ' % 'N \\ M' + ''.join('%24d' % m for m in filterLengths))
+    for signalLength in signalLengths:
+        row = '%8d ' % signalLength
+        for filterLength in filterLengths:
+            times = table.get((signalLength, filterLength))
+            if times is None:
+                row += '%24s' % '-'
+                continue
+            fastest = min(times, key=times.get)
+            row += '%24s' % ('%s %.0f' % (fastest, times[fastest] * 1e6))
+        print(row)
+
+    print('\nDirect/FFT crossover (np.convolve against scipy fft)')
+    for signalLength in signalLengths:
+        crossover = None
+        for filterLength in filterLengths:
+            times = table.get((signalLength, filterLength))
+            if times and times['scipy fft'] < times['np.convolve']:
+                crossover = filterLength
+                break
+        print('  N = %8d: FFT wins from M = %s' % (
+                signalLength, crossover if crossover else 'never (in sweep)'))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--quick', action='store_true',
+                        help='run a reduced sweep')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--repeats', type=int, default=3)
+    arguments = parser.parse_args()
+
+    if arguments.quick:
+        signalLengths = [16, 1024, 16384]
+        filterLengths = [4, 64, 1024]
+        dtypes = [np.float64]
+        channelCounts = [1, 16]
+    else:
+        signalLengths = [16, 256, 4096, 65536]
+        filterLengths = [4, 16, 64, 256, 1024]
+        dtypes = [np.float64, np.float32, np.complex128]
+        channelCounts = [1, 16, 64]
+
+    results = runSuite(signalLengths, filterLengths, dtypes, channelCounts,
+                       arguments.repeats)
+    printSummary(results, signalLengths, filterLengths)
+    if arguments.output:
+        benchmarkTools.writeJSON(results, arguments.output)
+        print('\nResults written to %s' % arguments.output)
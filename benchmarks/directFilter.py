@@ -0,0 +1,67 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Small block filtering with firFilters.DirectFIRFilter against the FFT based
+# BlockFIRFilter and scipy.signal.lfilter carrying its zi state. Also checks
+# that DirectFIRFilter allocates no arrays per call once it is warmed up.
+# ____________________________________________________________________________
+
+import numpy as np
+import scipy.signal
+import sys
+import tracemalloc
+import benchmarkTools
+import common
+import firFilters
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+samplingFrequency = 1e6
+numberOfBlocks = 200
+signal = common.generateWidebandNoise(samplingFrequency, 1, seed=0)
+
+print('%6s %6s %14s %14s %14s %12s' % (
+        'taps', 'block', 'direct (us)', 'lfilter (us)', 'fft (us)',
+        'peak bytes'))
+for numberOfTaps in [16, 64, 256]:
+    taps = scipy.signal.firwin(numberOfTaps, 0.1)
+    for blockSize in [16, 64, 256]:
+        directFilter = firFilters.DirectFIRFilter(taps, blockSize)
+        blockFilter = firFilters.BlockFIRFilter(taps)
+        out = np.empty(blockSize)
+        blocks = [signal[i * blockSize:(i + 1) * blockSize]
+                  for i in range(numberOfBlocks)]
+
+        # Same outputs as lfilter on the whole record
+        streamed = np.concatenate([directFilter.process(block)
+                                   for block in blocks])
+        expected = scipy.signal.lfilter(taps, 1, np.concatenate(blocks))
+        assert np.allclose(streamed, expected)
+
+        def direct():
+            for block in blocks:
+                directFilter.process(block, out=out)
+
+        def lfilter():
+            state = np.zeros(numberOfTaps - 1)
+            for block in blocks:
+                y, state = scipy.signal.lfilter(taps, 1, block, zi=state)
+
+        def fft():
+            for block in blocks:
+                blockFilter.process(block)
+
+        # Largest memory held at once during numberOfBlocks warmed up calls;
+        # it stays a few hundred bytes of views whatever the sizes are.
+        direct()
+        tracemalloc.start()
+        direct()
+        allocated = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        times = [benchmarkTools.timeFunction(f) / numberOfBlocks * 1e6
+                 for f in (direct, lfilter, fft)]
+        print('%6d %6d %14.1f %14.1f %14.1f %12.0f'
+              % ((numberOfTaps, blockSize) + tuple(times) + (allocated,)))
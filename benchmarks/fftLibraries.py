@@ -0,0 +1,52 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Compares the FFT backends of fftBackends (scipy.fft, numpy.fft and pyFFTW
+# when installed) across transform sizes and thread counts, for the complex
+# and the real transform. The first call of each size includes planning, so
+# it is printed next to the cached-plan time.
+# ____________________________________________________________________________
+
+import numpy as np
+import os
+import sys
+import time
+import benchmarkTools
+import fftBackends
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+rng = np.random.default_rng(0)
+sizes = [2 ** 10, 2 ** 14, 2 ** 18, 2 ** 22, 3 * 5 ** 7, 1000003]
+threadCounts = sorted({1, 2, 4, os.cpu_count() or 1})
+backends = fftBackends.getAvailableBackends()
+print('Backends: %s, CPUs: %d' % (', '.join(backends), os.cpu_count()))
+print('%8s %8s %10s %7s %14s %12s %12s' % (
+        'backend', 'kind', 'N', 'threads', 'first (ms)', 'best (ms)',
+        'MSamples/s'))
+
+for numberOfPoints in sizes:
+    realSignal = rng.uniform(-1, 1, numberOfPoints)
+    complexSignal = realSignal + 1j * rng.uniform(-1, 1, numberOfPoints)
+    reference = {'fft': np.fft.fft(complexSignal),
+                 'rfft': np.fft.rfft(realSignal)}
+    for name in backends:
+        # numpy.fft has no threads
+        for workers in (threadCounts if name != 'numpy' else [1]):
+            fftBackends.setBackend(name, workers)
+            for kind, signal in (('fft', complexSignal),
+                                 ('rfft', realSignal)):
+                transform = getattr(fftBackends, kind)
+                fftBackends.clearPlanCache()
+                start = time.perf_counter()
+                result = transform(signal)
+                firstTime = time.perf_counter() - start
+                assert np.allclose(result, reference[kind])
+                repeats = 5 if numberOfPoints <= 2 ** 18 else 2
+                bestTime = benchmarkTools.timeFunction(
+                        lambda: transform(signal), repeats=repeats)
+                print('%8s %8s %10d %7d %14.3f %12.3f %12.1f' % (
+                        name, kind, numberOfPoints, workers, firstTime * 1e3,
+                        bestTime * 1e3, numberOfPoints / bestTime / 1e6))
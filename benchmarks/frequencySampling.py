@@ -0,0 +1,75 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Designing many band pass filters in a loop: the list concatenation and
+# complex ifft 9_filterWindowing.py used to build its filter with, against
+# filterDesign.designFrequencySampling called per filter and called once for
+# the whole stack, and scipy.signal.firwin2.
+# ____________________________________________________________________________
+
+import numpy as np
+import scipy.signal
+import sys
+import benchmarkTools
+import filterDesign
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+def designWithLists(startBin, length, numberOfTaps):
+    ''' The band pass filter built the way 9_filterWindowing.py used to.'''
+    halfOfDFT = ([0] * startBin + [numberOfTaps / 2] * length +
+                 [0] * (numberOfTaps // 2 - startBin - length))
+    taps = np.fft.ifft(halfOfDFT + halfOfDFT[::-1])
+    return taps * np.blackman(numberOfTaps)
+
+
+samplingFrequency = 1000
+numberOfDesigns = 1000
+rng = np.random.default_rng(0)
+
+print('%7s %12s %12s %13s %12s %9s' % (
+        'taps', 'lists (ms)', 'design (ms)', 'batched (ms)', 'firwin2 (ms)',
+        'speedup'))
+for numberOfTaps in [64, 256, 1024]:
+    binWidth = samplingFrequency / numberOfTaps
+    startBins = rng.integers(2, numberOfTaps // 4, numberOfDesigns)
+    lengths = rng.integers(2, numberOfTaps // 4, numberOfDesigns)
+
+    def lists():
+        for startBin, length in zip(startBins, lengths):
+            designWithLists(int(startBin), int(length), numberOfTaps)
+
+    def design():
+        for startBin, length in zip(startBins, lengths):
+            filterDesign.designFrequencySampling(
+                    [(startBin * binWidth, (startBin + length - 1) *
+                      binWidth, 1)],
+                    numberOfTaps + 1, samplingFrequency, 'blackman')
+
+    def batched():
+        bands = np.stack([startBins * binWidth,
+                          (startBins + lengths - 1) * binWidth,
+                          np.ones(numberOfDesigns)], axis=-1)
+        return filterDesign.designFrequencySampling(
+                bands[:, np.newaxis], numberOfTaps + 1, samplingFrequency,
+                'blackman')
+
+    def firwin2():
+        for startBin, length in zip(startBins, lengths):
+            low = startBin * binWidth
+            high = (startBin + length - 1) * binWidth
+            scipy.signal.firwin2(numberOfTaps + 1,
+                                 [0, low - binWidth, low, high,
+                                  high + binWidth, samplingFrequency / 2],
+                                 [0, 0, 1, 1, 0, 0], window='blackman',
+                                 fs=samplingFrequency)
+
+    listsTime = benchmarkTools.timeFunction(lists, repeats=3)
+    designTime = benchmarkTools.timeFunction(design, repeats=3)
+    batchedTime = benchmarkTools.timeFunction(batched, repeats=3)
+    firwin2Time = benchmarkTools.timeFunction(firwin2, repeats=3)
+    print('%7d %12.1f %12.1f %13.1f %12.1f %8.1fx' % (
+            numberOfTaps, listsTime * 1e3, designTime * 1e3,
+            batchedTime * 1e3, firwin2Time * 1e3, listsTime / batchedTime))
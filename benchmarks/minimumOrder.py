@@ -0,0 +1,53 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Minimum order design for a few specs: the estimated and the found number
+# of taps for both design methods, the ripple and attenuation achieved,
+# and the time of filtering a second of signal with the found filter
+# against the 256 tap baseline of the demos.
+# ____________________________________________________________________________
+
+import numpy as np
+import sys
+import warnings
+import benchmarkTools
+import designCache
+import filterDesign
+import firFilters
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+samplingFrequency = 1000
+# (name, bands, passband ripple in dB, stopband attenuation in dB)
+specs = [('low pass', [(0, 100, 1), (125, 500, 0)], 1, 60),
+         ('low pass', [(0, 100, 1), (110, 500, 0)], 0.1, 80),
+         ('band pass', [(0, 80, 0), (100, 200, 1), (220, 500, 0)], 1, 60),
+         ('high pass', [(0, 150, 0), (175, 500, 1)], 0.5, 40)]
+signal = np.random.default_rng(0).uniform(-1, 1, samplingFrequency * 60)
+baseline = firFilters.DirectFIRFilter(np.ones(
+        filterDesign.BASELINE_NUMBER_OF_TAPS) / 256, blockSize=4096)
+baselineTime = benchmarkTools.timeFunction(
+        lambda: baseline.process(signal), repeats=3)
+
+# Remez warns about lengths it can not converge at while searching
+warnings.simplefilter('ignore')
+designCache.setCacheDirectory(None)
+print('%10s %6s %5s %18s %9s %7s %9s %8s %10s %9s' % (
+        'filter', 'ripple', 'atten', 'method', 'estimate', 'taps',
+        'ripple', 'atten', 'time (ms)', 'saved'))
+for name, bands, ripple, attenuation in specs:
+    for method in filterDesign.MINIMUM_ORDER_METHODS:
+        taps, report = filterDesign.designMinimumOrder(
+                bands, ripple, attenuation, samplingFrequency, method)
+        directFilter = firFilters.DirectFIRFilter(taps, blockSize=4096)
+        filterTime = benchmarkTools.timeFunction(
+                lambda: directFilter.process(signal), repeats=3)
+        print('%10s %6.2f %5d %18s %9d %7d %9.3f %8.1f %10.1f %8.0f%%' % (
+                name, ripple, attenuation, method, report['estimatedTaps'],
+                report['numberOfTaps'], report['passbandRipple'],
+                report['stopbandAttenuation'], filterTime * 1e3,
+                100 * report['multipliesSaved']))
+print('\nThe %d tap baseline filters the minute of signal in %.1f ms.' % (
+        filterDesign.BASELINE_NUMBER_OF_TAPS, baselineTime * 1e3))
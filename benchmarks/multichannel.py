@@ -0,0 +1,60 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# How filtering scales with the number of channels: batched common.convolve,
+# BlockFIRFilter and DirectFIRFilter on (channels x samples) arrays against a
+# Python loop over the channels with scipy.signal.convolve.
+# ____________________________________________________________________________
+
+import numpy as np
+import scipy.signal
+import sys
+import benchmarkTools
+import common
+import firFilters
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+numberOfSamples = 4096
+numberOfTaps = 256
+taps = scipy.signal.firwin(numberOfTaps, 0.1) * np.blackman(numberOfTaps)
+rng = np.random.default_rng(0)
+
+print('%8s %12s %12s %12s %12s %12s' % (
+        'channels', 'loop (ms)', 'convolve', 'per-ch taps', 'block FIR',
+        'direct FIR'))
+for channels in [1, 4, 16, 64, 256, 1024]:
+    signals = rng.standard_normal((channels, numberOfSamples))
+    perChannelTaps = rng.standard_normal((channels, numberOfTaps))
+    blockFilter = firFilters.BlockFIRFilter(taps, channels=channels)
+    directFilter = firFilters.DirectFIRFilter(taps, blockSize=512,
+                                              channels=channels)
+
+    def loop():
+        return np.array([scipy.signal.convolve(row, taps) for row in signals])
+
+    def batched():
+        return common.convolve(taps, signals)
+
+    def batchedPerChannel():
+        return common.convolve(perChannelTaps, signals)
+
+    def block():
+        return np.concatenate([blockFilter.process(signals),
+                               blockFilter.flush()], axis=1)
+
+    def direct():
+        directFilter.reset()
+        return directFilter.process(signals)
+
+    reference = loop()
+    assert np.allclose(batched(), reference)
+    assert np.allclose(block(), reference)
+    assert np.allclose(direct(), reference[:, :numberOfSamples])
+
+    times = [benchmarkTools.timeFunction(f, repeats=3) * 1e3
+             for f in (loop, batched, batchedPerChannel, block, direct)]
+    print('%8d %12.2f %12.2f %12.2f %12.2f %12.2f'
+          % ((channels,) + tuple(times)))
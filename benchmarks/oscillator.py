@@ -0,0 +1,64 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Checks that the streaming NCO in oscillators.py matches the one-shot
+# common.getDiscreteSinusoid, and shows that its memory use depends on the
+# chunk size only, not on the duration of the generated tone.
+# ____________________________________________________________________________
+
+import numpy as np
+import sys
+import tracemalloc
+import benchmarkTools
+import common
+import oscillators
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+samplingFrequency = 1e6
+frequency = 12345.678
+initialPhase = 0.3
+numberOfSamples = 2000000
+
+oneShot = common.getDiscreteSinusoid(frequency, samplingFrequency, np.cos,
+                                     numberOfSamples=numberOfSamples,
+                                     initialPhase=initialPhase)
+
+print('Streamed against one-shot, %d samples:' % numberOfSamples)
+for chunkSize in [1000, 4096, 65536]:
+    nco = oscillators.NumericallyControlledOscillator(
+            frequency, samplingFrequency, np.cos, initialPhase=initialPhase,
+            chunkSize=chunkSize)
+    streamed = np.concatenate(list(nco.chunks(numberOfSamples)))
+    error = np.max(np.abs(streamed - oneShot))
+    assert error < oscillators.NCO_TOLERANCE
+    print('  chunkSize %6d: max error %.2e (tolerance %.0e)'
+          % (chunkSize, error, oscillators.NCO_TOLERANCE))
+
+# Continuous phase across a frequency change
+nco = oscillators.NumericallyControlledOscillator(10, 1000, chunkSize=100)
+first = nco.generate()
+nco.setFrequency(20)
+second = nco.generate()
+expected = np.sin(2 * np.pi * (10 * 100 + 20 * np.arange(100)) / 1000)
+print('Phase error after frequency change: %.2e'
+      % np.max(np.abs(second - expected)))
+
+# Memory and time for one hour at 1 MHz (3.6e9 samples would be 28.8 GB in
+# one shot). Only a few seconds are streamed here, the peak is what matters.
+print('\nPeak memory while streaming (one-shot would need %.1f GB per hour):'
+      % (3600 * samplingFrequency * 8 / 1e9))
+for chunkSize in [4096, 65536]:
+    nco = oscillators.NumericallyControlledOscillator(
+            frequency, samplingFrequency, chunkSize=chunkSize)
+    buffer = np.empty(chunkSize)
+    tracemalloc.start()
+    for i in range(int(5 * samplingFrequency) // chunkSize):
+        nco.generate(out=buffer)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    seconds = benchmarkTools.timeFunction(lambda: nco.generate(out=buffer))
+    print('  chunkSize %6d: peak %8.1f kB, %.1f Msamples/s'
+          % (chunkSize, peak / 1e3, chunkSize / seconds / 1e6))
@@ -0,0 +1,54 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Accuracy (spurious free dynamic range) and throughput of the synthesis
+# engines of oscillators.NumericallyControlledOscillator: the transcendental
+# 'direct' path, the complex 'rotator' recursion and the 'table' lookup with
+# and without linear interpolation.
+# ____________________________________________________________________________
+
+import numpy as np
+import sys
+import benchmarkTools
+import oscillators
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+def spuriousFreeDynamicRange(signal, toneBin):
+    ''' Ratio in dB between the tone and the largest other spectral line.
+    The tone has to sit exactly on toneBin so no window is needed.'''
+    spectrum = np.abs(np.fft.rfft(signal))
+    tone = spectrum[toneBin]
+    spectrum[toneBin] = 0
+    return 20 * np.log10(tone / max(np.max(spectrum), 1e-300))
+
+
+samplingFrequency = 1e6
+numberOfSamples = 2 ** 16
+toneBin = 4099  # A prime bin, so table errors do not repeat every period
+frequency = toneBin * samplingFrequency / numberOfSamples
+chunkSize = 4096
+
+engines = [('direct', {}),
+           ('rotator', {}),
+           ('table', {'tableBits': 10, 'interpolate': False}),
+           ('table', {'tableBits': 10, 'interpolate': True}),
+           ('table', {'tableBits': 14, 'interpolate': False}),
+           ('table', {'tableBits': 14, 'interpolate': True})]
+
+print('%-26s %10s %14s' % ('method', 'SFDR (dB)', 'Msamples/s'))
+for method, options in engines:
+    nco = oscillators.NumericallyControlledOscillator(
+            frequency, samplingFrequency, chunkSize=chunkSize, method=method,
+            **options)
+    sfdr = spuriousFreeDynamicRange(nco.generate(numberOfSamples), toneBin)
+    buffer = np.empty(chunkSize)
+    seconds = benchmarkTools.timeFunction(lambda: nco.generate(out=buffer),
+                                          repeats=50)
+    name = method
+    if options:
+        name += ' %d bits%s' % (options['tableBits'],
+                                ', interp.' if options['interpolate'] else '')
+    print('%-26s %10.1f %14.1f' % (name, sfdr, chunkSize / seconds / 1e6))
@@ -0,0 +1,88 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Accuracy of spectral peak estimates against the FFT size. Every row holds
+# 1000 frames of one tone at a random frequency and phase with a little
+# noise. Prints the RMS frequency error (in bins of the unpadded FFT) and the
+# RMS amplitude error (in dB) of the largest bin, the largest bin of a 4x
+# zero padded FFT and the spectralPeaks interpolators, plus the time to
+# estimate all frames.
+# ____________________________________________________________________________
+
+import numpy as np
+import sys
+import time
+import benchmarkTools
+import common
+import spectralAnalysis
+import spectralPeaks
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+samplingFrequency = 1000
+numberOfFrames = 1000
+noiseAmplitude = 1e-3
+rng = np.random.default_rng(0)
+
+
+def estimate(name, frequencyAxis, spectrum, window, numberOfPoints):
+    ''' Returns (frequencies, amplitudes, seconds) of one estimator.'''
+    start = time.perf_counter()
+    if name in ('bin', '4x padded'):
+        peaks = spectralPeaks.findPeaks(np.abs(spectrum))[:, 0]
+        frequencies = frequencyAxis[peaks]
+        amplitudes = 2 * np.abs(spectrum[np.arange(len(spectrum)), peaks]) / \
+            np.sum(window)
+    else:
+        frequencies, amplitudes = spectralPeaks.estimatePeaks(
+                frequencyAxis, spectrum, method=name, window=window,
+                numberOfPoints=numberOfPoints)
+        frequencies = frequencies[:, 0]
+        amplitudes = amplitudes[:, 0]
+    return frequencies, amplitudes, time.perf_counter() - start
+
+
+print('%9s %5s %10s %14s %14s %10s' % ('window', 'N', 'estimator',
+                                       'freq (bins)', 'ampl (dB)',
+                                       'time (ms)'))
+for windowName in ['boxcar', 'hann', 'blackman']:
+    for numberOfSamples in [32, 128, 512, 2048]:
+        binSpacing = samplingFrequency / numberOfSamples
+        # Keep the tones a few bins away from DC and fs / 2
+        trueFrequencies = rng.uniform(4, numberOfSamples / 2 - 4,
+                                      numberOfFrames) * binSpacing
+        amplitudes = rng.uniform(0.5, 2, numberOfFrames)
+        frames = common.getDiscreteSinusoid(
+                trueFrequencies[:, None], samplingFrequency,
+                numberOfSamples=numberOfSamples,
+                initialPhase=rng.uniform(0, 2 * np.pi, (numberOfFrames, 1)),
+                amplitude=amplitudes[:, None])
+        frames += noiseAmplitude * rng.standard_normal(frames.shape)
+        window = spectralAnalysis.getWindow(windowName, numberOfSamples)
+        frames *= window
+
+        frequencyAxis, spectrum = common.getSpectrum(frames,
+                                                     samplingFrequency)
+        paddedAxis, paddedSpectrum = common.getSpectrum(
+                frames, samplingFrequency, 4 * numberOfSamples)
+        estimators = ['bin', '4x padded', 'parabolic', 'window']
+        if windowName == 'boxcar':
+            estimators.insert(3, 'jacobsen')
+        for name in estimators:
+            if name == '4x padded':
+                frequencies, estimated, seconds = estimate(
+                        name, paddedAxis, paddedSpectrum, window,
+                        4 * numberOfSamples)
+            else:
+                frequencies, estimated, seconds = estimate(
+                        name, frequencyAxis, spectrum, window,
+                        numberOfSamples)
+            frequencyError = np.sqrt(np.mean(
+                    (frequencies - trueFrequencies) ** 2)) / binSpacing
+            amplitudeError = np.sqrt(np.mean(
+                    (20 * np.log10(estimated / amplitudes)) ** 2))
+            print('%9s %5d %10s %14.2e %14.2e %10.2f' % (
+                    windowName, numberOfSamples, name, frequencyError,
+                    amplitudeError, seconds * 1e3))
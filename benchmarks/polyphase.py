@@ -0,0 +1,58 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Polyphase decimation, interpolation and rational resampling against
+# filtering at the full rate and then throwing samples away, which is what
+# 13_filteredWideband.py does. Checks the outputs agree and reports the time
+# and the multiplies per input sample.
+# ____________________________________________________________________________
+
+import numpy as np
+import scipy.signal
+import sys
+import benchmarkTools
+import common
+import firFilters
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+samplingFrequency = 1e6
+numberOfTaps = 256
+signal = common.generateWidebandNoise(samplingFrequency, 1, seed=0)
+chunkSize = 10000
+
+print('%-10s %14s %14s %14s %16s' % ('up/down', 'full rate (ms)',
+                                     'polyphase (ms)', 'upfirdn (ms)',
+                                     'mults/in (f/p)'))
+for up, down in [(1, 2), (1, 5), (1, 10), (4, 1), (3, 2), (2, 5)]:
+    taps = scipy.signal.firwin(numberOfTaps, 1.0 / max(up, down)) * up
+    resampler = firFilters.PolyphaseResampler(taps, up, down)
+
+    def fullRate():
+        upsampled = np.zeros(len(signal) * up)
+        upsampled[::up] = signal
+        return scipy.signal.convolve(upsampled, taps)[::down]
+
+    def polyphase():
+        resampler.reset()
+        return np.concatenate([resampler.process(
+                signal[start:start + chunkSize])
+                for start in range(0, len(signal), chunkSize)])
+
+    def upfirdn():
+        return scipy.signal.upfirdn(taps, signal, up, down)
+
+    result = polyphase()
+    assert np.allclose(result, fullRate()[:len(result)])
+
+    times = [benchmarkTools.timeFunction(f, repeats=3) * 1e3
+             for f in (fullRate, polyphase, upfirdn)]
+    # Direct-form multiplies per input sample at the full rate, and with
+    # only the kept outputs computed from their polyphase branch
+    fullMultiplies = numberOfTaps * up
+    polyphaseMultiplies = resampler.branchLength * up / down
+    print('%-10s %14.1f %14.1f %14.1f %9d/%-6.1f' % (
+            '%d/%d' % (up, down), times[0], times[1], times[2],
+            fullMultiplies, polyphaseMultiplies))
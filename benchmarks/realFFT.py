@@ -0,0 +1,66 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Compares the full complex scipy.fftpack.fft the demos used to take of real
+# signals with the one-sided real FFT behind common.getSpectrum: wall clock
+# time and peak memory for long signals.
+# ____________________________________________________________________________
+
+import numpy as np
+import scipy.fftpack
+import sys
+import tracemalloc
+import benchmarkTools
+import common
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+def peakMemory(function):
+    ''' Returns the peak memory in bytes numpy allocated while calling
+    function.'''
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def fullSpectrum(signal, samplingFrequency):
+    ''' The way the demos used to compute a spectrum.'''
+    frequencyAxis = np.arange(0, samplingFrequency,
+                              samplingFrequency / len(signal))
+    return frequencyAxis, scipy.fftpack.fft(signal)
+
+
+samplingFrequency = 1000
+rng = np.random.default_rng(0)
+
+print('%10s %12s %12s %9s %12s %12s' % ('N', 'fft (ms)', 'rfft (ms)',
+                                        'speedup', 'fft (MiB)',
+                                        'rfft (MiB)'))
+for exponent in [16, 18, 20, 22, 24]:
+    numberOfSamples = 2 ** exponent
+    signal = rng.uniform(-1, 1, numberOfSamples)
+
+    def full():
+        return fullSpectrum(signal, samplingFrequency)
+
+    def oneSided():
+        return common.getSpectrum(signal, samplingFrequency)
+
+    fullAxis, fullDFT = full()
+    oneSidedAxis, oneSidedDFT = oneSided()
+    half = numberOfSamples // 2 + 1
+    assert np.allclose(fullDFT[:half], oneSidedDFT)
+    assert np.allclose(fullAxis[:half], oneSidedAxis)
+    del fullAxis, fullDFT, oneSidedAxis, oneSidedDFT
+
+    repeats = 5 if exponent <= 20 else 2
+    fullTime = benchmarkTools.timeFunction(full, repeats=repeats)
+    oneSidedTime = benchmarkTools.timeFunction(oneSided, repeats=repeats)
+    print('%10d %12.2f %12.2f %8.1fx %12.1f %12.1f' % (
+            numberOfSamples, fullTime * 1e3, oneSidedTime * 1e3,
+            fullTime / oneSidedTime, peakMemory(full) / 2 ** 20,
+            peakMemory(oneSided) / 2 ** 20))
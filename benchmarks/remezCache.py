@@ -0,0 +1,55 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# The design cache on the remez filter of 13_filteredWideband.py: designing
+# it with scipy.signal.remez, loading it from disk (a new run of a script)
+# and finding it in memory (a repeat request within one run).
+# ____________________________________________________________________________
+
+import numpy as np
+import scipy.signal
+import shutil
+import sys
+import tempfile
+import benchmarkTools
+import designCache
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+samplingFrequency = 1000
+cutoffFrequency = 97.65625
+transitionGap = 0.01
+bands = [0, cutoffFrequency, cutoffFrequency + transitionGap,
+         samplingFrequency / 2]
+
+directory = tempfile.mkdtemp()
+designCache.setCacheDirectory(directory)
+print('%7s %14s %12s %14s %9s' % ('taps', 'remez (ms)', 'disk (ms)',
+                                  'memory (us)', 'speedup'))
+try:
+    for numberOfTaps in [64, 256, 512, 1024]:
+        def design():
+            return scipy.signal.remez(numberOfTaps, bands, [1, 0],
+                                      fs=samplingFrequency)
+
+        def disk():
+            designCache.clearCache()
+            return designCache.remez(numberOfTaps, bands, [1, 0],
+                                     samplingFrequency)
+
+        def memory():
+            return designCache.remez(numberOfTaps, bands, [1, 0],
+                                     samplingFrequency)
+
+        assert np.array_equal(design(), disk())
+        designTime = benchmarkTools.timeFunction(design, repeats=3)
+        diskTime = benchmarkTools.timeFunction(disk)
+        memoryTime = benchmarkTools.measureFunction(
+                memory, minimumTime=0.01)['best']
+        print('%7d %14.1f %12.3f %14.1f %8.0fx' % (
+                numberOfTaps, designTime * 1e3, diskTime * 1e3,
+                memoryTime * 1e6, designTime / diskTime))
+finally:
+    shutil.rmtree(directory)
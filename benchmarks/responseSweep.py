@@ -0,0 +1,74 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Frequency responses of a parameter sweep: a stack of windowed frequency
+# sampling low pass filters with different cutoffs, evaluated filter by
+# filter with scipy.signal.freqz and group_delay, against one batched
+# frequencyResponse.getFrequencyResponse call, on a dense linear grid (an
+# FFT), a zoomed passband (a chirp-Z transform, or the direct sum for many
+# short filters) and a logarithmic grid (the direct sum).
+# ____________________________________________________________________________
+
+import numpy as np
+import scipy.signal
+import sys
+import benchmarkTools
+import filterDesign
+import frequencyResponse
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+samplingFrequency = 1e6
+numberOfPoints = 4096
+grids = [('linear', np.arange(numberOfPoints // 2 + 1) * samplingFrequency /
+          numberOfPoints),
+         ('zoomed', np.linspace(0, samplingFrequency / 20, numberOfPoints)),
+         ('log', np.geomspace(1e2, samplingFrequency / 2, numberOfPoints))]
+
+print('%8s %6s %8s %14s %13s %9s' % (
+        'grid', 'taps', 'filters', 'per filter (ms)',
+        'batched (ms)', 'speedup'))
+for numberOfTaps in [63, 255]:
+    for numberOfFilters in [16, 128]:
+        cutoffs = np.linspace(0.05, 0.4, numberOfFilters) * samplingFrequency
+        bands = np.zeros((numberOfFilters, 1, 3))
+        bands[:, 0, 1] = cutoffs
+        bands[:, 0, 2] = 1
+        stack = filterDesign.designFrequencySampling(
+                bands, numberOfTaps, samplingFrequency, 'hamming')
+
+        for name, frequencies in grids:
+            def perFilter():
+                results = []
+                for taps in stack:
+                    _, response = scipy.signal.freqz(
+                            taps, worN=frequencies, fs=samplingFrequency)
+                    _, groupDelay = scipy.signal.group_delay(
+                            (taps, 1), w=frequencies, fs=samplingFrequency)
+                    results.append((20 * np.log10(np.abs(response)),
+                                    np.unwrap(np.angle(response)),
+                                    groupDelay))
+                return results
+
+            def batched():
+                return frequencyResponse.getFrequencyResponse(
+                        stack, frequencies, samplingFrequency)
+
+            with np.errstate(divide='ignore', invalid='ignore'):
+                expected = perFilter()
+            magnitude, phase, groupDelay = batched()
+            passband = frequencies < 0.04 * samplingFrequency
+            assert np.allclose(magnitude[:, passband],
+                               [result[0][passband] for result in expected])
+            assert np.allclose(groupDelay[:, passband],
+                               [result[2][passband] for result in expected])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                perFilterTime = benchmarkTools.timeFunction(perFilter,
+                                                            repeats=3)
+            batchedTime = benchmarkTools.timeFunction(batched, repeats=3)
+            print('%8s %6d %8d %14.1f %13.1f %8.1fx' % (
+                    name, numberOfTaps, numberOfFilters,
+                    perFilterTime * 1e3, batchedTime * 1e3,
+                    perFilterTime / batchedTime))
@@ -0,0 +1,122 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Evaluating a handful of DFT bins: both spectralAnalysis.goertzel methods
+# against a full real FFT, for one frame and for a batch of frames. Then
+# tracking the bins for every new sample: SlidingDFT against recomputing the
+# FFT of the window at every sample (an STFT with a hop of one), over long
+# chunks, and against evaluating every window with goertzel when the input
+# arrives a sample or a few samples per call.
+# ____________________________________________________________________________
+
+import copy
+import numpy as np
+import sys
+import benchmarkTools
+import fftBackends
+import spectralAnalysis
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+samplingFrequency = 1000
+rng = np.random.default_rng(0)
+
+print('%7s %7s %4s %10s %12s %15s %9s' % (
+        'frames', 'N', 'K', 'fft (ms)', 'matrix (ms)', 'recursive (ms)',
+        'speedup'))
+for numberOfFrames in [1, 1000]:
+    for numberOfPoints in [64, 256, 1024]:
+        frames = rng.uniform(-1, 1, (numberOfFrames, numberOfPoints))
+        for numberOfBins in [1, 3, 8]:
+            bins = rng.choice(numberOfPoints // 2, numberOfBins,
+                              replace=False)
+            frequencies = bins * samplingFrequency / numberOfPoints
+
+            def full():
+                return fftBackends.rfft(frames)[:, bins]
+
+            def matrix():
+                return spectralAnalysis.goertzel(frames, samplingFrequency,
+                                                 frequencies)
+
+            def recursive():
+                return spectralAnalysis.goertzel(frames, samplingFrequency,
+                                                 frequencies, 'recursive')
+
+            assert np.allclose(full(), matrix())
+            assert np.allclose(full(), recursive())
+            fullTime = benchmarkTools.timeFunction(full)
+            matrixTime = benchmarkTools.timeFunction(matrix)
+            recursiveTime = benchmarkTools.timeFunction(recursive)
+            print('%7d %7d %4d %10.3f %12.3f %15.3f %8.2fx' % (
+                    numberOfFrames, numberOfPoints, numberOfBins,
+                    fullTime * 1e3, matrixTime * 1e3, recursiveTime * 1e3,
+                    fullTime / matrixTime))
+
+# Per-sample tracking of 3 bins over 20000 samples
+numberOfSamples = 20000
+signal = rng.uniform(-1, 1, numberOfSamples)
+print('\n%7s %16s %16s %9s' % ('N', 'per-sample fft', 'sliding DFT',
+                               'speedup'))
+for windowLength in [64, 256, 1024, 4096]:
+    bins = np.array([3, 10, 21])
+    frequencies = bins * samplingFrequency / windowLength
+    padded = np.concatenate((np.zeros(windowLength - 1), signal))
+
+    def recomputed():
+        frames = spectralAnalysis.getFrames(padded, windowLength, 1)
+        return np.concatenate([fftBackends.rfft(frames[i:i + 1024])[:, bins]
+                               for i in range(0, len(frames), 1024)])
+
+    def sliding():
+        tracker = spectralAnalysis.SlidingDFT(samplingFrequency,
+                                              frequencies, windowLength)
+        return np.concatenate([tracker.process(signal[i:i + 4096])
+                               for i in range(0, numberOfSamples, 4096)])
+
+    assert np.allclose(recomputed(), sliding())
+    recomputedTime = benchmarkTools.timeFunction(recomputed, repeats=3)
+    slidingTime = benchmarkTools.timeFunction(sliding, repeats=3)
+    print('%7d %13.1f ms %13.1f ms %8.1fx' % (
+            windowLength, recomputedTime * 1e3, slidingTime * 1e3,
+            recomputedTime / slidingTime))
+
+# Per-call cost with tiny chunks: it must not grow with the window length
+print('\n%7s %7s %19s %19s %9s' % ('chunk', 'N', 'goertzel (us/call)',
+                                  'sliding (us/call)', 'speedup'))
+for chunkSize in [1, 16]:
+    numberOfCalls = 2000 // chunkSize
+    for windowLength in [64, 4096, 65536]:
+        bins = np.array([3, 10, 21])
+        frequencies = bins * samplingFrequency / windowLength
+        stream = rng.uniform(-1, 1, windowLength + numberOfCalls * chunkSize)
+        frames = spectralAnalysis.getFrames(
+                np.concatenate((np.zeros(windowLength - 1), stream)),
+                windowLength, 1)
+        # Every run continues from a tracker whose window is already full
+        warmTracker = spectralAnalysis.SlidingDFT(samplingFrequency,
+                                                  frequencies, windowLength)
+        warmTracker.process(stream[:windowLength])
+        chunks = [stream[start:start + chunkSize] for start in
+                  range(windowLength, len(stream), chunkSize)]
+
+        def perWindow():
+            return [spectralAnalysis.goertzel(
+                    frames[start:start + chunkSize], samplingFrequency,
+                    frequencies)
+                    for start in range(windowLength, len(stream), chunkSize)]
+
+        def sliding():
+            tracker = copy.deepcopy(warmTracker)
+            return [tracker.process(chunk) for chunk in chunks]
+
+        assert np.allclose(np.concatenate(sliding()),
+                           np.concatenate(perWindow()))
+        perWindowTime = benchmarkTools.timeFunction(perWindow, repeats=3)
+        slidingTime = benchmarkTools.timeFunction(sliding, repeats=3)
+        print('%7d %7d %19.1f %19.1f %8.1fx' % (
+                chunkSize, windowLength, perWindowTime / numberOfCalls * 1e6,
+                slidingTime / numberOfCalls * 1e6,
+                perWindowTime / slidingTime))
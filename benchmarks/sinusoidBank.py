@@ -0,0 +1,73 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Compares the vectorized sinusoid bank in common.getDiscreteSinusoid with
+# looping the old one-tone-per-call implementation the demos used to carry.
+# ____________________________________________________________________________
+
+import numpy as np
+import sys
+import benchmarkTools
+import common
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+def legacyDiscreteSinusoid(sinusoidFrequency, samplingFrequency,
+                           numberOfSamples, initialPhase=0, amplitude=1):
+    ''' The per-call implementation the demos used before common.py.'''
+    n = np.arange(0, numberOfSamples)
+    return amplitude * np.sin(initialPhase + 2 * np.pi *
+                              sinusoidFrequency * n / samplingFrequency)
+
+
+samplingFrequency = 48000
+numberOfSamples = 4096
+rng = np.random.default_rng(0)
+
+print('%8s %12s %12s %12s %10s' % ('tones', 'loop (ms)', 'bank (ms)',
+                                   'summed (ms)', 'speedup'))
+for numberOfTones in [1, 10, 100, 500, 1000]:
+    frequencies = rng.uniform(20, samplingFrequency / 2, numberOfTones)
+    phases = rng.uniform(0, 2 * np.pi, numberOfTones)
+    amplitudes = rng.uniform(0, 1, numberOfTones)
+    out = np.empty((numberOfTones, numberOfSamples))
+    summedOut = np.empty(numberOfSamples)
+
+    def loop():
+        return np.array([legacyDiscreteSinusoid(f, samplingFrequency,
+                                                numberOfSamples, p, a)
+                         for f, p, a in zip(frequencies, phases, amplitudes)])
+
+    def bank():
+        return common.getDiscreteSinusoid(
+                frequencies, samplingFrequency,
+                numberOfSamples=numberOfSamples, initialPhase=phases,
+                amplitude=amplitudes, out=out)
+
+    def summed():
+        return common.getDiscreteSinusoid(
+                frequencies, samplingFrequency,
+                numberOfSamples=numberOfSamples, initialPhase=phases,
+                amplitude=amplitudes, summed=True, out=summedOut)
+
+    assert np.allclose(loop(), bank())
+    assert np.allclose(loop().sum(axis=0), summed())
+
+    loopTime = benchmarkTools.timeFunction(loop)
+    bankTime = benchmarkTools.timeFunction(bank)
+    summedTime = benchmarkTools.timeFunction(summed)
+    print('%8d %12.3f %12.3f %12.3f %9.1fx' % (
+            numberOfTones, loopTime * 1e3, bankTime * 1e3, summedTime * 1e3,
+            loopTime / bankTime))
+
+# float32 output halves the memory of the stored bank
+for dtype in [np.float64, np.float32]:
+    frequencies = rng.uniform(20, samplingFrequency / 2, 1000)
+    bankTime = benchmarkTools.timeFunction(
+            lambda: common.getDiscreteSinusoid(
+                    frequencies, samplingFrequency,
+                    numberOfSamples=numberOfSamples, dtype=dtype))
+    print('1000 tones as %s: %.3f ms' % (np.dtype(dtype).name,
+                                         bankTime * 1e3))
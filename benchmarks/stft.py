@@ -0,0 +1,91 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Compares STFT implementations: a Python loop that copies and transforms
+# one frame at a time, the batched spectralAnalysis.stft over strided frame
+# views, and scipy.signal.stft. Then streams a long wideband record through
+# ShortTimeFourierTransform chunk by chunk, whose peak memory stays at the
+# chunk size however long the record is.
+# ____________________________________________________________________________
+
+import numpy as np
+import scipy.signal
+import sys
+import tracemalloc
+import benchmarkTools
+import common
+import spectralAnalysis
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+def loopSTFT(signal, frameLength, hop, window):
+    ''' One frame per FFT call.'''
+    starts = range(0, len(signal) - frameLength + 1, hop)
+    return np.array([np.fft.rfft(signal[start:start + frameLength] * window)
+                     for start in starts])
+
+
+def peakMemory(function):
+    ''' Returns the peak memory in bytes allocated while calling function.'''
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+samplingFrequency = 48000
+frameLength = 1024
+rng = np.random.default_rng(0)
+window = spectralAnalysis.getWindow('hann', frameLength)
+
+print('%9s %6s %10s %12s %12s %12s' % ('samples', 'hop', 'frames',
+                                       'loop (ms)', 'batched (ms)',
+                                       'scipy (ms)'))
+for numberOfSamples in [2 ** 16, 2 ** 20]:
+    signal = rng.uniform(-1, 1, numberOfSamples)
+    for hop in [frameLength // 4, frameLength // 2]:
+        def loop():
+            return loopSTFT(signal, frameLength, hop, window)
+
+        def batched():
+            return spectralAnalysis.stft(signal, samplingFrequency,
+                                         frameLength, hop)[2]
+
+        def scipySTFT():
+            return scipy.signal.stft(signal, samplingFrequency, window,
+                                     frameLength, frameLength - hop,
+                                     boundary=None, padded=False)[2]
+
+        spectrogram = batched()
+        assert np.allclose(loop(), spectrogram)
+        loopTime = benchmarkTools.timeFunction(loop, repeats=3)
+        batchedTime = benchmarkTools.timeFunction(batched, repeats=3)
+        scipyTime = benchmarkTools.timeFunction(scipySTFT, repeats=3)
+        print('%9d %6d %10d %12.2f %12.2f %12.2f' % (
+                numberOfSamples, hop, len(spectrogram), loopTime * 1e3,
+                batchedTime * 1e3, scipyTime * 1e3))
+
+# Streaming a long record: average power spectrum of a wideband noise record
+# that never exists in memory at once.
+chunkSize = 2 ** 16
+hop = frameLength // 2
+print('\n%9s %12s %14s %14s' % ('seconds', 'time (s)', 'peak (MiB)',
+                                'record (MiB)'))
+for seconds in [10, 60, 300]:
+    def streamed():
+        transform = spectralAnalysis.ShortTimeFourierTransform(frameLength,
+                                                               hop)
+        power = np.zeros(frameLength // 2 + 1)
+        for chunk in common.generateWidebandNoiseChunks(
+                samplingFrequency, seconds, chunkSize=chunkSize):
+            power += np.sum(np.abs(transform.process(chunk)) ** 2, axis=0)
+        return power / transform.framesProduced
+
+    elapsed = benchmarkTools.timeFunction(streamed, repeats=1, warmUp=0)
+    recordSize = common.getSampleCount(samplingFrequency, seconds) * 8
+    print('%9d %12.2f %14.1f %14.1f' % (seconds, elapsed,
+                                        peakMemory(streamed) / 2 ** 20,
+                                        recordSize / 2 ** 20))
@@ -0,0 +1,60 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Linear phase filtering with firFilters.SymmetricFIRFilter, which folds the
+# mirrored taps, against the plain direct form of DirectFIRFilter at the same
+# block size, for windowed frequency sampling low pass filters and half-band
+# filters whose every other tap is zero. Both stream a second of signal in
+# chunks.
+# ____________________________________________________________________________
+
+import numpy as np
+import sys
+import benchmarkTools
+import common
+import filterDesign
+import firFilters
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+samplingFrequency = 1e6
+chunkSize = 2 ** 14
+signal = common.generateWidebandNoise(samplingFrequency, 1, seed=0)
+chunks = [signal[start:start + chunkSize]
+          for start in range(0, len(signal), chunkSize)]
+
+print('%10s %6s %11s %11s %13s %13s %9s' % (
+        'filter', 'taps', 'multiplies', 'blockSize', 'direct (ms)',
+        'folded (ms)', 'speedup'))
+for numberOfTaps in [15, 63, 255, 511]:
+    lowPass = filterDesign.designFrequencySampling(
+            [(0, samplingFrequency / 8, 1)], numberOfTaps,
+            samplingFrequency, 'hamming')
+    # Half-band: cut off at fs / 4, every other tap but the middle one zero
+    halfBand = filterDesign.designFrequencySampling(
+            [(0, samplingFrequency / 4, 1)], numberOfTaps,
+            samplingFrequency, 'hamming')
+    offsets = np.arange(numberOfTaps) - numberOfTaps // 2
+    halfBand[(offsets % 2 == 0) & (offsets != 0)] = 0
+
+    for name, taps in [('low pass', lowPass), ('half-band', halfBand)]:
+        expected = common.convolve(taps, signal)[:len(signal)]
+        # Both filters at the same block size, so only the folding differs
+        for blockSize in [256, 1024, 4096, 16384]:
+            directFilter = firFilters.DirectFIRFilter(taps, blockSize)
+            foldedFilter = firFilters.SymmetricFIRFilter(taps, blockSize)
+            assert np.allclose(np.concatenate(
+                    [foldedFilter.process(chunk) for chunk in chunks]),
+                    expected)
+            directTime = benchmarkTools.timeFunction(
+                    lambda: [directFilter.process(chunk) for chunk in chunks],
+                    repeats=3)
+            foldedTime = benchmarkTools.timeFunction(
+                    lambda: [foldedFilter.process(chunk) for chunk in chunks],
+                    repeats=3)
+            print('%10s %6d %11d %11d %13.1f %13.1f %8.2fx' % (
+                    name, numberOfTaps, foldedFilter.numberOfMultiplies,
+                    blockSize, directTime * 1e3, foldedTime * 1e3,
+                    directTime / foldedTime))
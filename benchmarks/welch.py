@@ -0,0 +1,88 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Welch power spectral density on multi-minute wideband records. Compares
+# the noise floor spread of a single periodogram with Welch averages, then
+# times spectralAnalysis.welch over batch sizes and worker pools against
+# scipy.signal.welch, with the peak memory of each. The last table streams
+# a record that is never held in memory through PowerSpectralDensity.
+# ____________________________________________________________________________
+
+import numpy as np
+import scipy.signal
+import sys
+import tracemalloc
+import benchmarkTools
+import common
+import spectralAnalysis
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+def peakMemory(function):
+    ''' Returns the peak memory in bytes allocated while calling function.'''
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def floorSpread(density):
+    ''' Standard deviation in dB of the density, DC and fs / 2 left out.'''
+    return np.std(10 * np.log10(density[1:-1]))
+
+
+if __name__ == '__main__':
+    samplingFrequency = 48000
+    segmentLength = 1024
+    seconds = 120
+    record = common.generateWidebandNoise(samplingFrequency, seconds, seed=0)
+    print('%d s at %d Hz: %.1f MiB record' % (seconds, samplingFrequency,
+                                              record.nbytes / 2 ** 20))
+
+    periodogram = spectralAnalysis.welch(record, samplingFrequency,
+                                         len(record), window='boxcar')[1]
+    welchDensity = spectralAnalysis.welch(record, samplingFrequency,
+                                          segmentLength)[1]
+    print('Noise floor spread: periodogram %.2f dB, Welch %.2f dB\n' % (
+            floorSpread(periodogram), floorSpread(welchDensity)))
+
+    print('%30s %10s %12s' % ('', 'time (s)', 'peak (MiB)'))
+    variants = [('scipy.signal.welch', lambda: scipy.signal.welch(
+            record, samplingFrequency, 'hann', segmentLength,
+            detrend=False)[1])]
+    for batchSegments in [64, 1024, 16384]:
+        variants.append(('batch %d' % batchSegments,
+                         lambda batchSegments=batchSegments:
+                         spectralAnalysis.welch(
+                                 record, samplingFrequency, segmentLength,
+                                 batchSegments=batchSegments)[1]))
+    for executor in spectralAnalysis.WELCH_EXECUTORS:
+        variants.append(('batch 1024, 2 %s workers' % executor,
+                         lambda executor=executor: spectralAnalysis.welch(
+                                 record, samplingFrequency, segmentLength,
+                                 workers=2, executor=executor)[1]))
+    for name, function in variants:
+        assert np.allclose(function(), welchDensity)
+        elapsed = benchmarkTools.timeFunction(function, repeats=2)
+        print('%30s %10.2f %12.1f' % (name, elapsed,
+                                      peakMemory(function) / 2 ** 20))
+
+    print('\n%9s %10s %12s %14s' % ('seconds', 'time (s)', 'peak (MiB)',
+                                    'record (MiB)'))
+    for seconds in [60, 300, 600]:
+        def streamed():
+            estimator = spectralAnalysis.PowerSpectralDensity(
+                    samplingFrequency, segmentLength)
+            for chunk in common.generateWidebandNoiseChunks(
+                    samplingFrequency, seconds):
+                estimator.process(chunk)
+            return estimator.getDensity()
+
+        elapsed = benchmarkTools.timeFunction(streamed, repeats=1, warmUp=0)
+        print('%9d %10.2f %12.1f %14.1f' % (
+                seconds, elapsed, peakMemory(streamed) / 2 ** 20,
+                common.getSampleCount(samplingFrequency, seconds) * 8 /
+                2 ** 20))
@@ -0,0 +1,56 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Throughput of common.generateWidebandNoise for several worker counts and of
+# the chunked generator for several chunk sizes. Every variant is checked to
+# give exactly the same samples for the same seed.
+# ____________________________________________________________________________
+
+import numpy as np
+import os
+import sys
+import benchmarkTools
+import common
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+samplingFrequency = 1e6
+seconds = 20
+seed = 1234
+
+
+def chunked(chunkSize):
+    total = 0
+    for chunk in common.generateWidebandNoiseChunks(
+            samplingFrequency, seconds, seed=seed, chunkSize=chunkSize):
+        total += len(chunk)
+    return total
+
+
+if __name__ == '__main__':
+    reference = common.generateWidebandNoise(samplingFrequency, seconds,
+                                             seed=seed)
+    print('%d samples, %d CPUs' % (len(reference), os.cpu_count()))
+
+    for workers in [1, 2, 4]:
+        result = common.generateWidebandNoise(samplingFrequency, seconds,
+                                              seed=seed, workers=workers)
+        assert np.array_equal(result, reference)
+        elapsed = benchmarkTools.timeFunction(
+                lambda: common.generateWidebandNoise(
+                        samplingFrequency, seconds, seed=seed,
+                        workers=workers), repeats=3)
+        print('  %d worker(s): %7.1f Msamples/s'
+              % (workers, len(reference) / elapsed / 1e6))
+
+    for chunkSize in [1000, 65536, 1000000]:
+        pieces = common.generateWidebandNoiseChunks(
+                samplingFrequency, 1, seed=seed, chunkSize=chunkSize)
+        assert np.array_equal(np.concatenate(list(pieces)),
+                              reference[:int(samplingFrequency)])
+        elapsed = benchmarkTools.timeFunction(lambda: chunked(chunkSize),
+                                              repeats=3)
+        print('  chunks of %7d: %7.1f Msamples/s'
+              % (chunkSize, len(reference) / elapsed / 1e6))
@@ -0,0 +1,89 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Window generation: the per-sample loop 5_windowing.py used to build its
+# triangular window with, against the vectorized windows.getWindow with an
+# empty cache and with a warm one. Then windowing a batch of frames with
+# windows.apply, allocating the product or writing it into the frames.
+# ____________________________________________________________________________
+
+import numpy as np
+import sys
+import tracemalloc
+import benchmarkTools
+import windows
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+def getTriangularWindowLoop(length, startVal=0.05):
+    ''' The loop based window 5_windowing.py used before windows.py.'''
+    halfLength = length // 2
+    window = []
+
+    for x in np.linspace(startVal, 1.0, halfLength, endpoint=False):
+        window.append(x)
+
+    for x in np.linspace(1.0, startVal, halfLength, endpoint=True):
+        window.append(x)
+
+    return np.array(window)
+
+
+def peakMemory(function):
+    ''' Returns the peak memory in bytes allocated while calling function.'''
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+print('%7s %11s %10s %15s %12s %9s' % (
+        'N', 'window', 'loop (us)', 'uncached (us)', 'cached (us)',
+        'speedup'))
+for length in [128, 1024, 8192, 65536]:
+    for windowType in ['triangular', 'hann', 'kaiser', 'flattop']:
+        def loop():
+            return getTriangularWindowLoop(length)
+
+        def uncached():
+            windows.clearCache()
+            return windows.getWindow(windowType, length)
+
+        def cached():
+            return windows.getWindow(windowType, length)
+
+        if windowType == 'triangular':
+            loopTime = benchmarkTools.timeFunction(loop)
+            loopColumn = '%10.1f' % (loopTime * 1e6)
+        else:
+            loopColumn = '%10s' % '-'
+        uncachedTime = benchmarkTools.timeFunction(uncached)
+        cachedTime = benchmarkTools.measureFunction(
+                cached, minimumTime=0.01)['best']
+        print('%7d %11s %s %15.1f %12.2f %8.0fx' % (
+                length, windowType, loopColumn, uncachedTime * 1e6,
+                cachedTime * 1e6, uncachedTime / cachedTime))
+
+# Hann windowing 256 frames of 4096 samples
+frames = np.random.default_rng(0).uniform(-1, 1, (256, 4096))
+out = np.empty_like(frames)
+
+
+def allocating():
+    return frames * np.hanning(frames.shape[-1])
+
+
+def intoOut():
+    return windows.apply(frames, 'hann', out=out)
+
+
+assert np.allclose(allocating(), intoOut())
+print('\n%22s %10s %14s' % ('', 'time (ms)', 'peak memory'))
+for name, function in [('frames * np.hanning', allocating),
+                       ('windows.apply(out=)', intoOut)]:
+    print('%22s %10.2f %11.1f kB' % (
+            name, benchmarkTools.timeFunction(function) * 1e3,
+            peakMemory(function) / 1e3))
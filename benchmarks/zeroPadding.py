@@ -0,0 +1,75 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Compares the ways a zero padded spectrum can be made: joining Python lists
+# like the demos used to, common.zeroPad into a preallocated array, letting
+# the FFT pad through n=, and rounding n up to the next 5-smooth length.
+# Prints wall clock time and peak memory per signal length. The lengths are
+# convolution outputs (signal + 255 filter taps - 1), as in
+# 13_filteredWideband.py, so several of them have large prime factors.
+# ____________________________________________________________________________
+
+import numpy as np
+import sys
+import tracemalloc
+import benchmarkTools
+import common
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+def peakMemory(function):
+    ''' Returns the peak memory in bytes allocated while calling function.'''
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+samplingFrequency = 1000
+paddingLength = 255
+rng = np.random.default_rng(0)
+
+print('%9s %8s %13s %13s %13s %13s' % ('N', 'fast N', 'list', 'zeroPad',
+                                       'n=', 'fast n='))
+print('%9s %8s %13s %13s %13s %13s' % ('', '', 'ms / MiB', 'ms / MiB',
+                                       'ms / MiB', 'ms / MiB'))
+for signalLength in [2000, 50000, 1000000, 1000081, 4000000]:
+    signal = rng.uniform(-1, 1, signalLength)
+    paddedLength = signalLength + paddingLength
+    buffer = np.empty(paddedLength)
+
+    def listPadding():
+        padded = signal.tolist()
+        padded.extend([0.0] * paddingLength)
+        return common.getSpectrum(padded, samplingFrequency)
+
+    def arrayPadding():
+        padded = common.zeroPad(signal, paddedLength, out=buffer)
+        return common.getSpectrum(padded, samplingFrequency)
+
+    def fftPadding():
+        return common.getSpectrum(signal, samplingFrequency,
+                                  numberOfPoints=paddedLength)
+
+    def fastPadding():
+        return common.getSpectrum(signal, samplingFrequency,
+                                  numberOfPoints=paddedLength,
+                                  fastLength=True)
+
+    expected = listPadding()[1]
+    assert np.allclose(arrayPadding()[1], expected)
+    assert np.allclose(fftPadding()[1], expected)
+    fastAxis, fastSpectrum = fastPadding()
+    assert len(fastAxis) == len(fastSpectrum)
+
+    repeats = 5 if signalLength <= 50000 else 2
+    cells = []
+    for function in [listPadding, arrayPadding, fftPadding, fastPadding]:
+        seconds = benchmarkTools.timeFunction(function, repeats=repeats)
+        cells.append('%6.1f /%5.1f' % (seconds * 1e3,
+                                       peakMemory(function) / 2 ** 20))
+    print('%9d %8d %s' % (paddedLength, common.getFastLength(paddedLength),
+                          ' '.join(cells)))
@@ -0,0 +1,69 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Looking at a narrow band in fine detail: a zero padded FFT of the whole
+# band against spectralAnalysis.zoomSpectrum (chirp-Z) over just that band,
+# at the same bin spacing. The relative error of zoomSpectrum and of
+# scipy.signal.czt against the padded FFT is printed as well.
+# ____________________________________________________________________________
+
+import numpy as np
+import scipy.signal
+import sys
+import benchmarkTools
+import common
+import spectralAnalysis
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+samplingFrequency = 80
+startFrequency = 15
+stopFrequency = 25
+rng = np.random.default_rng(0)
+
+print('%8s %10s %8s %12s %10s %8s %10s %10s' % (
+        'N', 'padded N', 'bins', 'padded (ms)', 'zoom (ms)', 'speedup',
+        'zoom err', 'czt err'))
+for numberOfSamples in [256, 4096, 65536]:
+    signal = rng.uniform(-1, 1, numberOfSamples)
+    for padding in [4, 64, 1024]:
+        paddedLength = numberOfSamples * padding
+        if paddedLength > 2 ** 24:
+            continue
+        # Bins of the padded FFT inside the band
+        first = int(np.ceil(startFrequency * paddedLength /
+                            samplingFrequency))
+        last = int(stopFrequency * paddedLength / samplingFrequency)
+        numberOfBins = last - first + 1
+        bandStart = first * samplingFrequency / paddedLength
+        bandStop = last * samplingFrequency / paddedLength
+
+        def padded():
+            return common.getSpectrum(signal, samplingFrequency,
+                                      paddedLength)[1][first:last + 1]
+
+        def zoomed():
+            return spectralAnalysis.zoomSpectrum(
+                    signal, samplingFrequency, bandStart, bandStop,
+                    numberOfBins)[1]
+
+        expected = padded()
+        scale = np.max(np.abs(expected))
+        zoomError = np.max(np.abs(zoomed() - expected)) / scale
+        assert zoomError < 1e-9
+        step = np.exp(-2j * np.pi * (bandStop - bandStart) /
+                      (numberOfBins - 1) / samplingFrequency)
+        scipyZoom = scipy.signal.czt(signal, numberOfBins, step,
+                                     np.exp(2j * np.pi * bandStart /
+                                            samplingFrequency))
+        scipyError = np.max(np.abs(scipyZoom - expected)) / scale
+
+        repeats = 5 if paddedLength <= 2 ** 20 else 2
+        paddedTime = benchmarkTools.timeFunction(padded, repeats=repeats)
+        zoomedTime = benchmarkTools.timeFunction(zoomed, repeats=repeats)
+        print('%8d %10d %8d %12.3f %10.3f %7.1fx %10.1e %10.1e' % (
+                numberOfSamples, paddedLength, numberOfBins,
+                paddedTime * 1e3, zoomedTime * 1e3, paddedTime / zoomedTime,
+                zoomError, scipyError))
@@ -0,0 +1,503 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Shared helpers for the numbered demo scripts. Signal generation, plotting
+# labels and small utility functions live here so that every script uses the
+# same implementation.
+# ____________________________________________________________________________
+
+import concurrent.futures
+import fftBackends
+import json
+import numpy as np
+import os
+import scipy.fft
+import sys
+import time
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+# Tones are synthesized in blocks of this many rows when only their sum is
+# needed, so the temporary (tones x samples) matrix stays bounded.
+SINUSOID_BLOCK_TONES = 64
+
+# The wideband noise stream is built from independent generators, one per
+# block of this many samples, so any part of it can be made on its own.
+NOISE_BLOCK_SAMPLES = 2 ** 16
+
+# Output modes of convolve, the same as np.convolve
+CONVOLUTION_MODES = ('full', 'same', 'valid')
+
+# Where the measured direct/FFT convolution crossover is kept between runs,
+# much like FFTW wisdom. Bump the version when the measurement changes.
+CONVOLUTION_WISDOM_PATH = os.path.join(os.path.expanduser('~'),
+                                       '.pysignalprocessing',
+                                       'convolutionWisdom.json')
+CONVOLUTION_WISDOM_VERSION = 1
+_convolutionWisdom = None
+
+
+def getSampleCount(samplingFrequency, seconds=None, numberOfSamples=None):
+    ''' Resolves the signal length from either a duration in seconds or an
+    explicit number of samples. Exactly one of them must be given.'''
+    if (numberOfSamples is not None) and (seconds is None):
+        return int(numberOfSamples)
+    elif (seconds is not None) and (numberOfSamples is None):
+        return int(np.ceil(samplingFrequency * seconds))
+    elif (seconds is not None) and (numberOfSamples is not None):
+        raise ValueError('Either seconds or number of samples can be passed, '
+                         'but not both.')
+    else:
+        raise ValueError('Either seconds or number of samples needs to be '
+                         'passed.')
+
+
+def getDiscreteSinusoid(sinusoidFrequency, samplingFrequency, sinusoid=np.sin,
+                        seconds=None, numberOfSamples=None, initialPhase=0,
+                        amplitude=1, summed=False, out=None,
+                        dtype=np.float64):
+    ''' Samples one or many sinusoids with the given parameters. All the
+    frequency values are in Hz, phase is in radians.
+
+    sinusoidFrequency, initialPhase and amplitude may be scalars or arrays;
+    they are broadcast against each other to give one row per tone. With only
+    scalars a 1-D signal is returned, otherwise a (tones x samples) array, or
+    the 1-D sum of all tones when summed is True. The result is written into
+    out when it is given, and has the requested dtype (float32 or float64).'''
+    length = getSampleCount(samplingFrequency, seconds, numberOfSamples)
+    dtype = np.dtype(dtype)
+
+    isScalar = (np.ndim(sinusoidFrequency) == 0 and
+                np.ndim(initialPhase) == 0 and np.ndim(amplitude) == 0)
+    frequencies, phases, amplitudes = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(sinusoidFrequency, dtype=np.float64)),
+            np.atleast_1d(np.asarray(initialPhase, dtype=np.float64)),
+            np.atleast_1d(np.asarray(amplitude, dtype=np.float64)))
+    frequencies = frequencies.ravel()
+    phases = phases.ravel()
+    amplitudes = amplitudes.ravel()
+    numberOfTones = len(frequencies)
+
+    if isScalar or summed:
+        outputShape = (length,)
+    else:
+        outputShape = (numberOfTones, length)
+    if out is None:
+        out = np.empty(outputShape, dtype=dtype)
+    elif out.shape != outputShape:
+        raise ValueError('out has shape %s, expected %s.'
+                         % (out.shape, outputShape))
+
+    # The phase is always built in double precision; only the stored result
+    # is rounded to the output dtype.
+    n = np.arange(length, dtype=np.float64)
+    radiansPerSample = 2 * np.pi * frequencies / samplingFrequency
+
+    if not summed:
+        rows = out[np.newaxis, :] if isScalar else out
+        phase = np.multiply.outer(radiansPerSample, n)
+        phase += phases[:, np.newaxis]
+        _applySinusoid(sinusoid, phase, rows)
+        rows *= amplitudes[:, np.newaxis].astype(dtype)
+        return out
+
+    # Summed output: synthesize a block of tones at a time and reduce it
+    out[...] = 0
+    blockSize = min(SINUSOID_BLOCK_TONES, numberOfTones)
+    phase = np.empty((blockSize, length), dtype=np.float64)
+    for start in range(0, numberOfTones, blockSize):
+        stop = min(start + blockSize, numberOfTones)
+        block = phase[:stop - start]
+        np.multiply.outer(radiansPerSample[start:stop], n, out=block)
+        block += phases[start:stop, np.newaxis]
+        _applySinusoid(sinusoid, block, block)
+        out += np.dot(amplitudes[start:stop], block).astype(dtype, copy=False)
+    return out
+
+
+def _applySinusoid(sinusoid, phase, out):
+    ''' Evaluates sinusoid(phase) into out, in place for numpy ufuncs.'''
+    if isinstance(sinusoid, np.ufunc):
+        sinusoid(phase, out=out, casting='same_kind')
+    else:
+        out[...] = sinusoid(phase)
+
+
+def getWidebandNoiseSegment(start, stop, amplitude=1, seed=0, out=None):
+    ''' Returns samples [start, stop) of the reproducible noise stream
+    selected by seed, uniformly distributed in [-amplitude, amplitude).
+
+    The stream is cut into NOISE_BLOCK_SAMPLES long blocks and every block
+    has its own generator spawned from seed, so any segment can be produced
+    on its own and always gets the same values. out, when given, has to be
+    a contiguous float64 array of stop - start samples.'''
+    if out is None:
+        out = np.empty(stop - start, dtype=np.float64)
+    elif len(out) != stop - start:
+        raise ValueError('out must hold exactly stop - start samples.')
+
+    position = start
+    while position < stop:
+        block = position // NOISE_BLOCK_SAMPLES
+        offset = position - block * NOISE_BLOCK_SAMPLES
+        length = min(NOISE_BLOCK_SAMPLES - offset, stop - position)
+        bitGenerator = np.random.PCG64(
+                np.random.SeedSequence(seed, spawn_key=(block,)))
+        # Every float64 draws exactly one 64 bit word, so starting in the
+        # middle of a block is a cheap jump of the generator.
+        bitGenerator.advance(offset)
+        np.random.Generator(bitGenerator).random(
+                out=out[position - start:position - start + length])
+        position += length
+
+    out *= 2 * amplitude
+    out -= amplitude
+    return out
+
+
+def generateWidebandNoiseChunks(samplingFrequency, seconds=None, amplitude=1,
+                                seed=0, chunkSize=NOISE_BLOCK_SAMPLES,
+                                startSample=0):
+    ''' Yields the noise stream of generateWidebandNoise in chunkSize long
+    pieces, starting at startSample. Runs forever if seconds is None.'''
+    if chunkSize <= 0:
+        raise ValueError('chunkSize must be positive.')
+    stop = None
+    if seconds is not None:
+        stop = startSample + getSampleCount(samplingFrequency, seconds)
+    return _generateNoiseChunks(startSample, stop, amplitude, seed,
+                                int(chunkSize))
+
+
+def _generateNoiseChunks(startSample, stop, amplitude, seed, chunkSize):
+    ''' The generator behind generateWidebandNoiseChunks, so that its
+    arguments are checked when it is called rather than on the first
+    chunk.'''
+    position = startSample
+    while stop is None or position < stop:
+        end = position + chunkSize
+        if stop is not None:
+            end = min(end, stop)
+        yield getWidebandNoiseSegment(position, end, amplitude, seed)
+        position = end
+
+
+def generateWidebandNoise(samplingFrequency, seconds, amplitude=1, seed=None,
+                          workers=1):
+    ''' Generates seconds of uniform wideband noise in [-amplitude,
+    amplitude).
+
+    The same seed always gives the same signal, whatever the number of
+    workers; with seed None a fresh one is drawn. With more than one worker
+    the record is split into contiguous segments that are generated by a
+    pool of processes.'''
+    if seed is None:
+        seed = np.random.SeedSequence().entropy
+    numberOfSamples = getSampleCount(samplingFrequency, seconds)
+    if workers <= 1:
+        return getWidebandNoiseSegment(0, numberOfSamples, amplitude, seed)
+
+    boundaries = np.linspace(0, numberOfSamples, workers + 1)
+    boundaries = boundaries.astype(int).tolist()
+    out = np.empty(numberOfSamples, dtype=np.float64)
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        segments = pool.map(getWidebandNoiseSegment, boundaries[:-1],
+                            boundaries[1:], [amplitude] * workers,
+                            [seed] * workers)
+        for start, segment in zip(boundaries[:-1], segments):
+            out[start:start + len(segment)] = segment
+    return out
+
+
+def convolve(hk, xk, mode='full', method='auto'):
+    ''' Convolves two sequences, same results as np.convolve(xk, hk, mode).
+
+    Either input may also be a 2-D (channels x samples) array; every row is
+    then convolved along the last axis, with a 1-D input shared by all rows
+    (one filter for many channels, or many filters for one signal). All rows
+    are handled by the same vectorized calls, not a loop over channels.
+
+    method 'direct' accumulates one shifted, scaled copy of the longer input
+    per sample of the shorter one; 'fft' multiplies zero padded real FFTs.
+    'auto' picks whichever is faster for these lengths on this host, using
+    the crossover stored by measureConvolutionCrossover.'''
+    hk = np.asarray(hk)
+    xk = np.asarray(xk)
+    if hk.ndim not in (1, 2) or xk.ndim not in (1, 2):
+        raise ValueError('convolve only takes 1-D or 2-D arrays.')
+    if hk.shape[-1] == 0 or xk.shape[-1] == 0:
+        raise ValueError('Inputs to convolve can not be empty.')
+    if hk.ndim == 2 and xk.ndim == 2 and len(hk) != len(xk) and \
+            1 not in (len(hk), len(xk)):
+        raise ValueError('Both inputs need the same number of channels.')
+    if mode not in CONVOLUTION_MODES:
+        raise ValueError('mode must be one of %s.' % (CONVOLUTION_MODES,))
+    isBatch = hk.ndim == 2 or xk.ndim == 2
+
+    # Loop over (or pad for) the shorter sequence
+    if hk.shape[-1] > xk.shape[-1]:
+        hk, xk = xk, hk
+    shortLength = hk.shape[-1]
+    longLength = xk.shape[-1]
+    if method == 'auto':
+        method = 'fft' if useFFTConvolution(shortLength, longLength) \
+            else 'direct'
+    hk = np.atleast_2d(hk)
+    xk = np.atleast_2d(xk)
+    if method == 'direct':
+        full = _directConvolve(hk, xk)
+    elif method == 'fft':
+        full = _fftConvolve(hk, xk)
+    else:
+        raise ValueError("method must be 'auto', 'direct' or 'fft'.")
+    if not isBatch:
+        full = full[0]
+    return _convolutionSlice(full, shortLength, longLength, mode)
+
+
+def _convolutionSlice(full, shortLength, longLength, mode):
+    ''' Cuts the part np.convolve returns for mode out of a full result.'''
+    if mode == 'same':
+        start = (shortLength - 1) // 2
+        return full[..., start:start + longLength]
+    elif mode == 'valid':
+        return full[..., shortLength - 1:longLength]
+    return full
+
+
+def _directConvolve(hk, xk):
+    ''' Full convolution of the rows of two 2-D arrays, hk the shorter.'''
+    dtype = np.result_type(hk, xk)
+    channels = max(len(hk), len(xk))
+    longLength = xk.shape[-1]
+    out = np.zeros((channels, hk.shape[-1] + longLength - 1), dtype=dtype)
+    scaled = np.empty((channels, longLength), dtype=dtype)
+    for k in range(hk.shape[-1]):
+        np.multiply(xk, hk[:, k:k + 1], out=scaled)
+        out[:, k:k + longLength] += scaled
+    return out
+
+
+def _fftConvolve(hk, xk):
+    ''' Full convolution of the rows of two 2-D arrays through FFTs.'''
+    dtype = np.result_type(hk, xk)
+    length = hk.shape[-1] + xk.shape[-1] - 1
+    size = scipy.fft.next_fast_len(length)
+    if np.iscomplexobj(hk) or np.iscomplexobj(xk):
+        out = fftBackends.ifft(fftBackends.fft(hk, size) *
+                               fftBackends.fft(xk, size))[:, :length]
+    else:
+        out = fftBackends.irfft(fftBackends.rfft(hk, size) *
+                                fftBackends.rfft(xk, size), size)[:, :length]
+    if np.issubdtype(dtype, np.integer):
+        return np.round(out).astype(dtype)
+    return out.astype(dtype, copy=False)
+
+
+def useFFTConvolution(shortLength, longLength):
+    ''' True if FFT convolution is expected to beat the direct form for
+    sequences of these lengths. Measures the crossover on first use when no
+    stored measurement is found.'''
+    global _convolutionWisdom
+    if _convolutionWisdom is None:
+        _convolutionWisdom = loadConvolutionWisdom()
+        if _convolutionWisdom is None:
+            _convolutionWisdom = measureConvolutionCrossover()
+    crossover = np.interp(np.log2(longLength),
+                          np.log2(_convolutionWisdom['signalLengths']),
+                          _convolutionWisdom['crossoverLengths'])
+    return shortLength >= crossover
+
+
+def loadConvolutionWisdom(path=None):
+    ''' Reads a stored convolution crossover measurement, None if there is
+    none (or it can't be read).'''
+    path = path or CONVOLUTION_WISDOM_PATH
+    try:
+        with open(path) as wisdomFile:
+            wisdom = json.load(wisdomFile)
+        if wisdom.get('version') == CONVOLUTION_WISDOM_VERSION:
+            return wisdom
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def measureConvolutionCrossover(signalLengths=(256, 4096, 65536),
+                                path=None, save=True):
+    ''' Times direct against FFT convolution on this host. For every signal
+    length the shortest filter length at which the FFT wins is recorded.
+    The result is used by convolve from then on and, when save is True,
+    stored at path so later runs can skip the measurement.'''
+    global _convolutionWisdom
+    crossoverLengths = []
+    for signalLength in signalLengths:
+        xk = np.random.rand(1, signalLength)
+        crossover = signalLength
+        filterLength = 1
+        while filterLength < signalLength:
+            hk = np.random.rand(1, filterLength)
+            direct = _bestTime(lambda: _directConvolve(hk, xk))
+            fft = _bestTime(lambda: _fftConvolve(hk, xk))
+            if fft < direct:
+                crossover = filterLength
+                break
+            filterLength *= 2
+        crossoverLengths.append(crossover)
+
+    _convolutionWisdom = {'version': CONVOLUTION_WISDOM_VERSION,
+                          'signalLengths': list(signalLengths),
+                          'crossoverLengths': crossoverLengths}
+    if save:
+        _saveJSON(_convolutionWisdom, path or CONVOLUTION_WISDOM_PATH)
+    return _convolutionWisdom
+
+
+def _bestTime(function, repeats=3):
+    ''' Best wall clock time of a few calls, after one warm-up call.'''
+    function()
+    best = float('inf')
+    for i in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _saveJSON(data, path):
+    ''' Writes data to path through a temporary file, so readers never see
+    a half written file. Failing to save is not an error.'''
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporaryPath = '%s.%d.tmp' % (path, os.getpid())
+        with open(temporaryPath, 'w') as jsonFile:
+            json.dump(data, jsonFile, indent=2)
+        os.replace(temporaryPath, path)
+    except OSError:
+        pass
+
+
+def getSpectrum(signal, samplingFrequency, numberOfPoints=None,
+                scaling=None, oneSided=None, axis=-1, fastLength=False):
+    ''' Returns (frequencyAxis, spectrum) of a signal, numberOfPoints long
+    DFT (zero padded or cut like scipy's n=, the signal length by default).
+    The padding happens inside the FFT, no padded copy is made. fastLength
+    rounds numberOfPoints up to the next 5-smooth length (getFastLength),
+    and the frequency axis follows the length actually used.
+
+    Real signals go through a real FFT and only the numberOfPoints // 2 + 1
+    non-redundant bins from 0 Hz up to fs / 2 are returned. Complex signals
+    have no redundant half, so they get the whole DFT unless oneSided is
+    True, which keeps the same positive-frequency bins.
+
+    scaling None returns the raw DFT values X(k), whose magnitude is
+    (Amplitude * N) / 2 for a tone. 'amplitude' returns |X(k)| scaled so a
+    tone of amplitude A reads A (DC and fs / 2 are not doubled).'''
+    signal = np.asarray(signal)
+    if numberOfPoints is None:
+        numberOfPoints = signal.shape[axis]
+    if fastLength:
+        numberOfPoints = getFastLength(numberOfPoints)
+    isComplex = np.iscomplexobj(signal)
+    if oneSided is None:
+        oneSided = not isComplex
+
+    if oneSided and not isComplex:
+        spectrum = fftBackends.rfft(signal, numberOfPoints, axis=axis)
+    else:
+        spectrum = fftBackends.fft(signal, numberOfPoints, axis=axis)
+        if oneSided:
+            spectrum = np.take(spectrum, np.arange(numberOfPoints // 2 + 1),
+                               axis=axis)
+    frequencyAxis = getFrequencyAxis(samplingFrequency, numberOfPoints,
+                                     oneSided)
+
+    if scaling == 'amplitude':
+        spectrum = np.abs(spectrum)
+        spectrum /= numberOfPoints
+        if oneSided:
+            # Every bin but DC (and fs / 2 for even lengths) also stands for
+            # its mirrored negative frequency.
+            doubled = [slice(None)] * spectrum.ndim
+            doubled[axis] = slice(1, (numberOfPoints + 1) // 2)
+            spectrum[tuple(doubled)] *= 2
+    elif scaling is not None:
+        raise ValueError("scaling must be None or 'amplitude'.")
+    return frequencyAxis, spectrum
+
+
+def getFastLength(length):
+    ''' Returns the smallest length >= length whose only prime factors are
+    2, 3 and 5. Every FFT backend is fast at such lengths, while a length
+    with a large prime factor can be many times slower.'''
+    return scipy.fft.next_fast_len(int(length), real=True)
+
+
+def zeroPad(signal, length, out=None, axis=-1):
+    ''' Returns signal followed by zeros up to length samples along axis,
+    written into out when it is given. Unlike joining Python lists, the
+    samples are copied once and never converted to Python floats.'''
+    signal = np.asarray(signal)
+    signalLength = signal.shape[axis]
+    if length < signalLength:
+        raise ValueError('length can not be shorter than the signal.')
+    shape = list(signal.shape)
+    shape[axis] = length
+    if out is None:
+        out = np.empty(shape, dtype=signal.dtype)
+    elif out.shape != tuple(shape):
+        raise ValueError('out must have the shape %s.' % (tuple(shape),))
+    padded = np.moveaxis(out, axis, -1)
+    padded[..., :signalLength] = np.moveaxis(signal, axis, -1)
+    padded[..., signalLength:] = 0
+    return out
+
+
+def getFrequencyAxis(samplingFrequency, numberOfPoints, oneSided=True):
+    ''' Frequencies in Hz of the bins of a numberOfPoints long DFT: 0 up to
+    fs / 2 when oneSided, otherwise 0 up to (but not including) fs.'''
+    if oneSided:
+        return np.arange(numberOfPoints // 2 + 1) * (samplingFrequency /
+                                                      numberOfPoints)
+    return np.arange(numberOfPoints) * (samplingFrequency / numberOfPoints)
+
+
+def toFrequency(binIndex, samplingFrequency, N):
+    '''Returns the frequency of the bin index in a given DFT'''
+    return (binIndex*samplingFrequency/N)
+
+
+def normalizeFromZeroToOne(data):
+    ''' Simply normalizes any value from zero to one. '''
+    minData = np.min(data)
+    maxMinDifference = np.max(data) - minData
+    data = (data - minData) / maxMinDifference
+    return data
+
+
+def labelSignalPlot(plot, title=''):
+    plot.set_xlabel('n')
+    plot.set_ylabel('x(n)')
+    plot.set_title(title)
+
+
+def labelFFTPlot(plot, title=''):
+    plot.set_xlabel('Frequency (Hz)')
+    plot.set_ylabel('X(n)')
+    plot.set_title(title)
+
+
+def labelLogFFTPlot(plot, title=''):
+    plot.set_xlabel('Frequency (Hz)')
+    plot.set_ylabel('Log10( X(n) )')
+    plot.set_title(title)
+
+
+def labelPhasePlot(plot, title=''):
+    plot.set_xlabel('Frequency (Hz)')
+    plot.set_ylabel('Angle')
+    plot.set_title(title)
@@ -0,0 +1,232 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# A persistent cache of filter designs. Remez exchange is slow at the tap
+# counts and narrow transition bands the demos use (and does not always
+# converge), yet every launch designs the very same filters again. Here a
+# design is looked up by a hash of its algorithm and every parameter that
+# shapes it, first in a small in-process LRU, then on disk, and only
+# computed when neither has it.
+#
+# Designs are kept as .npy files named by that hash, so any process with
+# the same parameters finds them. Files are written to a temporary name
+# and renamed into place, so parallel processes can share the directory
+# and never read a half written design. Once the directory grows past its
+# size bound, the designs used least recently are deleted.
+# ____________________________________________________________________________
+
+import collections
+import hashlib
+import json
+import numpy as np
+import os
+import scipy.signal
+import sys
+import windows
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+# Where designs are kept between runs. Bump the version when a design
+# algorithm changes, so older designs are no longer found.
+DESIGN_CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'),
+                                      '.pysignalprocessing', 'designCache')
+DESIGN_CACHE_VERSION = 1
+
+# Number of designs kept in memory before the least recently used one is
+# dropped
+DESIGN_CACHE_MEMORY_SIZE = 128
+
+# Bytes of designs kept on disk before the least recently used ones are
+# deleted
+DESIGN_CACHE_DISK_SIZE = 64 * 2 ** 20
+
+_directory = DESIGN_CACHE_DIRECTORY
+_memoryCache = collections.OrderedDict()
+_statistics = {'memoryHits': 0, 'diskHits': 0, 'misses': 0,
+               'evictions': 0}
+
+
+def setCacheDirectory(directory):
+    ''' Keeps the designs in directory from now on; None keeps them in
+    memory only.'''
+    global _directory
+    _directory = directory
+
+
+def getCacheInfo():
+    ''' Returns the memory and disk hits, the misses (designs computed),
+    the designs evicted from disk, the hit rate and the memory cache size.
+    '''
+    info = dict(_statistics)
+    lookups = info['memoryHits'] + info['diskHits'] + info['misses']
+    info['hitRate'] = (lookups - info['misses']) / lookups if lookups else 0.0
+    info['size'] = len(_memoryCache)
+    info['maxSize'] = DESIGN_CACHE_MEMORY_SIZE
+    return info
+
+
+def clearCache(disk=False):
+    ''' Drops every design kept in memory and resets the statistics; with
+    disk=True the designs on disk are deleted as well.'''
+    _memoryCache.clear()
+    for key in _statistics:
+        _statistics[key] = 0
+    if disk and _directory is not None:
+        for path, size, accessTime in _listDesigns():
+            _removeFile(path)
+
+
+def getDesignKey(algorithm, **parameters):
+    ''' Returns the hash a design made by algorithm with these parameters
+    is stored under. Numbers count by their float64 value and sequences
+    (lists, tuples, arrays) by their items, so equal parameters always give
+    the same key: bands=[0, 100] and np.array([0.0, 100.0]) are one
+    design.'''
+    description = json.dumps({'version': DESIGN_CACHE_VERSION,
+                              'algorithm': algorithm,
+                              'parameters': _normalize(parameters)},
+                             sort_keys=True)
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+def getDesign(algorithm, design, **parameters):
+    ''' Returns design(**parameters), a read-only array, from the cache when
+    a design by the same algorithm with the same parameters was made
+    before. algorithm names the design function; parameters must describe
+    everything that shapes its result.'''
+    key = getDesignKey(algorithm, **parameters)
+    taps = _memoryCache.get(key)
+    if taps is not None:
+        _statistics['memoryHits'] += 1
+        _memoryCache.move_to_end(key)
+        return taps
+
+    taps = _loadDesign(key)
+    if taps is not None:
+        _statistics['diskHits'] += 1
+    else:
+        _statistics['misses'] += 1
+        taps = np.array(design(**parameters))
+        _saveDesign(key, taps)
+    taps.setflags(write=False)
+    _memoryCache[key] = taps
+    while len(_memoryCache) > DESIGN_CACHE_MEMORY_SIZE:
+        _memoryCache.popitem(last=False)
+    return taps
+
+
+def remez(numberOfTaps, bands, desired, samplingFrequency, weight=None,
+          filterType='bandpass', maxiter=25, gridDensity=16,
+          window='boxcar'):
+    ''' scipy.signal.remez with the band edges in Hz, multiplied by window
+    (a name or (name, parameter) tuple for windows.getWindow, or an array),
+    through the design cache. Returns read-only taps.'''
+    return getDesign('remez', _designRemez, numberOfTaps=int(numberOfTaps),
+                     bands=bands, desired=desired,
+                     samplingFrequency=samplingFrequency, weight=weight,
+                     filterType=filterType, maxiter=maxiter,
+                     gridDensity=gridDensity, window=window)
+
+
+def _designRemez(numberOfTaps, bands, desired, samplingFrequency, weight,
+                 filterType, maxiter, gridDensity, window):
+    taps = scipy.signal.remez(numberOfTaps, bands, desired, weight=weight,
+                              type=filterType, maxiter=maxiter,
+                              grid_density=gridDensity, fs=samplingFrequency)
+    if isinstance(window, (str, tuple)):
+        name, parameter = (window, None) if isinstance(window, str) else \
+            (window[0], window[1] if len(window) > 1 else None)
+        window = windows.getWindow(name, numberOfTaps, parameter=parameter)
+    return windows.apply(taps, window, out=taps)
+
+
+def _normalize(value):
+    ''' value with every number as a float and every sequence as a list,
+    ready for json.'''
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if value is None or isinstance(value, (str, bool)):
+        return value
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if isinstance(value, np.ndarray) and value.dtype.kind in 'biuf':
+        return _normalize(value.tolist())
+    raise TypeError('%r can not be part of a design key.' % (value,))
+
+
+def _getPath(key):
+    return os.path.join(_directory, key + '.npy')
+
+
+def _loadDesign(key):
+    ''' Reads a stored design, None if there is none (or it can't be
+    read). Reading marks it as recently used.'''
+    if _directory is None:
+        return None
+    path = _getPath(key)
+    try:
+        taps = np.load(path, allow_pickle=False)
+        os.utime(path)
+        return taps
+    except (OSError, ValueError):
+        return None
+
+
+def _saveDesign(key, taps):
+    ''' Writes the design through a temporary file, then deletes the least
+    recently used designs while the directory is over its size bound.
+    Failing to save is not an error.'''
+    if _directory is None:
+        return
+    path = _getPath(key)
+    try:
+        os.makedirs(_directory, exist_ok=True)
+        temporaryPath = '%s.%d.tmp' % (path, os.getpid())
+        with open(temporaryPath, 'wb') as designFile:
+            np.save(designFile, taps, allow_pickle=False)
+        os.replace(temporaryPath, path)
+    except OSError:
+        return
+
+    designs = sorted(_listDesigns(), key=lambda design: design[2])
+    totalSize = sum(size for path, size, accessTime in designs)
+    for path, size, accessTime in designs:
+        if totalSize <= DESIGN_CACHE_DISK_SIZE:
+            break
+        if _removeFile(path):
+            _statistics['evictions'] += 1
+        totalSize -= size
+
+
+def _listDesigns():
+    ''' Returns (path, size, last use) of every design on disk.'''
+    designs = []
+    try:
+        names = os.listdir(_directory)
+    except OSError:
+        return designs
+    for name in names:
+        if not name.endswith('.npy'):
+            continue
+        path = os.path.join(_directory, name)
+        try:
+            status = os.stat(path)
+        except OSError:
+            # Another process deleted it meanwhile
+            continue
+        designs.append((path, status.st_size, status.st_mtime))
+    return designs
+
+
+def _removeFile(path):
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
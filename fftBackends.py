@@ -0,0 +1,160 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# One place that decides which library computes the FFTs. common, firFilters
+# and the demos call fft / ifft / rfft / irfft from here, and setBackend
+# switches all of them at once between scipy.fft (multi-threaded through
+# workers=), numpy.fft and pyFFTW when it is installed.
+#
+# Every transform goes through a plan built for its kind, size, input shape
+# and dtype. Plans live in a small LRU cache so that repeated transforms of
+# the same size (block filters, spectrogram frames, ...) reuse them. This
+# matters most for pyFFTW, where planning costs far more than a transform.
+# ____________________________________________________________________________
+
+import collections
+import numpy as np
+import os
+import scipy.fft
+import sys
+
+try:
+    import pyfftw
+    import pyfftw.builders
+except ImportError:
+    pyfftw = None
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+# Libraries that can compute the transforms
+FFT_BACKENDS = ('scipy', 'numpy', 'pyfftw')
+
+# Number of plans kept before the least recently used one is dropped
+FFT_PLAN_CACHE_SIZE = 64
+
+# Planner effort pyFFTW uses for new plans. FFTW_MEASURE finds faster plans
+# than FFTW_ESTIMATE but takes longer to plan, which the cache amortizes.
+PYFFTW_PLANNER_EFFORT = 'FFTW_MEASURE'
+
+_backend = 'scipy'
+_workers = 1
+_planCache = collections.OrderedDict()
+_planCacheStatistics = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def getAvailableBackends():
+    ''' Returns the backends that can be used on this host.'''
+    return tuple(name for name in FFT_BACKENDS
+                 if name != 'pyfftw' or pyfftw is not None)
+
+
+def setBackend(name=None, workers=None):
+    ''' Selects the library (one of FFT_BACKENDS) and the number of threads
+    every following transform uses. None keeps the current value, and
+    workers=-1 uses every CPU like scipy.fft does. numpy.fft always runs on
+    one thread.'''
+    global _backend, _workers
+    if name is not None:
+        if name not in FFT_BACKENDS:
+            raise ValueError('name must be one of %s.' % (FFT_BACKENDS,))
+        if name == 'pyfftw' and pyfftw is None:
+            raise ValueError('The pyfftw backend needs pyFFTW installed.')
+        _backend = name
+    if workers is not None:
+        if workers == -1:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError('workers must be positive or -1.')
+        _workers = int(workers)
+
+
+def getBackend():
+    ''' Returns the (name, workers) pair the transforms currently use.'''
+    return _backend, _workers
+
+
+def getPlanCacheInfo():
+    ''' Returns the plan cache hits, misses and evictions, and its size.'''
+    info = dict(_planCacheStatistics)
+    info['size'] = len(_planCache)
+    info['maxSize'] = FFT_PLAN_CACHE_SIZE
+    return info
+
+
+def clearPlanCache():
+    ''' Drops every cached plan and resets the statistics.'''
+    _planCache.clear()
+    for key in _planCacheStatistics:
+        _planCacheStatistics[key] = 0
+
+
+def fft(x, n=None, axis=-1):
+    ''' Complex DFT along axis, zero padded or cut to n points.'''
+    return _transform('fft', x, n, axis)
+
+
+def ifft(x, n=None, axis=-1):
+    ''' Inverse of fft, normalized by 1 / n.'''
+    return _transform('ifft', x, n, axis)
+
+
+def rfft(x, n=None, axis=-1):
+    ''' DFT of a real signal: only the n // 2 + 1 bins from DC to fs / 2.'''
+    return _transform('rfft', x, n, axis)
+
+
+def irfft(x, n=None, axis=-1):
+    ''' Inverse of rfft, returning n real samples (2 * (bins - 1) by
+    default).'''
+    return _transform('irfft', x, n, axis)
+
+
+def _transform(kind, x, n, axis):
+    x = np.asarray(x)
+    if n is None:
+        n = x.shape[axis]
+        if kind == 'irfft':
+            n = 2 * (n - 1)
+    return _getPlan(kind, x.shape, x.dtype, int(n), axis)(x)
+
+
+def _getPlan(kind, shape, dtype, n, axis):
+    # Plans are only valid for the library and thread count they were made
+    # for, so those are part of the key as well.
+    key = (_backend, _workers, kind, shape, dtype.str, n, axis)
+    plan = _planCache.get(key)
+    if plan is not None:
+        _planCacheStatistics['hits'] += 1
+        _planCache.move_to_end(key)
+        return plan
+    _planCacheStatistics['misses'] += 1
+    plan = _makePlan(kind, shape, dtype, n, axis)
+    _planCache[key] = plan
+    while len(_planCache) > FFT_PLAN_CACHE_SIZE:
+        _planCache.popitem(last=False)
+        _planCacheStatistics['evictions'] += 1
+    return plan
+
+
+def _makePlan(kind, shape, dtype, n, axis):
+    workers = _workers
+    if _backend == 'scipy':
+        # pocketfft keeps its own twiddle factor cache; the plan only binds
+        # the arguments.
+        function = getattr(scipy.fft, kind)
+        return lambda x: function(x, n, axis=axis, workers=workers)
+    if _backend == 'numpy':
+        function = getattr(np.fft, kind)
+        return lambda x: function(x, n, axis=axis)
+
+    # pyFFTW plans for one input shape and dtype, so plan on a scratch array
+    # (FFTW_MEASURE overwrites its input while planning).
+    scratch = pyfftw.empty_aligned(shape, dtype=dtype)
+    fftw = getattr(pyfftw.builders, kind)(
+            scratch, n, axis=axis, threads=workers,
+            planner_effort=PYFFTW_PLANNER_EFFORT)
+    # The plan writes every result into the same output buffer, so hand out
+    # a copy that later transforms cannot overwrite.
+    return lambda x: fftw(x).copy()
@@ -0,0 +1,147 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Filter banks. 8_primitiveFilters.py turns a low pass filter into band pass
+# and high pass ones by multiplying it with a sinusoid at the new center
+# frequency; getModulatedFilters does that for any number of center
+# frequencies at once, as a (filters x taps) array.
+#
+# Splitting a signal into many uniform channels with such a bank costs one
+# convolution per channel. PolyphaseChannelizer gets the same channels from
+# the prototype's polyphase branches and a single FFT across them, so every
+# decimation samples of input cost about len(prototype) multiplies and one
+# numberOfChannels point FFT for all channels together.
+# ____________________________________________________________________________
+
+import fftBackends
+import math
+import numpy as np
+import sys
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+def getModulatedFilters(prototype, centerFrequencies, samplingFrequency,
+                        real=False):
+    ''' Returns the (filters x taps) bank of prototype (a low pass filter)
+    shifted to every center frequency: prototype(n) * exp(2j pi f n / fs),
+    or prototype(n) * cos(2 pi f n / fs) for real=True, which passes both
+    f and -f with half the gain each.'''
+    prototype = np.asarray(prototype)
+    if prototype.ndim != 1 or len(prototype) == 0:
+        raise ValueError('prototype must be a non-empty 1-D array.')
+    centerFrequencies = np.asarray(centerFrequencies, dtype=np.float64)
+    phase = 2 * np.pi * np.outer(centerFrequencies.ravel(),
+                                 np.arange(len(prototype))) / \
+        samplingFrequency
+    if real:
+        return prototype * np.cos(phase)
+    return prototype * np.exp(1j * phase)
+
+
+def getUniformFilterBank(prototype, numberOfChannels, real=False):
+    ''' Returns the (numberOfChannels x taps) bank of prototype shifted to
+    the centers k * fs / numberOfChannels, k = 0 .. numberOfChannels - 1.
+    These are the channels PolyphaseChannelizer computes.'''
+    if numberOfChannels < 1:
+        raise ValueError('numberOfChannels must be positive.')
+    return getModulatedFilters(prototype,
+                               np.arange(numberOfChannels) / numberOfChannels,
+                               1, real)
+
+
+class PolyphaseChannelizer(object):
+    ''' Streaming uniform DFT filter bank: splits a signal into
+    numberOfChannels sub-bands centered at k * fs / numberOfChannels and
+    keeps every decimation-th sample of each.
+
+    Channel k is the input filtered by getUniformFilterBank's filter k,
+    shifted down to baseband and decimated; that is, output m of channel k
+    is (signal * bank[k])(m * decimation) * exp(-2j pi k m * decimation /
+    numberOfChannels). decimation = numberOfChannels (the default) samples
+    the channels critically; a divisor of it oversamples them, so a
+    prototype wider than fs / numberOfChannels does not alias.
+
+    Every output frame is the input window weighted by the prototype and
+    summed into its numberOfChannels polyphase branches, then one FFT
+    gives all channels. process() takes chunks of any length and returns
+    (numberOfChannels x frames) for the frames they complete; the last
+    inputs are carried over to the next call.'''
+
+    def __init__(self, prototype, numberOfChannels, decimation=None):
+        prototype = np.asarray(prototype)
+        if prototype.ndim != 1 or len(prototype) == 0:
+            raise ValueError('prototype must be a non-empty 1-D array.')
+        if numberOfChannels < 1:
+            raise ValueError('numberOfChannels must be positive.')
+        if decimation is None:
+            decimation = numberOfChannels
+        if decimation < 1 or numberOfChannels % decimation != 0:
+            raise ValueError('decimation must divide numberOfChannels.')
+        self.prototype = prototype
+        self.numberOfChannels = int(numberOfChannels)
+        self.decimation = int(decimation)
+
+        # Pad the prototype to whole rows of numberOfChannels taps. Window
+        # sample (row q, column c) of a frame is delayed by
+        # paddedLength - 1 - q * numberOfChannels - c samples, so it meets
+        # that tap, and belongs to branch (-1 - c) mod numberOfChannels.
+        rows = -(-len(prototype) // self.numberOfChannels)
+        self.paddedLength = rows * self.numberOfChannels
+        padded = np.zeros(self.paddedLength, dtype=prototype.dtype)
+        padded[:len(prototype)] = prototype
+        self._branchTaps = padded[::-1].reshape(rows, self.numberOfChannels)
+        # Summing column c with exp(-2j pi k c / M), as the FFT does, puts
+        # branch r = M - 1 - c at exp(2j pi k (r + 1) / M); the factor
+        # takes the extra + 1 back.
+        channels = np.arange(self.numberOfChannels)
+        self._branchShift = np.exp(-2j * np.pi * channels /
+                                   self.numberOfChannels)
+        # Shifting frame m down to baseband: it repeats every `period`
+        # frames
+        period = self.numberOfChannels // math.gcd(self.decimation,
+                                                   self.numberOfChannels)
+        frames = np.arange(period)[:, np.newaxis]
+        self._basebandShift = np.exp(-2j * np.pi * channels * frames *
+                                     self.decimation / self.numberOfChannels)
+        self.reset()
+
+    def reset(self):
+        ''' Forgets all input, as if the signal started again.'''
+        self._history = np.zeros(self.paddedLength - 1)
+        self._inputCount = 0
+        self._frameCount = 0
+
+    def process(self, chunk):
+        ''' Takes the next chunk of input and returns the (numberOfChannels x
+        frames) outputs of every frame it completes (possibly none).'''
+        chunk = np.asarray(chunk)
+        if chunk.ndim != 1:
+            raise ValueError('chunk must be a 1-D array.')
+        data = np.concatenate((self._history, chunk))
+        # Frame m ends at input m * decimation; find those in this chunk
+        firstOffset = self._frameCount * self.decimation - self._inputCount
+        lastInput = self._inputCount + len(chunk) - 1
+        numberOfFrames = max(0, lastInput // self.decimation + 1 -
+                             self._frameCount)
+        self._history = data[len(data) - (self.paddedLength - 1):].copy()
+        self._inputCount += len(chunk)
+        if numberOfFrames == 0:
+            # Too little input for a frame, possibly none at all
+            return np.empty((self.numberOfChannels, 0), dtype=np.complex128)
+        windows = np.lib.stride_tricks.sliding_window_view(
+                data, self.paddedLength)[firstOffset::self.decimation]
+        windows = windows[:numberOfFrames].reshape(
+                numberOfFrames, self._branchTaps.shape[0],
+                self.numberOfChannels)
+
+        # frames x columns branch sums, one FFT for every channel of them
+        branches = np.einsum('fqc,qc->fc', windows, self._branchTaps)
+        channels = fftBackends.fft(branches, axis=-1) * self._branchShift
+        frames = (self._frameCount + np.arange(numberOfFrames)) % \
+            len(self._basebandShift)
+        channels *= self._basebandShift[frames]
+
+        self._frameCount += numberOfFrames
+        return np.ascontiguousarray(channels.T)
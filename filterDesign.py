@@ -0,0 +1,304 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# FIR filter design. 8_primitiveFilters.py and 9_filterWindowing.py write the
+# desired DFT of a filter out bin by bin and transform it back; the designer
+# here does the same from a list of (lowFrequency, highFrequency, gain)
+# bands, for any band layout.
+#
+# The desired response is built as an array on the bins from DC to fs / 2
+# only, since a real filter's DFT is Hermitian symmetric and the real
+# inverse FFT fills in the other half. A circular shift by half the filter
+# length turns the zero phase result into a causal linear phase filter,
+# which is then windowed with a cached window from windows.py.
+#
+# designMinimumOrder turns a ripple and attenuation spec into the shortest
+# filter that meets it, since filtering costs one multiply per tap and
+# sample: a fixed 256 taps is usually far more (or less) than needed.
+# ____________________________________________________________________________
+
+import designCache
+import fftBackends
+import frequencyResponse
+import functools
+import numpy as np
+import sys
+import windows
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+# Number of filter lengths whose bin frequencies and shift factors are kept
+DESIGN_GRID_CACHE_SIZE = 32
+
+# Designers designMinimumOrder can search with
+MINIMUM_ORDER_METHODS = ('remez', 'frequencySampling')
+
+# Formulas estimateNumberOfTaps knows
+ORDER_ESTIMATORS = ('kaiser', 'bellanger')
+
+# The fixed filter length of the demos, which designMinimumOrder reports
+# its savings against, and the longest filter it tries
+BASELINE_NUMBER_OF_TAPS = 256
+MAXIMUM_NUMBER_OF_TAPS = 8191
+
+# measureSpec evaluates the response on at least this many points, and at
+# least this many per tap
+SPEC_GRID_POINTS = 8192
+SPEC_GRID_POINTS_PER_TAP = 16
+
+
+def checkBands(bands, samplingFrequency):
+    ''' Returns bands as a (..., bands x 3) array of (lowFrequency,
+    highFrequency, gain) rows sorted by frequency, raising ValueError when
+    a band ends below its start, lies outside 0 .. fs / 2 or overlaps
+    another band (unless one of them has zero gain). Leading axes hold the
+    band lists of several designs.'''
+    if samplingFrequency <= 0:
+        raise ValueError('samplingFrequency must be positive.')
+    bands = np.array(bands, dtype=np.float64)
+    if bands.ndim < 2 or bands.shape[-2] == 0 or bands.shape[-1] != 3:
+        raise ValueError('bands must be a list of (lowFrequency, '
+                         'highFrequency, gain) triples.')
+    if bands.shape[-2] > 1:
+        order = np.argsort(bands[..., 0], axis=-1, kind='stable')
+        bands = np.take_along_axis(bands, order[..., np.newaxis], axis=-2)
+    lowFrequencies, highFrequencies = bands[..., 0], bands[..., 1]
+    if (lowFrequencies > highFrequencies).any():
+        raise ValueError('A band can not end below its start.')
+    if lowFrequencies.min() < 0 or \
+            highFrequencies.max() > samplingFrequency / 2:
+        raise ValueError('Bands must lie between 0 and '
+                         'samplingFrequency / 2.')
+    # Zero gain bands change nothing, so they may overlap (e.g. as padding).
+    # A band with a gain must start above every such band before it.
+    passing = bands[..., 2] != 0
+    reach = np.maximum.accumulate(
+            np.where(passing, highFrequencies, -np.inf), axis=-1)
+    overlapping = lowFrequencies[..., 1:] <= reach[..., :-1]
+    if (passing[..., 1:] & overlapping).any():
+        raise ValueError('Bands with a gain can not overlap.')
+    return bands
+
+
+def designFrequencySampling(bands, numberOfTaps, samplingFrequency,
+                            window='boxcar'):
+    ''' Returns the numberOfTaps real taps of a linear phase FIR filter
+    sampled from a response that is gain at every bin within one of the
+    (lowFrequency, highFrequency, gain) bands (edges included) and 0
+    elsewhere. Only the unwindowed design (window='boxcar') interpolates
+    those samples, its DFT matching them at every bin; any other window
+    trades that for lower ripple and stopband leakage, so its response
+    misses the samples near the band edges.
+
+    The filter is delayed by (numberOfTaps - 1) / 2 samples, half a sample
+    more than the circular shift of an odd length filter for even lengths,
+    so the taps are always symmetric. An even length filter is zero at
+    fs / 2 and can not have a band there. window is a name (or (name,
+    parameter) tuple) for windows.getWindow, which gives the symmetric
+    window, or an array of numberOfTaps samples.
+
+    Many filters are designed at once, with one batched inverse FFT, by
+    giving a (designs x bands x 3) array of band lists (every list as long,
+    pad with (0, 0, 0) bands); the taps are then (designs x numberOfTaps).
+    '''
+    if numberOfTaps < 1:
+        raise ValueError('numberOfTaps must be positive.')
+    numberOfTaps = int(numberOfTaps)
+    bands = checkBands(bands, samplingFrequency)
+    binFrequencies, shift = _getDesignGrid(numberOfTaps)
+
+    # (..., bins x bands) membership, in units of fs so that bin frequencies
+    # and band edges that are equal in Hz compare equal
+    edges = bands[..., np.newaxis, :, :2] / samplingFrequency
+    tolerance = 1e-9
+    inBand = (binFrequencies[:, np.newaxis] >= edges[..., 0] - tolerance) & \
+        (binFrequencies[:, np.newaxis] <= edges[..., 1] + tolerance)
+    response = np.matmul(inBand, bands[..., 2:])[..., 0]
+    if numberOfTaps % 2 == 0 and response[..., -1].any():
+        raise ValueError('An even numberOfTaps can not pass '
+                         'samplingFrequency / 2.')
+
+    taps = fftBackends.irfft(response * shift, numberOfTaps)
+    if isinstance(window, (str, tuple)):
+        name, parameter = (window, None) if isinstance(window, str) else \
+            (window[0], window[1] if len(window) > 1 else None)
+        window = windows.getWindow(name, numberOfTaps, parameter=parameter)
+    return windows.apply(taps, window, out=taps)
+
+
+def getRippleDeviation(passbandRipple):
+    ''' Converts a peak to peak passband ripple in dB to the largest
+    deviation from the passband gain, as a fraction of it.'''
+    ratio = 10 ** (passbandRipple / 20)
+    return (ratio - 1) / (ratio + 1)
+
+
+def estimateNumberOfTaps(passbandRipple, stopbandAttenuation,
+                         transitionWidth, samplingFrequency,
+                         estimator='kaiser'):
+    ''' Estimates the taps an equiripple filter needs for a passband ripple
+    (peak to peak, dB), a stopband attenuation (dB) and the narrowest
+    transition band (Hz), with Kaiser's or Bellanger's formula. The result
+    is rounded up to an odd number, which suits every band layout.'''
+    if estimator not in ORDER_ESTIMATORS:
+        raise ValueError('estimator must be one of %s.' % (ORDER_ESTIMATORS,))
+    if passbandRipple <= 0 or stopbandAttenuation <= 0:
+        raise ValueError('The ripple and attenuation must be positive.')
+    if not 0 < transitionWidth < samplingFrequency / 2:
+        raise ValueError('transitionWidth must be between 0 and '
+                         'samplingFrequency / 2.')
+    passbandDeviation = getRippleDeviation(passbandRipple)
+    stopbandDeviation = 10 ** (-stopbandAttenuation / 20)
+    width = transitionWidth / samplingFrequency
+    if estimator == 'kaiser':
+        order = (-20 * np.log10(np.sqrt(passbandDeviation *
+                                        stopbandDeviation)) - 13) / \
+            (14.6 * width)
+    else:
+        order = 2 / 3 * np.log10(1 / (10 * passbandDeviation *
+                                      stopbandDeviation)) / width
+    numberOfTaps = max(int(np.ceil(order)) + 1, 3)
+    return numberOfTaps + 1 - numberOfTaps % 2
+
+
+def measureSpec(taps, bands, samplingFrequency):
+    ''' Returns the (passbandRipple, stopbandAttenuation) in dB that the
+    (..., taps) filters achieve on (lowFrequency, highFrequency, gain)
+    bands: the peak to peak ripple of the worst band with a gain, relative
+    to that gain, and the attenuation of the worst zero gain band relative
+    to the largest gain. The response is evaluated on a dense grid.'''
+    taps = np.asarray(taps)
+    bands = checkBands(bands, samplingFrequency)
+    numberOfPoints = max(SPEC_GRID_POINTS,
+                         SPEC_GRID_POINTS_PER_TAP * taps.shape[-1])
+    with np.errstate(divide='ignore'):
+        magnitude = 20 * np.log10(np.abs(fftBackends.rfft(taps,
+                                                          numberOfPoints)))
+    frequencies = np.arange(magnitude.shape[-1]) * samplingFrequency / \
+        numberOfPoints
+    return frequencyResponse.getBandMetrics(magnitude, frequencies,
+                                            bands)[:2]
+
+
+def designMinimumOrder(bands, passbandRipple, stopbandAttenuation,
+                       samplingFrequency, method='remez',
+                       estimator='kaiser'):
+    ''' Returns (taps, report) for the shortest odd length filter that
+    keeps the passband ripple (peak to peak, dB) and the stopband
+    attenuation (dB) on (lowFrequency, highFrequency, gain) bands, zero
+    gain for stop bands. The gaps between bands are the transition bands.
+
+    The search starts at the estimated length, grows it until the spec is
+    met and then bisects down to the shortest length that meets it. method
+    is 'remez' (equiripple, weighted by the allowed deviations, designs
+    kept in designCache) or 'frequencySampling' (designFrequencySampling
+    with band edges in the middle of the transitions and a Kaiser window
+    for the attenuation). report holds the numberOfTaps, estimatedTaps,
+    achieved passbandRipple and stopbandAttenuation, and the
+    multipliesSaved per output sample against BASELINE_NUMBER_OF_TAPS
+    (negative when the spec needs more). ValueError when no filter of up
+    to MAXIMUM_NUMBER_OF_TAPS meets the spec.'''
+    if method not in MINIMUM_ORDER_METHODS:
+        raise ValueError('method must be one of %s.' %
+                         (MINIMUM_ORDER_METHODS,))
+    bands = checkBands(bands, samplingFrequency)
+    if len(bands) < 2:
+        raise ValueError('bands must hold a pass band and a stop band.')
+    transitionWidth = np.min(bands[1:, 0] - bands[:-1, 1])
+    estimatedTaps = estimateNumberOfTaps(passbandRipple, stopbandAttenuation,
+                                         transitionWidth, samplingFrequency,
+                                         estimator)
+
+    def design(numberOfTaps):
+        if method == 'remez':
+            passbandDeviation = getRippleDeviation(passbandRipple)
+            stopbandDeviation = 10 ** (-stopbandAttenuation / 20)
+            weights = np.where(bands[:, 2] != 0, 1 / passbandDeviation,
+                               1 / stopbandDeviation)
+            return designCache.remez(numberOfTaps, bands[:, :2].ravel(),
+                                     bands[:, 2], samplingFrequency,
+                                     weights * stopbandDeviation)
+        return designFrequencySampling(
+                _getIdealBands(bands, samplingFrequency), numberOfTaps,
+                samplingFrequency,
+                ('kaiser', getKaiserBeta(stopbandAttenuation)))
+
+    def meets(numberOfTaps):
+        try:
+            taps = design(numberOfTaps)
+        except ValueError:
+            # Remez exchange did not converge at this length
+            return False
+        ripple, attenuation = measureSpec(taps, bands, samplingFrequency)
+        return ripple <= passbandRipple and \
+            attenuation >= stopbandAttenuation
+
+    # Grow by a quarter until the spec is met, then bisect over odd lengths
+    shortest = min(estimatedTaps, MAXIMUM_NUMBER_OF_TAPS)
+    longestFailing = 1
+    while not meets(shortest):
+        if shortest >= MAXIMUM_NUMBER_OF_TAPS:
+            raise ValueError('No filter of up to %d taps meets the spec.' %
+                             MAXIMUM_NUMBER_OF_TAPS)
+        longestFailing = shortest
+        shortest = min(shortest + 2 * max(shortest // 8, 1),
+                       MAXIMUM_NUMBER_OF_TAPS)
+    if longestFailing == 1:
+        # The estimate met the spec; look below it as well
+        longestFailing = max(1, shortest - 2 * max(shortest // 4, 1))
+        while longestFailing > 1 and meets(longestFailing):
+            shortest = longestFailing
+            longestFailing = max(1, longestFailing -
+                                 2 * max(longestFailing // 4, 1))
+    while shortest - longestFailing > 2:
+        middle = (shortest + longestFailing) // 2
+        middle += 1 - middle % 2
+        if meets(middle):
+            shortest = middle
+        else:
+            longestFailing = middle
+
+    taps = design(shortest)
+    ripple, attenuation = measureSpec(taps, bands, samplingFrequency)
+    report = {'numberOfTaps': shortest, 'estimatedTaps': estimatedTaps,
+              'passbandRipple': float(ripple),
+              'stopbandAttenuation': float(attenuation),
+              'multipliesSaved': 1 - shortest / BASELINE_NUMBER_OF_TAPS}
+    return taps, report
+
+
+def getKaiserBeta(stopbandAttenuation):
+    ''' Kaiser's beta for a window design with the given stopband
+    attenuation in dB.'''
+    if stopbandAttenuation > 50:
+        return 0.1102 * (stopbandAttenuation - 8.7)
+    if stopbandAttenuation > 21:
+        return 0.5842 * (stopbandAttenuation - 21) ** 0.4 + \
+            0.07886 * (stopbandAttenuation - 21)
+    return 0.0
+
+
+def _getIdealBands(bands, samplingFrequency):
+    ''' Returns the bands with a gain, stretched to the middle of the
+    transitions around them, as the ideal response to sample.'''
+    middles = (bands[1:, 0] + bands[:-1, 1]) / 2
+    lowFrequencies = np.concatenate(([0], np.nextafter(middles, np.inf)))
+    highFrequencies = np.concatenate((middles, [samplingFrequency / 2]))
+    passing = bands[:, 2] != 0
+    return np.stack([lowFrequencies[passing], highFrequencies[passing],
+                     bands[passing, 2]], axis=-1)
+
+
+@functools.lru_cache(maxsize=DESIGN_GRID_CACHE_SIZE)
+def _getDesignGrid(numberOfTaps):
+    ''' Returns the frequencies (in units of fs) of the bins from DC to
+    fs / 2 of a numberOfTaps point DFT, and the factors that delay a
+    filter by (numberOfTaps - 1) / 2 samples. Read-only arrays.'''
+    bins = np.arange(numberOfTaps // 2 + 1)
+    binFrequencies = bins / numberOfTaps
+    shift = np.exp(-1j * np.pi * bins * (numberOfTaps - 1) / numberOfTaps)
+    for array in (binFrequencies, shift):
+        array.setflags(write=False)
+    return binFrequencies, shift
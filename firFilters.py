@@ -0,0 +1,479 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Streaming FIR filters. common.convolve needs the whole signal at once; the
+# filters here keep the state between calls so a signal can be filtered one
+# chunk at a time, while still giving exactly the one-shot convolution.
+#
+# Every filter also runs many channels at once: give channels= (or a 2-D
+# (channels x taps) array for per-channel taps) and pass (channels x samples)
+# chunks. All channels are filtered by the same vectorized calls.
+# ____________________________________________________________________________
+
+import fftBackends
+import math
+import numpy as np
+import scipy.fft
+import sys
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+# Block convolution schemes understood by BlockFIRFilter
+BLOCK_METHODS = ('overlap-save', 'overlap-add')
+
+# Kinds of linear phase taps SymmetricFIRFilter folds
+SYMMETRY_TYPES = ('symmetric', 'antisymmetric')
+
+# Taps within this fraction of the largest tap count as mirrored (or as
+# zero), so designs with rounding errors in their symmetry still fold
+SYMMETRY_TOLERANCE = 1e-9
+
+
+def _prepareTaps(taps, channels):
+    ''' Returns the taps as a 2-D (1 or channels x taps) array, the number
+    of channels and whether the filter works on plain 1-D signals.'''
+    taps = np.asarray(taps)
+    if taps.ndim not in (1, 2) or taps.shape[-1] == 0:
+        raise ValueError('taps must be a non-empty 1-D or 2-D array.')
+    if taps.ndim == 2:
+        if channels is not None and channels != taps.shape[0]:
+            raise ValueError('channels does not match the rows of taps.')
+        channels = taps.shape[0]
+    singleChannel = channels is None
+    return np.atleast_2d(taps), (channels or 1), singleChannel
+
+
+class _StreamingFilter(object):
+    ''' Input and output shape handling shared by the streaming filters.'''
+
+    def _inputBlock(self, chunk):
+        chunk = np.asarray(chunk)
+        expectedDimensions = 1 if self._singleChannel else 2
+        if chunk.ndim != expectedDimensions or \
+                (not self._singleChannel and chunk.shape[0] != self.channels):
+            raise ValueError('chunk must be %s.' % (
+                    'a 1-D array' if self._singleChannel else
+                    'a (%d x samples) array' % self.channels))
+        return np.atleast_2d(chunk)
+
+    def _outputShape(self, length):
+        if self._singleChannel:
+            return (length,)
+        return (self.channels, length)
+
+
+class BlockFIRFilter(_StreamingFilter):
+    ''' FFT block FIR filter with carried-over state.
+
+    Input of any chunk size is collected into blocks of
+    blockLength = fftSize - len(taps) + 1 samples; every complete block is
+    filtered with one FFT against the precomputed filter spectrum, so output
+    lags the input by at most one block. process() returns the outputs that
+    are ready, flush() the remaining ones. Concatenated, they are exactly
+    np.convolve(signal, taps).
+
+    method 'overlap-save' keeps the last len(taps) - 1 input samples and
+    discards the wrapped part of each block, 'overlap-add' zero pads every
+    block and adds the tail of the previous one. Pass a complex dtype to
+    filter complex signals with real taps. With several channels one FFT
+    call transforms the blocks of all of them.'''
+
+    def __init__(self, taps, fftSize=None, method='overlap-save',
+                 dtype=None, channels=None):
+        taps, self.channels, self._singleChannel = \
+            _prepareTaps(taps, channels)
+        numberOfTaps = taps.shape[-1]
+        if method not in BLOCK_METHODS:
+            raise ValueError('method must be one of %s.' % (BLOCK_METHODS,))
+        if fftSize is None:
+            fftSize = scipy.fft.next_fast_len(4 * numberOfTaps)
+        if fftSize < numberOfTaps:
+            raise ValueError('fftSize can not be shorter than the filter.')
+
+        self.taps = taps[0] if self._singleChannel else taps
+        self.numberOfTaps = numberOfTaps
+        self.method = method
+        self.fftSize = int(fftSize)
+        self.blockLength = self.fftSize - numberOfTaps + 1
+        self.dtype = np.dtype(dtype or np.result_type(taps, np.float64))
+        self._isComplex = np.issubdtype(self.dtype, np.complexfloating)
+        if self._isComplex:
+            self._spectrum = fftBackends.fft(taps, self.fftSize, axis=-1)
+        else:
+            self._spectrum = fftBackends.rfft(taps, self.fftSize, axis=-1)
+        # FFT input: overlap-save keeps the history in front of the block,
+        # overlap-add leaves zeros behind it.
+        self._frame = np.zeros((self.channels, self.fftSize),
+                               dtype=self.dtype)
+        self._tail = np.zeros((self.channels, numberOfTaps - 1),
+                              dtype=self.dtype)
+        self.reset()
+
+    def reset(self):
+        ''' Forgets all state, as if no input was ever given.'''
+        self._frame[:] = 0
+        self._tail[:] = 0
+        self._pending = 0
+
+    def process(self, chunk):
+        ''' Takes the next chunk of input and returns the outputs of all
+        blocks it completes (possibly none).'''
+        chunk = self._inputBlock(chunk)
+        historyLength = self.numberOfTaps - 1
+        start = historyLength if self.method == 'overlap-save' else 0
+        length = chunk.shape[-1]
+        numberOfOutputs = ((self._pending + length) //
+                           self.blockLength) * self.blockLength
+        out = np.empty((self.channels, numberOfOutputs), dtype=self.dtype)
+
+        written = 0
+        position = 0
+        while position < length:
+            count = min(self.blockLength - self._pending, length - position)
+            frameStart = start + self._pending
+            self._frame[:, frameStart:frameStart + count] = \
+                chunk[:, position:position + count]
+            self._pending += count
+            position += count
+            if self._pending == self.blockLength:
+                self._filterBlock(out[:, written:written + self.blockLength])
+                written += self.blockLength
+        return out.reshape(self._outputShape(numberOfOutputs))
+
+    def flush(self):
+        ''' Returns the outputs still owed for the input given so far, the
+        filter tail included, and resets the filter.'''
+        owed = self._pending + self.numberOfTaps - 1
+        blocks = -(-owed // self.blockLength)
+        zeros = np.zeros(self._outputShape(blocks * self.blockLength -
+                                           self._pending), dtype=self.dtype)
+        out = self.process(zeros)[..., :owed]
+        self.reset()
+        return out
+
+    def _filterBlock(self, out):
+        historyLength = self.numberOfTaps - 1
+        if self._isComplex:
+            filtered = fftBackends.ifft(
+                    fftBackends.fft(self._frame, axis=-1) * self._spectrum,
+                    axis=-1)
+        else:
+            filtered = fftBackends.irfft(
+                    fftBackends.rfft(self._frame, axis=-1) * self._spectrum,
+                    self.fftSize, axis=-1)
+
+        if self.method == 'overlap-save':
+            # The first len(taps) - 1 outputs wrapped around; drop them and
+            # slide the newest input samples in as the next history.
+            out[...] = filtered[:, historyLength:]
+            self._frame[:, :historyLength] = self._frame[:, self.blockLength:]
+        else:
+            out[...] = filtered[:, :self.blockLength]
+            out[:, :historyLength] += self._tail[:, :self.blockLength]
+            if historyLength > self.blockLength:
+                # A short block leaves part of the old tail for the next one
+                self._tail[:, :-self.blockLength] = \
+                    self._tail[:, self.blockLength:]
+                self._tail[:, -self.blockLength:] = 0
+                self._tail += filtered[:, self.blockLength:]
+            else:
+                self._tail[...] = filtered[:, self.blockLength:]
+            self._frame[:, :self.blockLength] = 0
+        self._pending = 0
+
+
+class DirectFIRFilter(_StreamingFilter):
+    ''' Direct-form FIR filter that keeps its delay line between calls, for
+    block sizes too small for FFT filtering to pay off.
+
+    The last len(taps) - 1 input samples are kept in front of a preallocated
+    buffer of blockSize samples, and every output is a dot product of the
+    taps with a strided window view of that buffer. process() returns one
+    output per input sample; with out= given it allocates no arrays. Chunks
+    longer than blockSize are filtered blockSize samples at a time. Pass a
+    complex dtype to filter complex signals with real taps.'''
+
+    def __init__(self, taps, blockSize=256, dtype=None, channels=None):
+        taps, self.channels, self._singleChannel = \
+            _prepareTaps(taps, channels)
+        if blockSize <= 0:
+            raise ValueError('blockSize must be positive.')
+        self.taps = taps[0] if self._singleChannel else taps
+        self.numberOfTaps = taps.shape[-1]
+        self.blockSize = int(blockSize)
+        self.dtype = np.dtype(dtype or np.result_type(taps, np.float64))
+        historyLength = self.numberOfTaps - 1
+        # Shared taps are a vector, per-channel taps a stack of columns, so
+        # that matmul gives (channels x block) either way.
+        reversedTaps = taps[:, ::-1].astype(self.dtype)
+        self._perChannelTaps = taps.shape[0] > 1
+        if self._perChannelTaps:
+            self._reversedTaps = reversedTaps[:, :, np.newaxis]
+        else:
+            self._reversedTaps = reversedTaps[0]
+        self._buffer = np.zeros((self.channels,
+                                 historyLength + self.blockSize),
+                                dtype=self.dtype)
+        # Row i is the window of inputs that output i of a full block sees
+        self._windows = self._windowView(self.blockSize)
+
+    def _windowView(self, length):
+        channelStride, stride = self._buffer.strides
+        return np.lib.stride_tricks.as_strided(
+                self._buffer,
+                shape=(self.channels, length, self.numberOfTaps),
+                strides=(channelStride, stride, stride), writeable=False)
+
+    def reset(self):
+        ''' Clears the delay line.'''
+        self._buffer[:] = 0
+
+    def getState(self):
+        ''' Returns a copy of the delay line: the last len(taps) - 1 input
+        samples of every channel, oldest first.'''
+        state = self._buffer[:, :self.numberOfTaps - 1].copy()
+        return state[0] if self._singleChannel else state
+
+    def setState(self, state):
+        ''' Loads a delay line previously returned by getState.'''
+        self._buffer[:, :self.numberOfTaps - 1] = state
+
+    def process(self, chunk, out=None):
+        ''' Filters the next chunk of input and returns one output per input
+        sample, written into out when it is given.'''
+        chunk = self._inputBlock(chunk)
+        length = chunk.shape[-1]
+        if out is None:
+            out = np.empty(self._outputShape(length), dtype=self.dtype)
+        elif out.shape != self._outputShape(length):
+            raise ValueError('out must have the same shape as chunk.')
+        outRows = out[np.newaxis] if self._singleChannel else out
+
+        historyLength = self.numberOfTaps - 1
+        for start in range(0, length, self.blockSize):
+            count = min(self.blockSize, length - start)
+            self._buffer[:, historyLength:historyLength + count] = \
+                chunk[:, start:start + count]
+            self._filterBlock(count, outRows[:, start:start + count])
+            # The newest inputs become the delay line of the next block
+            self._buffer[:, :historyLength] = \
+                self._buffer[:, count:count + historyLength]
+        return out
+
+    def _filterBlock(self, count, out):
+        ''' Writes the outputs of the count newest inputs in the buffer into
+        the (channels x count) out.'''
+        windows = self._windows
+        if count != self.blockSize:
+            windows = self._windowView(count)
+        if self._perChannelTaps:
+            out = out[:, :, np.newaxis]
+        np.matmul(windows, self._reversedTaps, out=out)
+
+
+class SymmetricFIRFilter(DirectFIRFilter):
+    ''' Direct-form FIR filter for linear phase taps, with about half the
+    multiplies of DirectFIRFilter.
+
+    The taps of a linear phase filter mirror each other, h(k) = h(N-1-k)
+    or h(k) = -h(N-1-k), so the two inputs that meet a mirrored pair are
+    added (or subtracted) first and multiplied once. Zero taps at the ends
+    are skipped, and so are evenly spaced ones like every other tap of a
+    half-band filter; zeros scattered among the taps are still multiplied.
+    symmetry is 'symmetric', 'antisymmetric' or 'auto' to detect it from
+    the taps (ValueError when they are neither); when given, only the
+    first half of the taps is used. numberOfMultiplies tells the
+    multiplies per output sample.
+
+    Every block is folded once, adding the window view of the delay line
+    to its mirror image into a preallocated buffer, and then filtered by
+    a single matmul with the half taps. That reads about as much memory as
+    the direct form's matmul and does half the multiplies, so it is
+    faster at the same block size except for short filters in small
+    blocks, where the extra call costs more than it saves. Streaming,
+    channels, out= and getState / setState work as in DirectFIRFilter.'''
+
+    def __init__(self, taps, blockSize=256, dtype=None, channels=None,
+                 symmetry='auto'):
+        DirectFIRFilter.__init__(self, taps, blockSize, dtype, channels)
+        # Rows of taps that multiply the delay line oldest input first
+        reversedTaps = np.atleast_2d(self.taps)[:, ::-1].astype(self.dtype)
+        tolerance = SYMMETRY_TOLERANCE * np.abs(reversedTaps).max()
+        if symmetry == 'auto':
+            mirrored = reversedTaps[:, ::-1]
+            if np.all(np.abs(reversedTaps - mirrored) <= tolerance):
+                symmetry = 'symmetric'
+            elif np.all(np.abs(reversedTaps + mirrored) <= tolerance):
+                symmetry = 'antisymmetric'
+            else:
+                raise ValueError('The taps are neither symmetric nor '
+                                 'antisymmetric.')
+        elif symmetry not in SYMMETRY_TYPES:
+            raise ValueError('symmetry must be \'auto\' or one of %s.' %
+                             (SYMMETRY_TYPES,))
+        self.symmetry = symmetry
+        self._add = np.add if symmetry == 'symmetric' else np.subtract
+
+        # Window position j pairs with N-1-j. Keep the pairs from the first
+        # to the last tap that is not zero in any channel, spaced by the
+        # largest step that skips only zero taps (2 for a half-band
+        # filter), so both halves are strided views. The middle tap of an
+        # odd length symmetric filter gets a column of its own.
+        lastPosition = self.numberOfTaps - 1
+        half = self.numberOfTaps // 2
+        nonZero = np.flatnonzero(np.any(np.abs(reversedTaps[:, :half]) >
+                                        tolerance, axis=0))
+        if len(nonZero) == 0:
+            self._positions = self._mirrorPositions = slice(0, 0)
+        else:
+            step = int(np.gcd.reduce(np.diff(nonZero))) if \
+                len(nonZero) > 1 else 1
+            nonZero = np.arange(nonZero[0], nonZero[-1] + 1, step)
+            mirrorStop = lastPosition - nonZero[-1] - step
+            self._positions = slice(nonZero[0], nonZero[-1] + 1, step)
+            self._mirrorPositions = slice(
+                    lastPosition - nonZero[0],
+                    mirrorStop if mirrorStop >= 0 else None, -step)
+        positions = list(nonZero)
+        self._numberOfPairs = len(positions)
+        self._middle = None
+        if self.numberOfTaps % 2 == 1 and symmetry == 'symmetric' and \
+                np.any(np.abs(reversedTaps[:, half]) > tolerance):
+            self._middle = half
+            positions = positions + [half]
+        self.numberOfMultiplies = len(positions)
+
+        # The folded inputs are (channels x pairs x block), so that every
+        # pair is a contiguous row and the fold runs along the samples
+        foldedTaps = reversedTaps[:, positions]
+        if self._perChannelTaps:
+            self._foldedTaps = foldedTaps[:, np.newaxis, :]
+        else:
+            self._foldedTaps = foldedTaps[0]
+        self._folded = np.empty((self.channels, self.numberOfMultiplies,
+                                 self.blockSize), dtype=self.dtype)
+
+    def _filterBlock(self, count, out):
+        windows = self._windows
+        if count != self.blockSize:
+            windows = self._windowView(count)
+        windows = windows.swapaxes(-1, -2)
+        folded = self._folded[:, :, :count]
+        self._add(windows[:, self._positions],
+                  windows[:, self._mirrorPositions],
+                  out=folded[:, :self._numberOfPairs])
+        if self._middle is not None:
+            folded[:, -1] = windows[:, self._middle]
+        if self._perChannelTaps:
+            out = out[:, np.newaxis, :]
+        np.matmul(self._foldedTaps, folded, out=out)
+
+
+class PolyphaseResampler(_StreamingFilter):
+    ''' Streaming rational resampler by up / down with an FIR filter.
+
+    The output is what upsampling by up (inserting up - 1 zeros), filtering
+    with the taps and keeping every down-th sample would give, the same as
+    the start of scipy.signal.upfirdn(taps, signal, up, down). Only the kept
+    outputs are computed, each from the polyphase branch taps[p::up] that
+    meets non-zero input, so it costs about len(taps) / up multiplies per
+    output instead of len(taps) per upsampled sample. The last inputs are
+    carried over between process() calls. Scale the taps by up for unity
+    gain when interpolating.'''
+
+    def __init__(self, taps, up=1, down=1, dtype=None, channels=None):
+        taps, self.channels, self._singleChannel = \
+            _prepareTaps(taps, channels)
+        if up < 1 or down < 1:
+            raise ValueError('up and down must be positive integers.')
+        self.taps = taps[0] if self._singleChannel else taps
+        self.up = int(up)
+        self.down = int(down)
+        self.dtype = np.dtype(dtype or np.result_type(taps, np.float64))
+
+        # Branch p holds taps[p::up], zero padded to the same length, and
+        # reversed so it can be dotted with inputs oldest first.
+        self.branchLength = -(-taps.shape[-1] // self.up)
+        padded = np.zeros((taps.shape[0], self.branchLength * self.up),
+                          dtype=self.dtype)
+        padded[:, :taps.shape[-1]] = taps
+        branches = padded.reshape(taps.shape[0], self.branchLength, self.up)
+        # (1 or channels) x up x branchLength
+        self._branches = branches.transpose(0, 2, 1)[:, :, ::-1].copy()
+        self.reset()
+
+    def reset(self):
+        ''' Forgets all state, as if no input was ever given.'''
+        self._history = np.zeros((self.channels, self.branchLength - 1),
+                                 dtype=self.dtype)
+        self._inputCount = 0
+        self._outputCount = 0
+
+    def process(self, chunk):
+        ''' Takes the next chunk of input and returns all outputs that depend
+        only on the input given so far.'''
+        chunk = self._inputBlock(chunk)
+        totalInputs = self._inputCount + chunk.shape[-1]
+        lastOutput = -(-totalInputs * self.up // self.down)
+        count = lastOutput - self._outputCount
+        data = np.concatenate([self._history, chunk.astype(self.dtype)],
+                              axis=1)
+        channelStride, stride = data.strides
+
+        if self.down == 1:
+            # Interpolation: every input yields one output from each branch,
+            # so all branches go through a single matmul.
+            windows = np.lib.stride_tricks.as_strided(
+                    data, shape=(self.channels, chunk.shape[-1],
+                                 self.branchLength),
+                    strides=(channelStride, stride, stride), writeable=False)
+            out = np.matmul(windows, self._branches.transpose(0, 2, 1))
+        else:
+            out = np.empty((self.channels, count), dtype=self.dtype)
+            self._resampleInto(out, data)
+
+        if self.branchLength > 1:
+            self._history = data[:, -(self.branchLength - 1):].copy()
+        self._inputCount = totalInputs
+        self._outputCount = lastOutput
+        return out.reshape(self._outputShape(count))
+
+    def _resampleInto(self, out, data):
+        # Output m uses branch m * down % up, with its newest input at
+        # m * down // up. Both repeat every `period` outputs, so each class
+        # of outputs is one matmul of evenly spaced, strided input windows
+        # against one branch. Decimation has a single class.
+        channelStride, stride = data.strides
+        divisor = math.gcd(self.up, self.down)
+        period = self.up // divisor
+        step = self.down // divisor
+        count = out.shape[-1]
+        for offset in range(min(period, count)):
+            position = (self._outputCount + offset) * self.down
+            first = position // self.up - self._inputCount
+            windows = np.lib.stride_tricks.as_strided(
+                    data[:, first:],
+                    shape=(self.channels, len(range(offset, count, period)),
+                           self.branchLength),
+                    strides=(channelStride, step * stride, stride),
+                    writeable=False)
+            branch = self._branches[:, position % self.up, :, np.newaxis]
+            out[:, offset::period] = np.matmul(windows, branch)[..., 0]
+
+
+class PolyphaseDecimator(PolyphaseResampler):
+    ''' Low-pass filters and keeps every factor-th sample, computing only the
+    kept outputs. See PolyphaseResampler.'''
+
+    def __init__(self, taps, factor, dtype=None, channels=None):
+        PolyphaseResampler.__init__(self, taps, 1, factor, dtype, channels)
+
+
+class PolyphaseInterpolator(PolyphaseResampler):
+    ''' Inserts factor - 1 zeros between samples and low-pass filters, without
+    multiplying by the inserted zeros. See PolyphaseResampler.'''
+
+    def __init__(self, taps, factor, dtype=None, channels=None):
+        PolyphaseResampler.__init__(self, taps, factor, 1, dtype, channels)
@@ -0,0 +1,271 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Frequency responses of FIR filters. The demos transform the taps at
+# exactly firFilterSize points, which samples the response coarsely, and a
+# parameter sweep repeats that filter by filter. getFrequencyResponse takes
+# a (..., taps) stack of filters and any grid of frequencies, linear or
+# logarithmic (np.geomspace), and returns the magnitude in dB, the
+# unwrapped phase and the group delay of all of them in one batched call.
+#
+# A grid of k * fs / N frequencies is a slice of an N point FFT, and any
+# other evenly spaced grid is a chirp-Z transform (spectralAnalysis.
+# zoomSpectrum); everything else is summed directly, a block of complex
+# exponentials at a time. 'auto' estimates the cost of the methods the grid
+# allows and takes the cheapest.
+#
+# getBandMetrics reads the passband ripple, stopband attenuation and widest
+# transition band of every filter in the stack off those magnitudes.
+# ____________________________________________________________________________
+
+import fftBackends
+import numpy as np
+import scipy.fft
+import spectralAnalysis
+import sys
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+# Ways getResponse can evaluate a response
+RESPONSE_METHODS = ('auto', 'fft', 'chirpz', 'direct')
+
+# Largest difference (in cycles per sample) between frequency steps, or
+# from an FFT bin, that still counts as the same grid
+GRID_TOLERANCE = 1e-9
+
+# Complex exponentials the direct method computes at a time
+DIRECT_BLOCK_SIZE = 2 ** 20
+
+# Rough costs, in multiplies of the direct sum, of one complex exponential
+# and of a point of a real FFT or of a chirp-Z transform times log2 of the
+# transform length. 'auto' compares the methods with them.
+EXPONENTIAL_COST = 600
+FFT_COST = 8
+CHIRP_Z_COST = 25
+
+
+def getResponse(taps, frequencies, samplingFrequency, method='auto'):
+    ''' Returns the complex response sum(h(n) * exp(-j2 pi f n / fs)) of
+    the (..., taps) filters at every frequency (Hz), as a (..., frequencies)
+    array. method is 'fft' (frequencies k * fs / N for some N), 'chirpz'
+    (evenly spaced frequencies), 'direct' (any frequencies) or 'auto',
+    which picks the cheapest the grid allows.'''
+    if method not in RESPONSE_METHODS:
+        raise ValueError('method must be one of %s.' % (RESPONSE_METHODS,))
+    if samplingFrequency <= 0:
+        raise ValueError('samplingFrequency must be positive.')
+    taps = np.asarray(taps)
+    if taps.ndim == 0 or taps.shape[-1] == 0:
+        raise ValueError('taps must be a non-empty (..., taps) array.')
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    if frequencies.ndim != 1 or len(frequencies) == 0:
+        raise ValueError('frequencies must be a non-empty 1-D array.')
+    cycles = frequencies / samplingFrequency
+
+    step = _getGridStep(cycles)
+    fftLength = _getFFTLength(cycles, step)
+    if method == 'auto':
+        method = _chooseMethod(taps, len(cycles), step, fftLength)
+    if method == 'fft':
+        if fftLength is None:
+            raise ValueError('The fft method needs frequencies k * fs / N.')
+        return _fftResponse(taps, int(round(cycles[0] * fftLength)),
+                            len(cycles), fftLength)
+    if method == 'chirpz':
+        if step is None:
+            raise ValueError('The chirpz method needs evenly spaced '
+                             'frequencies.')
+        return spectralAnalysis.zoomSpectrum(
+                taps, 1, cycles[0], cycles[0] + step * (len(cycles) - 1),
+                len(cycles))[1]
+    return _directResponse(taps, cycles)
+
+
+def getFrequencyResponse(taps, frequencies, samplingFrequency,
+                         method='auto'):
+    ''' Returns (magnitude, phase, groupDelay) of the (..., taps) filters at
+    every frequency (Hz): the magnitude in dB, the phase in radians
+    unwrapped along the frequencies and the group delay in samples, each a
+    (..., frequencies) array. The group delay is Re(DFT(n h(n)) / DFT(h)),
+    evaluated in the same call as the response itself; it is not finite
+    where the response is zero. method is as in getResponse.'''
+    taps = np.asarray(taps)
+    if taps.ndim == 0 or taps.shape[-1] == 0:
+        raise ValueError('taps must be a non-empty (..., taps) array.')
+    ramp = np.arange(taps.shape[-1])
+    response, rampResponse = getResponse(np.stack((taps, taps * ramp)),
+                                         frequencies, samplingFrequency,
+                                         method)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        magnitude = 20 * np.log10(np.abs(response))
+        groupDelay = np.real(rampResponse / response)
+    phase = np.unwrap(np.angle(response), axis=-1)
+    return magnitude, phase, groupDelay
+
+
+def getBandMetrics(magnitude, frequencies, bands, passbandRipple=None,
+                   stopbandAttenuation=None):
+    ''' Returns (passbandRipple, stopbandAttenuation, transitionWidth) of
+    every filter in a (..., frequencies) stack of magnitudes in dB, on
+    (lowFrequency, highFrequency, gain) bands as filterDesign.checkBands
+    returns them: the peak to peak ripple (dB) of the worst band with a
+    gain, relative to that gain, the attenuation (dB) of the worst zero
+    gain band relative to the largest gain, and the widest transition (Hz)
+    between a band with a gain and a zero gain band next to it.
+
+    A transition runs from where the response last keeps the passband
+    ripple, coming from the band with a gain, to where it first stays
+    within the stopband attenuation for the rest of the zero gain band.
+    The limits are the ripple and attenuation given, or else the achieved
+    ones. transitionWidth is NaN when no band with a gain borders a zero
+    gain one.'''
+    magnitude = 10 ** (np.asarray(magnitude) / 20)
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    bands = np.asarray(bands, dtype=np.float64).reshape(-1, 3)
+    bands = bands[np.argsort(bands[:, 0], kind='stable')]
+    largestGain = np.abs(bands[:, 2]).max()
+
+    deviation = np.zeros(magnitude.shape[:-1])
+    leakage = np.zeros(magnitude.shape[:-1])
+    for lowFrequency, highFrequency, gain in bands:
+        inBand = (frequencies >= lowFrequency) & \
+                 (frequencies <= highFrequency)
+        if not inBand.any():
+            continue
+        if gain != 0:
+            bandDeviation = np.abs(magnitude[..., inBand] / gain - 1)
+            deviation = np.maximum(deviation, bandDeviation.max(axis=-1))
+        else:
+            leakage = np.maximum(leakage,
+                                 magnitude[..., inBand].max(axis=-1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        achievedRipple = 20 * np.log10((1 + deviation) /
+                                       np.maximum(1 - deviation, 0))
+        achievedAttenuation = -20 * np.log10(leakage / largestGain)
+
+    if passbandRipple is not None:
+        ratio = 10 ** (passbandRipple / 20)
+        deviation = np.full(deviation.shape, (ratio - 1) / (ratio + 1))
+    if stopbandAttenuation is not None:
+        leakage = np.full(leakage.shape,
+                          largestGain * 10 ** (-stopbandAttenuation / 20))
+    transitionWidth = np.full(magnitude.shape[:-1], np.nan)
+    for lowerBand, upperBand in zip(bands[:-1], bands[1:]):
+        for passBand, stopBand in [(lowerBand, upperBand),
+                                   (upperBand, lowerBand)]:
+            if passBand[2] == 0 or stopBand[2] != 0:
+                continue
+            width = _getTransitionWidth(
+                    magnitude, frequencies, passBand, stopBand,
+                    abs(passBand[2]) * (1 - deviation), leakage)
+            transitionWidth = np.fmax(transitionWidth, width)
+    return achievedRipple, achievedAttenuation, transitionWidth
+
+
+def _getTransitionWidth(magnitude, frequencies, passBand, stopBand,
+                        passLevel, stopLevel):
+    ''' Width (Hz) of the transition from passBand to stopBand for every
+    magnitude, with the passLevel and stopLevel limits of each.'''
+    lowFrequency = min(passBand[0], stopBand[0])
+    highFrequency = max(passBand[1], stopBand[1])
+    region = (frequencies >= lowFrequency) & (frequencies <= highFrequency)
+    if not region.any():
+        return np.full(magnitude.shape[:-1], np.nan)
+    span = magnitude[..., region]
+    regionFrequencies = frequencies[region]
+    # Walk from the pass band towards the stop band
+    if passBand[0] > stopBand[0]:
+        span = span[..., ::-1]
+        regionFrequencies = regionFrequencies[::-1]
+    passing = np.logical_and.accumulate(
+            span >= passLevel[..., np.newaxis], axis=-1)
+    stopping = np.logical_and.accumulate(
+            span[..., ::-1] <= stopLevel[..., np.newaxis], axis=-1)
+    lastPassing = np.maximum(passing.sum(axis=-1) - 1, 0)
+    firstStopping = np.minimum(span.shape[-1] - stopping.sum(axis=-1),
+                               span.shape[-1] - 1)
+    return np.abs(regionFrequencies[firstStopping] -
+                  regionFrequencies[lastPassing])
+
+
+def _getGridStep(cycles):
+    ''' Step between the frequencies (cycles per sample) when they are
+    evenly spaced, else None.'''
+    if len(cycles) == 1:
+        return 0.0
+    step = (cycles[-1] - cycles[0]) / (len(cycles) - 1)
+    if np.abs(np.diff(cycles) - step).max() > GRID_TOLERANCE:
+        return None
+    return step
+
+
+def _getFFTLength(cycles, step):
+    ''' N when the frequencies (cycles per sample) are consecutive bins of
+    an N point FFT, else None.'''
+    if step is None or step <= 0:
+        return None
+    fftLength = int(round(1 / step))
+    startBin = cycles[0] * fftLength
+    if abs(fftLength * step - 1) > GRID_TOLERANCE * fftLength or \
+            abs(startBin - round(startBin)) > GRID_TOLERANCE * fftLength:
+        return None
+    return fftLength
+
+
+def _chooseMethod(taps, numberOfFrequencies, step, fftLength):
+    ''' The method getResponse's 'auto' uses: the one with the lowest
+    estimated cost among those the grid allows.'''
+    numberOfFilters = taps.size // taps.shape[-1]
+    numberOfTaps = taps.shape[-1]
+    costs = {'direct': numberOfFrequencies * numberOfTaps *
+             (numberOfFilters + EXPONENTIAL_COST)}
+    if step is not None:
+        length = scipy.fft.next_fast_len(numberOfTaps +
+                                         numberOfFrequencies - 1)
+        costs['chirpz'] = CHIRP_Z_COST * numberOfFilters * length * \
+            np.log2(length)
+    if fftLength is not None:
+        costs['fft'] = FFT_COST * numberOfFilters * \
+            (fftLength * np.log2(max(fftLength, 2)) + numberOfTaps)
+    return min(costs, key=costs.get)
+
+
+def _fftResponse(taps, startBin, numberOfBins, fftLength):
+    ''' Bins startBin .. startBin + numberOfBins - 1 (modulo fftLength) of
+    the fftLength point DFT of the taps. Taps longer than that are folded
+    onto fftLength samples first, which leaves those bins unchanged.'''
+    numberOfTaps = taps.shape[-1]
+    if numberOfTaps > fftLength:
+        rows = -(-numberOfTaps // fftLength)
+        folded = np.zeros(taps.shape[:-1] + (rows * fftLength,),
+                          dtype=taps.dtype)
+        folded[..., :numberOfTaps] = taps
+        taps = folded.reshape(taps.shape[:-1] +
+                              (rows, fftLength)).sum(axis=-2)
+    bins = (startBin + np.arange(numberOfBins)) % fftLength
+    if np.iscomplexobj(taps):
+        return fftBackends.fft(taps, fftLength, axis=-1)[..., bins]
+    # A real filter's upper bins are the conjugates of the lower ones
+    spectrum = fftBackends.rfft(taps, fftLength, axis=-1)
+    mirrored = bins > fftLength // 2
+    response = spectrum[..., np.where(mirrored, fftLength - bins, bins)]
+    response[..., mirrored] = np.conj(response[..., mirrored])
+    return response
+
+
+def _directResponse(taps, cycles):
+    ''' The response summed directly at every frequency (cycles per
+    sample), a block of frequencies at a time.'''
+    sampleIndices = np.arange(taps.shape[-1])[:, np.newaxis]
+    response = np.empty(taps.shape[:-1] + (len(cycles),),
+                        dtype=np.result_type(taps, np.complex128))
+    blockSize = max(1, DIRECT_BLOCK_SIZE // taps.shape[-1])
+    for start in range(0, len(cycles), blockSize):
+        block = cycles[start:start + blockSize]
+        # Phases in cycles, wrapped to one cycle before they become angles
+        exponentials = np.exp(-2j * np.pi *
+                              ((sampleIndices * block) % 1.0))
+        response[..., start:start + len(block)] = taps @ exponentials
+    return response
@@ -0,0 +1,201 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Streaming oscillators. Instead of building the whole n = arange(...) index
+# vector like common.getDiscreteSinusoid, a numerically controlled oscillator
+# (NCO) keeps a wrapped phase accumulator and hands out the tone one chunk at
+# a time. Memory is bounded by the chunk size no matter how long it runs, and
+# the phase never grows large enough to lose precision.
+#
+# Besides evaluating np.sin / np.cos on every sample ('direct'), the NCO can
+# synthesize with cheaper multiply-adds: a complex rotator recursion
+# ('rotator') or a quantized phase lookup table ('table').
+# ____________________________________________________________________________
+
+import numpy as np
+import sys
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+# Largest absolute difference we accept between the streamed output and the
+# one-shot common.getDiscreteSinusoid result for unit amplitude. The phase is
+# kept in cycles in [0, 1), so the error stays at this level for any length.
+NCO_TOLERANCE = 1e-9
+
+# Synthesis engines understood by NumericallyControlledOscillator
+OSCILLATOR_METHODS = ('direct', 'rotator', 'table')
+
+# The rotator state is pulled back onto the unit circle every this many
+# chunks, before its magnitude error can build up.
+ROTATOR_RENORMALIZE_CHUNKS = 16
+
+
+class NumericallyControlledOscillator(object):
+    ''' Generates a sinusoid chunk by chunk with continuous phase.
+
+    The phase is accumulated in cycles and wrapped to [0, 1) after every
+    chunk. Changing the frequency takes effect at the next chunk without a
+    phase jump. All frequency values are in Hz, phase is in radians.
+
+    method selects the synthesis engine:
+    'direct'  evaluates sinusoid on every sample (any callable works).
+    'rotator' multiplies a unit complex state by precomputed rotations, one
+              complex multiply per sample. The state is advanced once per
+              chunk and renormalized every ROTATOR_RENORMALIZE_CHUNKS chunks.
+    'table'   reads a 2**tableBits entry sine table at the quantized phase,
+              with linear interpolation between entries when interpolate
+              is True.
+    The rotator and table engines only synthesize np.sin and np.cos.'''
+
+    def __init__(self, sinusoidFrequency, samplingFrequency, sinusoid=np.sin,
+                 initialPhase=0, amplitude=1, chunkSize=4096,
+                 dtype=np.float64, method='direct', tableBits=12,
+                 interpolate=True):
+        if chunkSize <= 0:
+            raise ValueError('chunkSize must be positive.')
+        if method not in OSCILLATOR_METHODS:
+            raise ValueError('method must be one of %s.'
+                             % (OSCILLATOR_METHODS,))
+        if method != 'direct' and sinusoid not in (np.sin, np.cos):
+            raise ValueError('The %s method only supports np.sin and np.cos.'
+                             % method)
+        self.method = method
+        self.interpolate = interpolate
+        self.samplingFrequency = samplingFrequency
+        self.sinusoid = sinusoid
+        self.amplitude = amplitude
+        self.chunkSize = int(chunkSize)
+        self.dtype = np.dtype(dtype)
+        self.samplesGenerated = 0
+        # Cosine is a sine a quarter cycle ahead
+        self._cycleOffset = 0.25 if sinusoid is np.cos else 0.0
+        # Sample indices of one chunk, reused by every call
+        self._n = np.arange(self.chunkSize, dtype=np.float64)
+        self._phase = np.empty(self.chunkSize, dtype=np.float64)
+        if method == 'rotator':
+            self._rotated = np.empty(self.chunkSize, dtype=np.complex128)
+        elif method == 'table':
+            tableSize = 2 ** int(tableBits)
+            self._tableMask = tableSize - 1
+            self._tableSize = tableSize
+            # One extra entry so that index + 1 never has to wrap
+            self._table = np.sin(2 * np.pi * np.arange(tableSize + 1) /
+                                 tableSize)
+            self._slope = np.diff(self._table)
+            self._index = np.empty(self.chunkSize, dtype=np.intp)
+        self.setFrequency(sinusoidFrequency)
+        self.setPhase(initialPhase)
+
+    def setFrequency(self, sinusoidFrequency):
+        ''' Changes the frequency from the next generated sample on.'''
+        self.sinusoidFrequency = sinusoidFrequency
+        self._cyclesPerSample = sinusoidFrequency / self.samplingFrequency
+        if self.method == 'rotator':
+            # Powers of the per-sample rotation for one chunk, plus the one
+            # that advances the state by a whole chunk
+            self._rotations = np.exp(2j * np.pi * self._cyclesPerSample *
+                                     np.arange(self.chunkSize + 1))
+
+    def setPhase(self, phase):
+        ''' Sets the phase (in radians) of the next generated sample.'''
+        self._cycles = (phase / (2 * np.pi)) % 1.0
+        if self.method == 'rotator':
+            self._resetRotator()
+
+    def _resetRotator(self):
+        self._state = np.exp(2j * np.pi * (self._cycles + self._cycleOffset))
+        self._chunksSinceRenormalize = 0
+
+    def getPhase(self):
+        ''' Returns the phase (in radians) of the next generated sample.'''
+        return 2 * np.pi * self._cycles
+
+    def generate(self, numberOfSamples=None, out=None):
+        ''' Returns the next numberOfSamples samples (chunkSize by default),
+        written into out when it is given.'''
+        if numberOfSamples is None:
+            numberOfSamples = len(out) if out is not None else self.chunkSize
+        if out is None:
+            out = np.empty(numberOfSamples, dtype=self.dtype)
+        elif len(out) != numberOfSamples:
+            raise ValueError('out must hold exactly numberOfSamples samples.')
+
+        # Longer requests are served in chunkSize pieces so the temporary
+        # phase buffer never grows.
+        for start in range(0, numberOfSamples, self.chunkSize):
+            stop = min(start + self.chunkSize, numberOfSamples)
+            self._generateChunk(out[start:stop])
+        return out
+
+    def _generateChunk(self, out):
+        length = len(out)
+        if self.method == 'rotator':
+            self._rotatorChunk(out)
+        elif self.method == 'table':
+            self._tableChunk(out)
+        else:
+            self._directChunk(out)
+        if self.amplitude != 1:
+            out *= self.amplitude
+        self._cycles = (self._cycles + self._cyclesPerSample * length) % 1.0
+        self.samplesGenerated += length
+
+    def _directChunk(self, out):
+        length = len(out)
+        phase = self._phase[:length]
+        np.multiply(self._n[:length], self._cyclesPerSample, out=phase)
+        phase += self._cycles
+        phase *= 2 * np.pi
+        if isinstance(self.sinusoid, np.ufunc):
+            self.sinusoid(phase, out=out, casting='same_kind')
+        else:
+            out[...] = self.sinusoid(phase)
+
+    def _rotatorChunk(self, out):
+        length = len(out)
+        rotated = self._rotated[:length]
+        np.multiply(self._rotations[:length], self._state, out=rotated)
+        # exp(j * phase) holds the sine in its imaginary part; cosine was
+        # folded into the state as a quarter cycle offset.
+        out[...] = rotated.imag
+        self._state *= self._rotations[length]
+        self._chunksSinceRenormalize += 1
+        if self._chunksSinceRenormalize >= ROTATOR_RENORMALIZE_CHUNKS:
+            self._state /= abs(self._state)
+            self._chunksSinceRenormalize = 0
+
+    def _tableChunk(self, out):
+        length = len(out)
+        # Phase measured in table entries
+        position = self._phase[:length]
+        np.multiply(self._n[:length], self._cyclesPerSample * self._tableSize,
+                    out=position)
+        position += (self._cycles + self._cycleOffset) * self._tableSize
+        index = self._index[:length]
+        np.floor(position, out=index, casting='unsafe')
+        if self.interpolate:
+            # Fraction of the way to the next table entry
+            position -= index
+            index &= self._tableMask
+            position *= self._slope[index]
+            position += self._table[index]
+            out[...] = position
+        else:
+            index &= self._tableMask
+            out[...] = self._table[index]
+
+    def chunks(self, numberOfSamples=None):
+        ''' Yields chunkSize long chunks until numberOfSamples samples were
+        produced (the last chunk may be shorter), or forever if it is None.'''
+        remaining = numberOfSamples
+        while remaining is None or remaining > 0:
+            length = self.chunkSize
+            if remaining is not None:
+                length = min(length, remaining)
+                remaining -= length
+            yield self.generate(length)
+
+    def __iter__(self):
+        return self.chunks()
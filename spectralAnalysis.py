@@ -0,0 +1,622 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Spectral analysis over time. common.getSpectrum transforms a signal as one
+# frame; the short-time Fourier transform (STFT) here cuts it into windowed,
+# overlapping frames and transforms all of them with a single batched FFT.
+#
+# Frames are strided views into the signal, so framing copies nothing. The
+# streaming classes take the signal chunk by chunk and carry the overlap
+# between frames over to the next chunk, so arbitrarily long records (e.g.
+# common.generateWidebandNoiseChunks) are analysed in bounded memory.
+#
+# Averaging the power of those frames gives Welch's power spectral density
+# estimate, whose variance falls with every segment averaged, unlike a single
+# long periodogram.
+#
+# When only a few known frequencies matter, goertzel evaluates just those DFT
+# bins (at any frequency, not only multiples of fs / N) and SlidingDFT tracks
+# them sample by sample at a cost per sample that does not depend on N.
+# zoomSpectrum looks at a narrow band only, at any bin spacing, through the
+# chirp-Z transform instead of a heavily zero padded FFT.
+# ____________________________________________________________________________
+
+import concurrent.futures
+import fftBackends
+import functools
+import numpy as np
+import scipy.fft
+import scipy.signal
+import sys
+import windows
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+# Pools welch() can spread batches of segments over
+WELCH_EXECUTORS = ('process', 'thread')
+
+# Ways goertzel() can evaluate the DFT bins
+GOERTZEL_METHODS = ('matrix', 'recursive')
+
+# Number of frame length / frequency combinations whose cosine and sine
+# tables goertzel() keeps
+GOERTZEL_CACHE_SIZE = 32
+
+# Number of signal length / band combinations whose chirps zoomSpectrum()
+# keeps
+CHIRP_Z_CACHE_SIZE = 32
+
+# Samples SlidingDFT updates at once, bounding its scratch memory
+SLIDING_DFT_BLOCK_SIZE = 4096
+
+
+def getWindow(window, frameLength):
+    ''' Returns window as an array of frameLength samples. window is either
+    an array, or a name (or (name, parameter) tuple) of the periodic window
+    that overlaps evenly in an STFT. Names in windows.WINDOW_TYPES come from
+    its cache; any other name understood by scipy.signal.get_window works
+    too.'''
+    if isinstance(window, (str, tuple)):
+        name, parameter = (window, None) if isinstance(window, str) else \
+            (window[0], window[1] if len(window) > 1 else None)
+        if name in windows.WINDOW_TYPES:
+            return windows.getWindow(name, frameLength, symmetric=False,
+                                     parameter=parameter)
+        return scipy.signal.get_window(window, frameLength)
+    window = np.asarray(window)
+    if window.shape != (frameLength,):
+        raise ValueError('window must be frameLength samples long.')
+    return window
+
+
+def getFrames(signal, frameLength, hop):
+    ''' Returns a read-only (..., frames x frameLength) view of the frames of
+    signal along its last axis, hop samples apart. Only frames that fit in
+    the signal entirely are included. Nothing is copied.'''
+    signal = np.asarray(signal)
+    if signal.shape[-1] < frameLength:
+        return np.empty(signal.shape[:-1] + (0, frameLength),
+                        dtype=signal.dtype)
+    frames = np.lib.stride_tricks.sliding_window_view(signal, frameLength,
+                                                      axis=-1)
+    return frames[..., ::hop, :]
+
+
+def _overlapAdd(frames, hop, out):
+    ''' Adds (..., frames x frameLength) blocks, each hop samples after the
+    previous one, into out. out needs room for frames * hop + frameLength
+    samples along its last axis.'''
+    numberOfFrames, frameLength = frames.shape[-2:]
+    # Columns offset .. offset + hop of consecutive frames land on
+    # consecutive hop long blocks of out, one vectorized add per offset.
+    for offset in range(0, frameLength, hop):
+        width = min(hop, frameLength - offset)
+        blocks = out[..., offset:offset + numberOfFrames * hop]
+        blocks = blocks.reshape(blocks.shape[:-1] + (numberOfFrames, hop))
+        blocks[..., :width] += frames[..., offset:offset + width]
+
+
+class ShortTimeFourierTransform(object):
+    ''' Streaming STFT.
+
+    process() takes the signal chunk by chunk (1-D, or (... x samples) for
+    several channels) and returns the spectra of every frame completed so
+    far as a (..., frames x bins) array; input shorter than a frame is kept
+    until the next call. Concatenated along the frame axis, the outputs
+    equal a one-shot stft() of the whole signal.
+
+    Frames are frameLength samples, hop samples apart (frameLength // 2 by
+    default), multiplied by window and transformed at numberOfPoints
+    (frameLength by default, more zero pads every frame). Real signals get
+    the one-sided spectrum like common.getSpectrum, complex signals the
+    whole DFT.'''
+
+    def __init__(self, frameLength=256, hop=None, window='hann',
+                 numberOfPoints=None):
+        if hop is None:
+            hop = frameLength // 2
+        if frameLength <= 0 or not 0 < hop <= frameLength:
+            raise ValueError('hop must be between 1 and frameLength.')
+        if numberOfPoints is None:
+            numberOfPoints = frameLength
+        if numberOfPoints < frameLength:
+            raise ValueError('numberOfPoints can not be shorter than a '
+                             'frame.')
+        self.frameLength = int(frameLength)
+        self.hop = int(hop)
+        self.numberOfPoints = int(numberOfPoints)
+        self.window = getWindow(window, self.frameLength)
+        self.reset()
+
+    def reset(self):
+        ''' Forgets all state, as if no input was ever given.'''
+        self._pending = None
+        self.framesProduced = 0
+
+    def process(self, chunk):
+        ''' Takes the next chunk of input and returns the spectra of all
+        frames it completes (possibly none).'''
+        chunk = np.asarray(chunk)
+        if self._pending is not None and self._pending.shape[-1]:
+            signal = np.concatenate((self._pending, chunk), axis=-1)
+        else:
+            signal = chunk
+        frames = getFrames(signal, self.frameLength, self.hop)
+        numberOfFrames = frames.shape[-2]
+        # Keep everything from the start of the next frame; the copy is at
+        # most one frame long.
+        self._pending = signal[..., numberOfFrames * self.hop:].copy()
+        self.framesProduced += numberOfFrames
+
+        windowed = frames * self.window
+        if np.iscomplexobj(windowed):
+            return fftBackends.fft(windowed, self.numberOfPoints, axis=-1)
+        return fftBackends.rfft(windowed, self.numberOfPoints, axis=-1)
+
+    def getFrequencyAxis(self, samplingFrequency, oneSided=True):
+        ''' Frequencies in Hz of the bins process() returns.'''
+        return np.arange(self.numberOfPoints // 2 + 1 if oneSided else
+                         self.numberOfPoints) * (samplingFrequency /
+                                                 self.numberOfPoints)
+
+    def getFrameTimes(self, samplingFrequency, numberOfFrames, firstFrame=0):
+        ''' Times in seconds of the first sample of numberOfFrames frames,
+        starting with frame number firstFrame.'''
+        return ((firstFrame + np.arange(numberOfFrames)) * self.hop /
+                samplingFrequency)
+
+
+class InverseShortTimeFourierTransform(object):
+    ''' Streaming inverse STFT by weighted overlap-add.
+
+    Every frame is transformed back, multiplied by the synthesis window
+    (the analysis window) and added hop samples after the previous one. The
+    sum is divided by the overlapping squared windows, which undoes the
+    analysis for any window and hop where they do not vanish. process()
+    returns the samples no later frame can change any more, flush() the
+    rest. Give the same frameLength, hop, window and numberOfPoints as the
+    ShortTimeFourierTransform that made the spectra, and oneSided=False if
+    the signal was complex.'''
+
+    def __init__(self, frameLength=256, hop=None, window='hann',
+                 numberOfPoints=None, oneSided=True):
+        analysis = ShortTimeFourierTransform(frameLength, hop, window,
+                                             numberOfPoints)
+        self.frameLength = analysis.frameLength
+        self.hop = analysis.hop
+        self.numberOfPoints = analysis.numberOfPoints
+        self.window = analysis.window
+        self.oneSided = oneSided
+        self._squaredWindow = self.window ** 2
+        self.reset()
+
+    def reset(self):
+        ''' Forgets all state, as if no frames were ever given.'''
+        self._tail = None
+        self._weightTail = np.zeros(self.frameLength - self.hop)
+
+    def process(self, spectra):
+        ''' Takes (..., frames x bins) spectra and returns the samples they
+        complete.'''
+        spectra = np.asarray(spectra)
+        numberOfFrames = spectra.shape[-2]
+        if self.oneSided:
+            frames = fftBackends.irfft(spectra, self.numberOfPoints, axis=-1)
+        else:
+            frames = fftBackends.ifft(spectra, self.numberOfPoints, axis=-1)
+        frames = frames[..., :self.frameLength] * self.window
+
+        overlap = self.frameLength - self.hop
+        length = numberOfFrames * self.hop
+        # One extra hop keeps _overlapAdd inside the buffer
+        summed = np.zeros(frames.shape[:-2] + (length + self.frameLength,),
+                          dtype=frames.dtype)
+        weights = np.zeros(length + self.frameLength)
+        if self._tail is not None:
+            summed[..., :overlap] += self._tail
+        weights[:overlap] = self._weightTail
+        _overlapAdd(frames, self.hop, summed)
+        _overlapAdd(np.broadcast_to(self._squaredWindow,
+                                    (numberOfFrames, self.frameLength)),
+                    self.hop, weights)
+
+        self._tail = summed[..., length:length + overlap].copy()
+        self._weightTail = weights[length:length + overlap].copy()
+        return self._normalize(summed[..., :length], weights[:length])
+
+    def flush(self):
+        ''' Returns the samples of the last frames that are still held back,
+        and resets the transform.'''
+        if self._tail is None:
+            out = np.empty(0)
+        else:
+            out = self._normalize(self._tail, self._weightTail)
+        self.reset()
+        return out
+
+    def _normalize(self, summed, weights):
+        # Where no window covers a sample (e.g. the very first sample of a
+        # Hann window) nothing can be recovered; leave it zero.
+        covered = weights > 1e-10 * self._squaredWindow.max()
+        out = np.zeros_like(summed)
+        np.divide(summed, weights, out=out, where=covered)
+        return out
+
+
+def stft(signal, samplingFrequency, frameLength=256, hop=None,
+         window='hann', numberOfPoints=None):
+    ''' Returns (frequencyAxis, frameTimes, spectrogram) of a signal, where
+    spectrogram holds the (..., frames x bins) spectra of all frames, each
+    computed with one batched FFT call. frameTimes are the start times of
+    the frames in seconds. See ShortTimeFourierTransform for the arguments
+    and for processing a signal chunk by chunk.'''
+    transform = ShortTimeFourierTransform(frameLength, hop, window,
+                                          numberOfPoints)
+    spectrogram = transform.process(signal)
+    frequencyAxis = transform.getFrequencyAxis(
+            samplingFrequency, oneSided=not np.iscomplexobj(signal))
+    frameTimes = transform.getFrameTimes(samplingFrequency,
+                                         spectrogram.shape[-2])
+    return frequencyAxis, frameTimes, spectrogram
+
+
+def istft(spectrogram, frameLength=256, hop=None, window='hann',
+          numberOfPoints=None, oneSided=True):
+    ''' Rebuilds the signal from an stft() spectrogram by weighted
+    overlap-add; it is (frames - 1) * hop + frameLength samples long.'''
+    transform = InverseShortTimeFourierTransform(frameLength, hop, window,
+                                                 numberOfPoints, oneSided)
+    return np.concatenate((transform.process(spectrogram), transform.flush()),
+                          axis=-1)
+
+
+class PowerSpectralDensity(object):
+    ''' Streaming Welch power spectral density estimate.
+
+    The signal is cut into segmentLength long segments, hop samples apart
+    (half overlapping by default), each multiplied by window. process()
+    takes the signal chunk by chunk and adds up the power spectra of the
+    completed segments; getDensity() returns their average, scaled to a
+    density in units^2 / Hz. Bartlett's method is window='boxcar' with
+    hop=segmentLength. The segments are not detrended.
+
+    Real signals give the one-sided density, with every bin but DC (and
+    fs / 2 for even lengths) doubled to hold its negative frequency, so it
+    integrates to the signal power. Complex signals give the two-sided
+    density.'''
+
+    def __init__(self, samplingFrequency, segmentLength=256, hop=None,
+                 window='hann', numberOfPoints=None):
+        self._transform = ShortTimeFourierTransform(segmentLength, hop,
+                                                    window, numberOfPoints)
+        self.samplingFrequency = samplingFrequency
+        self.segmentLength = self._transform.frameLength
+        self.hop = self._transform.hop
+        self.numberOfPoints = self._transform.numberOfPoints
+        self.window = self._transform.window
+        self.reset()
+
+    def reset(self):
+        ''' Forgets all segments, as if no input was ever given.'''
+        self._transform.reset()
+        self._powerSum = 0
+        self._oneSided = True
+        self.segmentsAveraged = 0
+
+    def process(self, chunk):
+        ''' Adds the segments the next chunk of input completes.'''
+        chunk = np.asarray(chunk)
+        self._oneSided = not np.iscomplexobj(chunk)
+        self._addPower(*_getPowerSum(self._transform, chunk))
+
+    def _addPower(self, powerSum, numberOfSegments):
+        self._powerSum = self._powerSum + powerSum
+        self.segmentsAveraged += numberOfSegments
+
+    def getDensity(self):
+        ''' Returns (frequencyAxis, density) averaged over every segment
+        so far.'''
+        if self.segmentsAveraged == 0:
+            raise ValueError('No complete segment was given yet.')
+        density = self._powerSum / (self.segmentsAveraged *
+                                     self.samplingFrequency *
+                                     np.sum(self.window ** 2))
+        if self._oneSided:
+            density[..., 1:(self.numberOfPoints + 1) // 2] *= 2
+        frequencyAxis = self._transform.getFrequencyAxis(
+                self.samplingFrequency, self._oneSided)
+        return frequencyAxis, density
+
+
+def _getPowerSum(transform, signal):
+    ''' Returns the summed power spectra of the frames transform completes
+    with signal, and their number.'''
+    spectra = transform.process(signal)
+    power = spectra.real ** 2
+    power += spectra.imag ** 2
+    return np.sum(power, axis=-2), spectra.shape[-2]
+
+
+def _getBatchPowerSum(batch, segmentLength, hop, window, numberOfPoints):
+    ''' Power sum of all segments of one batch, run by the pool workers.'''
+    transform = ShortTimeFourierTransform(segmentLength, hop, window,
+                                          numberOfPoints)
+    return _getPowerSum(transform, batch)
+
+
+def welch(signal, samplingFrequency, segmentLength=256, hop=None,
+          window='hann', numberOfPoints=None, batchSegments=1024, workers=1,
+          executor='process'):
+    ''' Returns (frequencyAxis, density), the Welch power spectral density
+    estimate of a signal; see PowerSpectralDensity for the arguments.
+
+    The segments are transformed batchSegments at a time, one batched FFT
+    call each, which bounds the temporary memory. With more than one worker
+    the batches are spread over a pool of processes (or threads with
+    executor='thread'). The result does not depend on either setting.'''
+    if executor not in WELCH_EXECUTORS:
+        raise ValueError('executor must be one of %s.' % (WELCH_EXECUTORS,))
+    if batchSegments <= 0:
+        raise ValueError('batchSegments must be positive.')
+    signal = np.asarray(signal)
+    estimator = PowerSpectralDensity(samplingFrequency, segmentLength, hop,
+                                     window, numberOfPoints)
+    estimator._oneSided = not np.iscomplexobj(signal)
+    hop = estimator.hop
+    segmentLength = estimator.segmentLength
+    numberOfSegments = max(0, (signal.shape[-1] - segmentLength) // hop + 1)
+
+    # Each batch holds the samples of batchSegments consecutive segments,
+    # overlapping the next batch by segmentLength - hop samples.
+    batches = [signal[..., first * hop:
+                      (min(first + batchSegments, numberOfSegments) - 1) *
+                      hop + segmentLength]
+               for first in range(0, numberOfSegments, batchSegments)]
+    arguments = (segmentLength, hop, estimator.window,
+                 estimator.numberOfPoints)
+    if workers <= 1 or len(batches) <= 1:
+        for batch in batches:
+            estimator._addPower(*_getBatchPowerSum(batch, *arguments))
+    else:
+        if executor == 'process':
+            pool = concurrent.futures.ProcessPoolExecutor(workers)
+        else:
+            pool = concurrent.futures.ThreadPoolExecutor(workers)
+        with pool:
+            results = pool.map(_getBatchPowerSum, batches,
+                               *[[argument] * len(batches)
+                                 for argument in arguments])
+            for powerSum, count in results:
+                estimator._addPower(powerSum, count)
+    return estimator.getDensity()
+
+
+def goertzel(signal, samplingFrequency, frequencies, method='matrix'):
+    ''' Returns the DFT of signal (along its last axis) at the given
+    frequencies in Hz, as a (..., frequencies) array. Frequencies do not
+    have to fall on a bin: the value is sum(x(n) * exp(-j2 pi f n / fs)),
+    which is X(k) of the N point DFT for f = k * fs / N. Leading axes are
+    frames. Both methods cost O(N) per frequency and frame:
+
+    'matrix'    multiplies the frames by a cached (N x frequencies) table of
+                cosines and sines, one matrix product for every frame and
+                frequency; the fastest way in numpy.
+    'recursive' runs the Goertzel recursion, a single real multiply per
+                sample and frequency for real signals and no table. All
+                frames and frequencies are stepped together one sample at
+                a time, which only pays off for many frames.'''
+    if method not in GOERTZEL_METHODS:
+        raise ValueError('method must be one of %s.' % (GOERTZEL_METHODS,))
+    signal = np.asarray(signal)
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    cyclesPerSample = frequencies.ravel() / samplingFrequency
+    if method == 'matrix':
+        twiddles = _getGoertzelTwiddles(signal.shape[-1],
+                                        tuple(cyclesPerSample.tolist()))
+        # Cosine and sine parts of every frequency side by side
+        products = np.matmul(signal, twiddles)
+        out = products[..., :len(cyclesPerSample)] - \
+            1j * products[..., len(cyclesPerSample):]
+    else:
+        out = _goertzelRecursion(signal, 2 * np.pi * cyclesPerSample)
+    return out.reshape(signal.shape[:-1] + frequencies.shape)
+
+
+@functools.lru_cache(maxsize=GOERTZEL_CACHE_SIZE)
+def _getGoertzelTwiddles(numberOfSamples, cyclesPerSample):
+    ''' Read-only (N x 2K) table: cos(w n) for the K frequencies, then
+    sin(w n).'''
+    cycles = np.multiply.outer(np.arange(numberOfSamples), cyclesPerSample)
+    # Wrapping to one cycle keeps the phase exact for long frames
+    cycles %= 1.0
+    cycles *= 2 * np.pi
+    twiddles = np.concatenate((np.cos(cycles), np.sin(cycles)), axis=-1)
+    twiddles.setflags(write=False)
+    return twiddles
+
+
+def _goertzelRecursion(signal, omega):
+    numberOfSamples = signal.shape[-1]
+    coefficient = 2 * np.cos(omega)
+    # One contiguous row of samples per time step, broadcast over the
+    # frequencies.
+    samples = np.ascontiguousarray(np.moveaxis(signal, -1, 0))[..., None]
+    shape = signal.shape[:-1] + omega.shape
+    dtype = np.result_type(signal, np.float64)
+    current = np.zeros(shape, dtype=dtype)
+    previous = np.zeros(shape, dtype=dtype)
+    spare = np.empty(shape, dtype=dtype)
+    for sample in samples:
+        # s(n) = x(n) + 2 cos(w) s(n - 1) - s(n - 2)
+        np.multiply(coefficient, current, out=spare)
+        spare -= previous
+        spare += sample
+        previous, current, spare = current, spare, previous
+
+    # s(N - 1) - exp(-jw) s(N - 2) is the sum with its phase measured from
+    # the last sample; move it back to the first.
+    return (current - np.exp(-1j * omega) * previous) * \
+        np.exp(-1j * omega * (numberOfSamples - 1))
+
+
+class SlidingDFT(object):
+    ''' Tracks the DFT of the last windowLength samples at a few
+    frequencies, updated with every new sample.
+
+    For every input sample process() returns the DFT of the window that
+    ends at it, the same value goertzel() gives for that window (the window
+    starts out filled with zeros). The sliding DFT update
+
+        S(n) = exp(jw) (S(n - 1) - x(n - N)) + x(n) exp(-jw (N - 1))
+
+    costs O(1) per frequency and sample, whatever windowLength is: the
+    state is the K DFT values plus a ring buffer of the last N samples,
+    which gives x(n - N). A chunk is updated at once in blocks of at most
+    SLIDING_DFT_BLOCK_SIZE samples. Every windowLength samples the values
+    are recomputed exactly from the ring buffer, so rounding errors can not
+    build up over a long stream. Leading axes of the chunks are independent
+    channels.'''
+
+    def __init__(self, samplingFrequency, frequencies, windowLength):
+        if windowLength <= 0:
+            raise ValueError('windowLength must be positive.')
+        self.samplingFrequency = samplingFrequency
+        self.frequencies = np.asarray(frequencies, dtype=np.float64)
+        self.windowLength = int(windowLength)
+        self._cyclesPerSample = self.frequencies / samplingFrequency
+        # exp(-jw m) for the window samples m = 0 .. N - 1, for re-anchoring
+        cycles = np.multiply.outer(np.arange(self.windowLength),
+                                   self._cyclesPerSample) % 1.0
+        self._windowExponentials = np.exp(-2j * np.pi * cycles)
+        # exp(-jw (N - 1)), the weight of the newest sample, and exp(jw)
+        self._newestWeight = self._windowExponentials[-1]
+        self._step = np.exp(2j * np.pi * self._cyclesPerSample)
+        self.reset()
+
+    def reset(self):
+        ''' Empties the window, as if no input was ever given.'''
+        self._ringBuffer = None
+        self._position = 0
+        self._values = None
+        self._samplesSinceAnchor = 0
+
+    def process(self, chunk):
+        ''' Takes the next chunk of input and returns the (..., samples x
+        frequencies) DFT values of the windows ending at each sample.'''
+        chunk = np.asarray(chunk)
+        if self._ringBuffer is None:
+            self._ringBuffer = np.zeros(
+                    chunk.shape[:-1] + (self.windowLength,),
+                    dtype=np.result_type(chunk, np.float64))
+            self._values = np.zeros(chunk.shape[:-1] +
+                                    self._cyclesPerSample.shape,
+                                    dtype=np.complex128)
+        if chunk.shape[-1] <= SLIDING_DFT_BLOCK_SIZE:
+            return self._processBlock(chunk)
+        return np.concatenate(
+                [self._processBlock(chunk[..., start:start +
+                                          SLIDING_DFT_BLOCK_SIZE])
+                 for start in range(0, chunk.shape[-1],
+                                    SLIDING_DFT_BLOCK_SIZE)], axis=-2)
+
+    def _processBlock(self, block):
+        ''' Updates the state with a block of samples and returns the DFT
+        values of the windows ending at each of them.'''
+        length = block.shape[-1]
+        # x(n - N) of every sample: the oldest ring buffer samples, then the
+        # block itself once it is longer than the window
+        if length <= self.windowLength:
+            positions = (self._position + np.arange(length)) % \
+                self.windowLength
+            leaving = self._ringBuffer[..., positions]
+            self._ringBuffer[..., positions] = block
+        else:
+            positions = (self._position + np.arange(self.windowLength)) % \
+                self.windowLength
+            leaving = np.concatenate(
+                    (self._ringBuffer[..., positions],
+                     block[..., :length - self.windowLength]), axis=-1)
+            positions = (positions + length) % self.windowLength
+            self._ringBuffer[..., positions] = \
+                block[..., length - self.windowLength:]
+        self._position = (self._position + length) % self.windowLength
+
+        # With a = exp(jw), S(n0 + i) = a^i (a S(n0 - 1) + sum over k <= i of
+        # a^-k (x(n0 + k) exp(-jw (N - 1)) - a x(n0 + k - N)))
+        cycles = np.multiply.outer(np.arange(length),
+                                   self._cyclesPerSample) % 1.0
+        rotation = np.exp(2j * np.pi * cycles)
+        terms = block[..., None] * self._newestWeight - \
+            leaving[..., None] * self._step
+        values = np.cumsum(terms * np.conj(rotation), axis=-2)
+        values += (self._step * self._values)[..., None, :]
+        values *= rotation
+
+        self._samplesSinceAnchor += length
+        if self._samplesSinceAnchor >= self.windowLength:
+            # Recompute the values exactly from the window, oldest first
+            window = np.roll(self._ringBuffer, -self._position, axis=-1)
+            self._values = window @ self._windowExponentials
+            self._samplesSinceAnchor = 0
+        elif length > 0:
+            self._values = values[..., -1, :]
+        return values
+
+
+def zoomSpectrum(signal, samplingFrequency, startFrequency, stopFrequency,
+                 numberOfBins, axis=-1):
+    ''' Returns (frequencyAxis, spectrum): numberOfBins DFT values evenly
+    spaced from startFrequency to stopFrequency (both included) in Hz.
+
+    The values are sum(x(n) * exp(-j2 pi f n / fs)) like goertzel() and the
+    raw getSpectrum() output, so they match the bins of a zero padded FFT
+    that happen to fall on the same frequencies. Instead of padding the
+    whole band that finely, the chirp-Z transform (Bluestein's algorithm)
+    turns the band into one FFT convolution of about N + numberOfBins
+    points.'''
+    if numberOfBins < 1:
+        raise ValueError('numberOfBins must be positive.')
+    signal = np.moveaxis(np.asarray(signal), axis, -1)
+    numberOfSamples = signal.shape[-1]
+    step = 0.0
+    if numberOfBins > 1:
+        step = (stopFrequency - startFrequency) / (numberOfBins - 1)
+    preChirp, filterSpectrum, postChirp = _getChirpZPlan(
+            numberOfSamples, int(numberOfBins),
+            startFrequency / samplingFrequency, step / samplingFrequency)
+
+    convolved = fftBackends.ifft(
+            fftBackends.fft(signal * preChirp, len(filterSpectrum),
+                            axis=-1) * filterSpectrum, axis=-1)
+    spectrum = convolved[..., :numberOfBins] * postChirp
+    frequencyAxis = startFrequency + step * np.arange(numberOfBins)
+    return frequencyAxis, np.moveaxis(spectrum, -1, axis)
+
+
+@functools.lru_cache(maxsize=CHIRP_Z_CACHE_SIZE)
+def _getChirpZPlan(numberOfSamples, numberOfBins, startCycles, stepCycles):
+    ''' Read-only chirps of the chirp-Z transform. With nk = (n^2 + k^2 -
+    (k - n)^2) / 2 the transform becomes the pre-chirped signal convolved
+    with a chirp filter, followed by a post-chirp.'''
+    n = np.arange(numberOfSamples)
+    k = np.arange(numberOfBins)
+    # Phases in cycles, wrapped to one cycle before they become angles
+    preChirp = np.exp(-2j * np.pi * ((startCycles * n +
+                                      stepCycles * n * n / 2) % 1.0))
+    postChirp = np.exp(-2j * np.pi * ((stepCycles * k * k / 2) % 1.0))
+
+    # The filter covers lags -(N - 1) .. M - 1, the negative ones wrapped to
+    # the end of the circular convolution.
+    length = scipy.fft.next_fast_len(numberOfSamples + numberOfBins - 1)
+    lags = np.zeros(length, dtype=np.int64)
+    lags[:numberOfBins] = k
+    lags[length - numberOfSamples + 1:] = np.arange(-numberOfSamples + 1, 0)
+    chirpFilter = np.exp(2j * np.pi * ((stepCycles * lags * lags / 2) % 1.0))
+    chirpFilter[numberOfBins:length - numberOfSamples + 1] = 0
+    filterSpectrum = fftBackends.fft(chirpFilter)
+
+    for array in (preChirp, filterSpectrum, postChirp):
+        array.setflags(write=False)
+    return preChirp, filterSpectrum, postChirp
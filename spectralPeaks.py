@@ -0,0 +1,165 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Finding spectral peaks between the bins. A tone that is not a multiple of
+# fs / N leaks over the neighbouring bins (see 4_fftLeak.py), and the largest
+# bin is off by up to half a bin in frequency and by the window's scalloping
+# loss in amplitude. Instead of a bigger or zero padded FFT, the bins around
+# each peak are interpolated to recover the true frequency and amplitude.
+#
+# All functions work on (..., bins) spectra, so every frame of an STFT is
+# handled by the same vectorized calls.
+# ____________________________________________________________________________
+
+import functools
+import numpy as np
+import spectralAnalysis
+import sys
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+# Interpolators understood by estimatePeaks
+PEAK_ESTIMATORS = ('parabolic', 'jacobsen', 'window')
+
+# Number of window / DFT length combinations whose main lobe tables
+# estimatePeaks keeps
+PEAK_TABLE_CACHE_SIZE = 16
+
+# Main lobe offsets (in bins) tabulated per window, spacing of the table
+PEAK_TABLE_RESOLUTION = 1 / 1024
+
+
+def findPeaks(magnitude, numberOfPeaks=1):
+    ''' Returns the bin indices of the numberOfPeaks largest local maxima of
+    magnitude along its last axis, largest first, as a (..., numberOfPeaks)
+    array. The first and last bins are never peaks, as they lack a
+    neighbour to interpolate with. Frames with fewer peaks get -1 for the
+    missing ones.'''
+    magnitude = np.asarray(magnitude)
+    if numberOfPeaks < 1:
+        raise ValueError('numberOfPeaks must be positive.')
+    if magnitude.ndim == 0 or magnitude.shape[-1] < 3:
+        raise ValueError('magnitude must have at least 3 bins.')
+    middle = magnitude[..., 1:-1]
+    isPeak = (middle >= magnitude[..., :-2]) & (middle > magnitude[..., 2:])
+    candidates = np.where(isPeak, middle, -np.inf)
+    numberOfPeaks = min(numberOfPeaks, candidates.shape[-1])
+
+    # Partition out the largest peaks, then sort only those
+    largest = np.argpartition(-candidates, numberOfPeaks - 1,
+                              axis=-1)[..., :numberOfPeaks]
+    order = np.argsort(-np.take_along_axis(candidates, largest, axis=-1),
+                       axis=-1, kind='stable')
+    largest = np.take_along_axis(largest, order, axis=-1)
+    missing = np.isinf(np.take_along_axis(candidates, largest, axis=-1))
+    return np.where(missing, -1, largest + 1)
+
+
+def estimatePeaks(frequencyAxis, spectrum, numberOfPeaks=1, method=None,
+                  window='boxcar', numberOfPoints=None):
+    ''' Returns (frequencies, amplitudes) of the numberOfPeaks largest peaks
+    of every (..., bins) spectrum, as (..., numberOfPeaks) arrays with NaN
+    for missing peaks. frequencyAxis and spectrum are what getSpectrum or
+    spectralAnalysis.stft return (raw scaling, complex values).
+
+    window is the window the frames were multiplied by, as an array or a
+    name for spectralAnalysis.getWindow; numberOfPoints is the DFT length,
+    2 * (bins - 1) by default as for an even length real signal, and the
+    window is as long as the DFT unless given as an array. The amplitudes
+    undo the window gain and its scalloping loss at the estimated offset;
+    they assume a real signal (for complex signals halve them).
+
+    method picks the frequency interpolator; None (the default) takes
+    'jacobsen' for complex spectra of unwindowed (boxcar) frames and
+    'window' otherwise:
+    'parabolic' fits a parabola to the log magnitudes of the peak and its
+                neighbours. Exact for Gaussian windows, slightly biased for
+                the others; works for any window.
+    'jacobsen'  Jacobsen's estimator on the complex bins with Candan's
+                finite N correction. Meant for rectangular windows without
+                zero padding.
+    'window'    inverts the actual main lobe of window: the neighbour
+                magnitudes (X(k+1) - X(k-1)) / (X(k-1) + X(k) + X(k+1)) are
+                looked up in a table of the window's response, built once
+                per window. The table holds the lobe of a single complex
+                tone, so for a real tone it ignores the lobe of its
+                negative frequency image: with few bins, or a tone near
+                DC or fs / 2, the estimate is biased (up to about a tenth
+                of a bin for a boxcar at N = 64, less for Hann or
+                Blackman, whose side lobes fall off faster).
+    '''
+    frequencyAxis = np.asarray(frequencyAxis)
+    spectrum = np.asarray(spectrum)
+    if numberOfPoints is None:
+        numberOfPoints = 2 * (spectrum.shape[-1] - 1)
+    if isinstance(window, (str, tuple)):
+        window = spectralAnalysis.getWindow(window, numberOfPoints)
+    window = np.asarray(window, dtype=np.float64)
+    if method is None:
+        isBoxcar = window.size > 0 and np.all(window == window.flat[0])
+        method = 'jacobsen' if isBoxcar and np.iscomplexobj(spectrum) \
+            else 'window'
+    if method not in PEAK_ESTIMATORS:
+        raise ValueError('method must be one of %s.' % (PEAK_ESTIMATORS,))
+    if method == 'jacobsen' and not np.iscomplexobj(spectrum):
+        raise ValueError('The jacobsen method needs the complex spectrum.')
+    offsets, lobeMeasure, lobeMagnitude = _getMainLobeTable(
+            window.tobytes(), numberOfPoints)
+
+    peaks = findPeaks(np.abs(spectrum), numberOfPeaks)
+    found = peaks >= 0
+    peaks = np.where(found, peaks, 1)
+    below, center, above = [np.take_along_axis(spectrum, peaks + shift,
+                                               axis=-1)
+                            for shift in (-1, 0, 1)]
+    magnitudes = [np.abs(bins) for bins in (below, center, above)]
+
+    if method == 'parabolic':
+        alpha, beta, gamma = [np.log(np.maximum(magnitude, 1e-300))
+                              for magnitude in magnitudes]
+        curvature = alpha - 2 * beta + gamma
+        offset = 0.5 * (alpha - gamma) / np.where(curvature < 0, curvature,
+                                                  -np.inf)
+    elif method == 'jacobsen':
+        correction = np.tan(np.pi / numberOfPoints) / (np.pi / numberOfPoints)
+        offset = correction * np.real((below - above) /
+                                      (2 * center - below - above))
+    else:
+        measure = (magnitudes[2] - magnitudes[0]) / (magnitudes[0] +
+                                                     magnitudes[1] +
+                                                     magnitudes[2])
+        offset = np.interp(measure, lobeMeasure, offsets)
+    offset = np.clip(offset, -0.5, 0.5)
+
+    binSpacing = frequencyAxis[1] - frequencyAxis[0]
+    frequencies = frequencyAxis[0] + (peaks + offset) * binSpacing
+    amplitudes = 2 * magnitudes[1] / np.interp(offset, offsets,
+                                               lobeMagnitude)
+    return (np.where(found, frequencies, np.nan),
+            np.where(found, amplitudes, np.nan))
+
+
+@functools.lru_cache(maxsize=PEAK_TABLE_CACHE_SIZE)
+def _getMainLobeTable(windowBytes, numberOfPoints):
+    ''' Tabulates, for tone offsets of -0.5 .. 0.5 bins from the peak bin,
+    the neighbour measure the 'window' method inverts and the magnitude of
+    the peak bin. Read-only arrays.'''
+    window = np.frombuffer(windowBytes, dtype=np.float64)
+    steps = int(round(0.5 / PEAK_TABLE_RESOLUTION))
+    shifts = np.arange(-steps, steps + 1)
+    offsets = shifts * PEAK_TABLE_RESOLUTION
+    # Window response from -1.5 to 1.5 bins, 2 * steps points per bin. A
+    # tone offset by d bins from the peak bin shows up in it with the
+    # response at -d, in the bin above at 1 - d and in the bin below at
+    # -1 - d.
+    response = np.abs(spectralAnalysis.zoomSpectrum(
+            window, numberOfPoints, -1.5, 1.5, 6 * steps + 1)[1])
+    center = response[3 * steps - shifts]
+    above = response[5 * steps - shifts]
+    below = response[steps - shifts]
+    lobeMeasure = (above - below) / (below + center + above)
+    for array in (offsets, lobeMeasure, center):
+        array.setflags(write=False)
+    return offsets, lobeMeasure, center
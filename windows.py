@@ -0,0 +1,116 @@
+# Author: Can Metan
+# GPL v3 License
+# ____________________________________________________________________________
+# Window functions. Every window is built by one vectorized expression and
+# kept in a small LRU cache, keyed by its type, length, symmetry, dtype and
+# parameter, so scripts and engines that ask for the same window again get
+# the cached array instead of recomputing it. Cached windows are read-only;
+# apply() multiplies a signal by a window without building a temporary
+# window or product when given out=.
+# ____________________________________________________________________________
+
+import functools
+import numpy as np
+import sys
+
+# Assert that the user is using python above version 3.1
+assert sys.version_info >= (3, 1)
+
+
+# Cosine sum coefficients a0, a1, ...: w(n) = a0 - a1 cos(2 pi n / M) +
+# a2 cos(4 pi n / M) - ...
+COSINE_SUM_WINDOWS = {
+    'hann': (0.5, 0.5),
+    'hamming': (0.54, 0.46),
+    'blackman': (0.42, 0.5, 0.08),
+    'nuttall': (0.3635819, 0.4891775, 0.1365995, 0.0106411),
+    'flattop': (0.21557895, 0.41663158, 0.277263158, 0.083578947,
+                0.006947368),
+}
+
+# Every window getWindow can make
+WINDOW_TYPES = ('boxcar', 'triangular', 'kaiser') + \
+    tuple(COSINE_SUM_WINDOWS)
+
+# Parameter used when none is given: Kaiser's beta and the value the
+# triangular window starts and ends at
+DEFAULT_WINDOW_PARAMETERS = {'kaiser': 8.6, 'triangular': 0.0}
+
+# Number of windows kept before the least recently used one is dropped
+WINDOW_CACHE_SIZE = 64
+
+
+def getWindow(windowType, length, symmetric=True, dtype=np.float64,
+              parameter=None):
+    ''' Returns a read-only window of the given type (one of WINDOW_TYPES).
+
+    Symmetric windows (the default, like np.hanning) are meant for filter
+    design; symmetric=False gives the periodic version, which overlaps
+    evenly in an STFT and suits spectral analysis. parameter is Kaiser's
+    beta or the floor value the triangular window starts and ends at.'''
+    if windowType not in WINDOW_TYPES:
+        raise ValueError('windowType must be one of %s.' % (WINDOW_TYPES,))
+    if length < 1:
+        raise ValueError('length must be positive.')
+    if parameter is None:
+        parameter = DEFAULT_WINDOW_PARAMETERS.get(windowType)
+    return _getCachedWindow(windowType, int(length), bool(symmetric),
+                            np.dtype(dtype).str, parameter)
+
+
+def apply(signal, windowType, out=None, symmetric=True, parameter=None):
+    ''' Multiplies signal by a window along its last axis and returns the
+    product, written into out when it is given (out=signal windows it in
+    place). windowType is a type for getWindow or a window array.'''
+    signal = np.asarray(signal)
+    if isinstance(windowType, str):
+        window = getWindow(windowType, signal.shape[-1], symmetric,
+                           parameter=parameter)
+    else:
+        window = np.asarray(windowType)
+        if window.shape != signal.shape[-1:]:
+            raise ValueError('The window must be as long as the signal.')
+    return np.multiply(signal, window, out=out)
+
+
+def getCacheInfo():
+    ''' Returns the window cache hits, misses, size and maxSize.'''
+    info = _getCachedWindow.cache_info()
+    return {'hits': info.hits, 'misses': info.misses,
+            'size': info.currsize, 'maxSize': info.maxsize}
+
+
+def clearCache():
+    ''' Drops every cached window and resets the statistics.'''
+    _getCachedWindow.cache_clear()
+
+
+@functools.lru_cache(maxsize=WINDOW_CACHE_SIZE)
+def _getCachedWindow(windowType, length, symmetric, dtype, parameter):
+    window = _makeWindow(windowType, length, symmetric, parameter)
+    window = window.astype(dtype)
+    window.setflags(write=False)
+    return window
+
+
+def _makeWindow(windowType, length, symmetric, parameter):
+    if length == 1:
+        return np.ones(1)
+    # Symmetric windows end where they start; periodic ones are one sample
+    # short of that, as if cut from a window of length + 1.
+    period = length - 1 if symmetric else length
+    n = np.arange(length)
+    if windowType == 'boxcar':
+        return np.ones(length)
+    if windowType == 'triangular':
+        return parameter + (1 - parameter) * \
+            (1 - np.abs(2 * n / period - 1))
+    if windowType == 'kaiser':
+        return np.i0(parameter * np.sqrt(1 - (2 * n / period - 1) ** 2)) / \
+            np.i0(parameter)
+
+    window = np.zeros(length)
+    phase = 2 * np.pi * n / period
+    for k, coefficient in enumerate(COSINE_SUM_WINDOWS[windowType]):
+        window += (-1) ** k * coefficient * np.cos(k * phase)
+    return window